@@ -15,8 +15,20 @@ class BaseCollector(ABC):
         """소스 타입 반환"""
         pass
 
-from .playstore import PlayStoreCollector
-from .appstore import AppStoreCollector
-from .youtube import YouTubeCollector
-from .naver_blog import NaverBlogCollector
-from .brunch import BrunchCollector
\ No newline at end of file
+# 수집기 클래스는 접근 시점에 임포트 (PEP 562)
+_LAZY_COLLECTORS = {
+    "PlayStoreCollector": "playstore",
+    "AppStoreCollector": "appstore",
+    "YouTubeCollector": "youtube",
+    "NaverBlogCollector": "naver_blog",
+    "BrunchCollector": "brunch"
+}
+
+def __getattr__(name):
+    if name in _LAZY_COLLECTORS:
+        from .registry import load_collector_class
+        return load_collector_class(_LAZY_COLLECTORS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_COLLECTORS))
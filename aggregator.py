@@ -1,312 +1,941 @@
-import json
 import os
+import math
+import heapq
+import hashlib
 import logging
-from datetime import datetime
-from collections import defaultdict, Counter
-from typing import List, Dict, Any
+from datetime import datetime, date, timedelta
+from collections import defaultdict, Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Tuple
+
+try:
+    from .fileio import OutputSidecar, atomic_write_json, write_output
+    from .metrics import pipeline_metrics
+    from .records import AnalyzedReview, loads
+    from .sketches import SpaceSaving, DistinctAuthors
+    from .anomaly import AnomalyDetector
+    from .payloads import TrendPartitionWriter
+    from .search_index import SearchIndexBuilder
+    from .clustering import SubIssueClusterer
+    from .cube import RollupCube, cube_path
+    from .config import SKETCH_CONFIG, AGGREGATION_CONFIG, ANOMALY_CONFIG, SEARCH_INDEX_CONFIG, CLUSTER_CONFIG
+except ImportError:
+    from fileio import OutputSidecar, atomic_write_json, write_output
+    from metrics import pipeline_metrics
+    from records import AnalyzedReview, loads
+    from sketches import SpaceSaving, DistinctAuthors
+    from anomaly import AnomalyDetector
+    from payloads import TrendPartitionWriter
+    from search_index import SearchIndexBuilder
+    from clustering import SubIssueClusterer
+    from cube import RollupCube, cube_path
+    from config import SKETCH_CONFIG, AGGREGATION_CONFIG, ANOMALY_CONFIG, SEARCH_INDEX_CONFIG, CLUSTER_CONFIG
 
 logger = logging.getLogger(__name__)
 
+SENTIMENT_KEYS = ("positive", "neutral", "negative")
+
+def _empty_group() -> Dict[str, Any]:
+    return {"count": 0, "rating_sum": 0, "rating_count": 0, "sentiment": Counter()}
+
+def _add_to_group(group: Dict[str, Any], sentiment: str, rating: Any) -> None:
+    group["count"] += 1
+    group["sentiment"][sentiment] += 1
+    if rating is not None:
+        group["rating_sum"] += rating
+        group["rating_count"] += 1
+
+def _merge_group(group: Dict[str, Any], other: Dict[str, Any]) -> None:
+    for key in ("count", "rating_sum", "rating_count"):
+        group[key] += other[key]
+    group["sentiment"].update(other["sentiment"])
+
+def _avg_rating(group: Dict[str, Any]) -> Any:
+    return round(group["rating_sum"] / group["rating_count"], 2) if group["rating_count"] else None
+
+def _parse_date(value: str) -> Any:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _example_score(item: AnalyzedReview) -> float:
+    """대표 리뷰 기본 점수 = 길이 + 공감 수 (0..1 척도, 가중치는 AGGREGATION_CONFIG["example_weights"])"""
+    weights = AGGREGATION_CONFIG["example_weights"]
+    length = min(len(item.text or ""), 400) / 400
+    thumbs = (item.metadata or {}).get("thumbs_up") or 0
+    engagement = min(math.log1p(thumbs) / math.log1p(100), 1.0) if isinstance(thumbs, (int, float)) and thumbs > 0 else 0.0
+    return round(weights["length"] * length + weights["engagement"] * engagement, 6)
+
+def _example(item: AnalyzedReview) -> List[Any]:
+    """
+    대표 리뷰 후보 [풀 유지 키, id, 표시용 dict, 기본 점수] (리스트로 두어 캐시 JSON 왕복 후에도 heap 비교 가능)
+    - 최신성은 후보 집합의 가장 최신 날짜 기준이라 선택 시점(_rank_examples)에 계산
+    - 풀 유지 키는 날짜를 1년당 recency 가중치로 선형 반영 (heap 안의 비교에만 쓰이므로 차이만 의미 있음)
+    - 본문은 검색 인덱스 snippet 길이로 자름
+    """
+    score = _example_score(item)
+    parsed = _parse_date(item.date)
+    key = score + AGGREGATION_CONFIG["example_weights"]["recency"] * (parsed.toordinal() / 365 if parsed else 0.0)
+    return [round(key, 6), item.id, {
+        "id": item.id,
+        "text": (item.text or "")[:SEARCH_INDEX_CONFIG["snippet_chars"]],
+        "source": item.source_type,
+        "rating": item.rating,
+        "thumbs_up": (item.metadata or {}).get("thumbs_up"),
+        "created_at": item.created_at
+    }, score]
+
+def _rank_examples(pool: List[List[Any]]) -> List[List[Any]]:
+    """풀 후보 -> [최종 점수, id, dict], 최신성 = 1 - min(후보 중 가장 최신 날짜 대비 경과일 / 365, 1)"""
+    weight = AGGREGATION_CONFIG["example_weights"]["recency"]
+    dates = [_parse_date((c[2]["created_at"] or "")[:10]) for c in pool]
+    newest = max((d for d in dates if d), default=None)
+    ranked = []
+    for candidate, parsed in zip(pool, dates):
+        recency = 1 - min((newest - parsed).days / 365, 1) if parsed else 0.0
+        ranked.append([round(candidate[3] + weight * recency, 6), candidate[1], candidate[2]])
+    return ranked
+
+def _push_example(pool: List[List[Any]], candidate: List[Any]) -> None:
+    """
+    점수 상위 example_pool개 후보를 min-heap으로 유지 (후보 1건당 O(log k))
+    - 동점은 id로 비교 -> 파티션 병합 순서와 무관하게 같은 후보
+    """
+    if len(pool) < AGGREGATION_CONFIG["example_pool"]:
+        if all(c[1] != candidate[1] for c in pool):
+            heapq.heappush(pool, candidate)
+    elif candidate[:2] > pool[0][:2] and all(c[1] != candidate[1] for c in pool):
+        heapq.heapreplace(pool, candidate)
+
+def _merge_examples(pool: List[List[Any]], other: Iterable[List[Any]]) -> None:
+    for candidate in other:
+        _push_example(pool, candidate)
+
+def _shingles(text: str) -> set:
+    text = " ".join((text or "").lower().split())[:300]
+    return {text[i:i + 3] for i in range(max(len(text) - 2, 1))}
+
+def _select_examples(pool: List[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    후보 풀에서 MMR로 대표 리뷰 선택
+    - 매 단계 lambda * 정규화 점수 - (1 - lambda) * 이미 고른 리뷰와의 최대 유사도가 가장 큰 후보
+    - 유사도는 문자 3-gram shingle Jaccard (거의 같은 리뷰 중복 방지)
+    """
+    count, lam = AGGREGATION_CONFIG["example_count"], AGGREGATION_CONFIG["mmr_lambda"]
+    candidates = sorted(pool, key=lambda c: (-c[0], c[1]))
+    if len(candidates) <= 1:
+        return [c[2] for c in candidates]
+    high, low = candidates[0][0], candidates[-1][0]
+    span = (high - low) or 1.0
+    shingles = [_shingles(c[2]["text"]) for c in candidates]
+
+    chosen: List[int] = []
+    remaining = list(range(len(candidates)))
+    while remaining and len(chosen) < count:
+        def mmr(i):
+            relevance = (candidates[i][0] - low) / span
+            similarity = max((len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j]) for j in chosen), default=0.0)
+            return lam * relevance - (1 - lam) * similarity
+        best = max(remaining, key=lambda i: (mmr(i), -i))
+        chosen.append(best)
+        remaining.remove(best)
+    return [candidates[i][2] for i in chosen]
+
+def _cluster_doc(item: AnalyzedReview) -> Dict[str, Any]:
+    """세부 이슈 클러스터링 입력 문서 (n-gram용 앞부분 텍스트 + 라벨링용 분석 필드 + 대표 리뷰 dict)"""
+    return {
+        "id": item.id,
+        "text": (item.text or "")[:CLUSTER_CONFIG["max_chars"]],
+        "problem_type": item.analysis.problem_type,
+        "key_phrases": list(item.analysis.key_phrases),
+        "example": _example(item)[2]
+    }
+
+def _cluster_label(cluster: Dict[str, Any]) -> str:
+    """클러스터 이름: 구성 리뷰에 가장 많이 나온 핵심 문구 2개 (없으면 대표 n-gram)"""
+    phrases = [phrase for phrase, _ in sorted(cluster["key_phrases"].items(), key=lambda kv: (-kv[1], kv[0]))[:2]]
+    return " / ".join(phrases or cluster["terms"][:3])
+
+def _new_day() -> Dict[str, Any]:
+    # issues: 롤링 윈도우용 일별 버킷 (감성별 문제 유형 건수, 이탈 키워드 건수)
+    return {
+        "ringle": dict(_empty_group(), churn_signals=0),
+        "competitors": {},
+        "issues": {"negative": Counter(), "positive": Counter(), "churn": Counter()}
+    }
+
+def _new_issue() -> Dict[str, Any]:
+    return {"count": 0, "keywords": SpaceSaving(SKETCH_CONFIG["issue_capacity"]), "examples": []}
+
+
+class PartialAggregate:
+    """
+    파티션 단위 부분 집계 (map 결과)
+    - 건수/합계/Counter/스케치/대표 리뷰 후보만 보관하므로 파티션 크기와 무관하게 작음
+    - merge는 결합법칙이 성립하므로 파티션 키 순서로 합치면 직렬/병렬 결과가 같음
+    - to_dict/from_dict로 파티션별 캐시에 저장 (변경 없는 파티션은 다시 읽지 않음)
+    """
+
+    # 필드 구성이 바뀌면 올려서 저장된 파티션 캐시를 무효화
+    VERSION = 5
+
+    def __init__(self):
+        self.items = 0
+        self.bytes_read = 0
+        self.sources = Counter()
+        self.ringle = _empty_group()
+        self.ringle_problem_types = Counter()
+        self.ringle_churn = 0
+        self.competitors: Dict[str, Dict[str, Any]] = {}
+        self.word_cloud = SpaceSaving(SKETCH_CONFIG["capacity"])
+        self.daily: Dict[str, Dict[str, Any]] = {}
+        self.issues: Dict[str, Dict[str, Dict[str, Any]]] = {"negative": {}, "positive": {}}
+        self.churn_keywords = SpaceSaving(SKETCH_CONFIG["issue_capacity"])
+        self.churn_examples: Dict[str, List[Dict[str, Any]]] = {}
+        self.mentions: Dict[str, Dict[str, Any]] = {}
+        self.authors = DistinctAuthors()
+        self.cube = RollupCube()  # 일 단위 다차원 롤업 (cube/<grain>.json)
+
+    def add(self, item: AnalyzedReview) -> None:
+        self.items += 1
+        self.sources[item.source_type] += 1
+        self.cube.add_item(item)
+        analysis = item.analysis
+        sentiment = analysis.sentiment
+        author = DistinctAuthors.author_key(item.source_type, item.author)
+        if author:
+            self.authors.add("total", "all", author)
+            self.authors.add("sources", item.source_type, author)
+
+        date_str = item.date
+        day = None
+        if date_str:
+            day = self.daily.get(date_str)
+            if day is None:
+                day = self.daily[date_str] = _new_day()
+
+        if item.is_target:
+            _add_to_group(self.ringle, sentiment, item.rating)
+            pt = analysis.problem_type
+            if pt:
+                self.ringle_problem_types[pt] += 1
+            # 워드클라우드: 전체 기간 자유 문구를 고정 크기 top-k 스케치로 집계
+            self.word_cloud.update_all(analysis.key_phrases)
+            if analysis.churn_signal:
+                self.ringle_churn += 1
+            if author:
+                self.authors.add("ringle", "all", author)
+                if pt:
+                    self.authors.add("problem_types", pt, author)
+
+            if day is not None:
+                _add_to_group(day["ringle"], sentiment, item.rating)
+                if analysis.churn_signal:
+                    day["ringle"]["churn_signals"] += 1
+                if author:
+                    self.authors.add("daily", date_str, author)
+
+            self._add_issues(item, day)
+        else:
+            comp_name = item.source_name
+            _add_to_group(self.competitors.setdefault(comp_name, _empty_group()), sentiment, item.rating)
+            if author:
+                self.authors.add("competitors", comp_name, author)
+            if day is not None:
+                _add_to_group(day["competitors"].setdefault(comp_name, _empty_group()), sentiment, item.rating)
+
+    def _add_issues(self, item: AnalyzedReview, day: Dict[str, Any] = None) -> None:
+        analysis = item.analysis
+        example = _example(item)
+
+        if analysis.problem_type and analysis.sentiment in self.issues:
+            if day is not None:
+                day["issues"][analysis.sentiment][analysis.problem_type] += 1
+            issue = self.issues[analysis.sentiment].get(analysis.problem_type)
+            if issue is None:
+                issue = self.issues[analysis.sentiment][analysis.problem_type] = _new_issue()
+            issue["count"] += 1
+            issue["keywords"].update_all(analysis.key_phrases)
+            _push_example(issue["examples"], example)
+
+        if analysis.churn_signal:
+            self.churn_keywords.update_all(analysis.churn_keywords)
+            if day is not None:
+                day["issues"]["churn"].update(k for k in map(self.churn_keywords.key, analysis.churn_keywords) if k)
+            # "환불을", "Refund" 등 표기가 달라도 같은 키워드 예시로 묶음
+            for key in sorted({self.churn_keywords.key(k) for k in analysis.churn_keywords} - {""}):
+                _push_example(self.churn_examples.setdefault(key, []), example)
+
+        for name in analysis.competitor_mentions:
+            self.mentions.setdefault(name, {"count": 0, "examples": []})["count"] += 1
+        for name in dict.fromkeys(analysis.competitor_mentions):
+            _push_example(self.mentions[name]["examples"], example)
+
+    def merge(self, other: "PartialAggregate") -> "PartialAggregate":
+        self.items += other.items
+        self.bytes_read += other.bytes_read
+        self.sources.update(other.sources)
+        _merge_group(self.ringle, other.ringle)
+        self.ringle_problem_types.update(other.ringle_problem_types)
+        self.ringle_churn += other.ringle_churn
+        for name, group in other.competitors.items():
+            _merge_group(self.competitors.setdefault(name, _empty_group()), group)
+        self.word_cloud.merge(other.word_cloud)
+
+        for date_str, other_day in other.daily.items():
+            day = self.daily.get(date_str)
+            if day is None:
+                day = self.daily[date_str] = _new_day()
+            _merge_group(day["ringle"], other_day["ringle"])
+            day["ringle"]["churn_signals"] += other_day["ringle"]["churn_signals"]
+            for name, group in other_day["competitors"].items():
+                _merge_group(day["competitors"].setdefault(name, _empty_group()), group)
+            for kind, counts in other_day["issues"].items():
+                day["issues"][kind].update(counts)
+
+        for sentiment, issues in other.issues.items():
+            for pt, other_issue in issues.items():
+                issue = self.issues[sentiment].get(pt)
+                if issue is None:
+                    issue = self.issues[sentiment][pt] = _new_issue()
+                issue["count"] += other_issue["count"]
+                issue["keywords"].merge(other_issue["keywords"])
+                _merge_examples(issue["examples"], other_issue["examples"])
+
+        self.churn_keywords.merge(other.churn_keywords)
+        for key, examples in other.churn_examples.items():
+            _merge_examples(self.churn_examples.setdefault(key, []), examples)
+        # 스케치에서 밀려난 키워드의 예시는 버림 (메모리 상한 유지)
+        self.churn_examples = {k: v for k, v in self.churn_examples.items() if k in self.churn_keywords.counts}
+
+        for name, other_mention in other.mentions.items():
+            mention = self.mentions.setdefault(name, {"count": 0, "examples": []})
+            mention["count"] += other_mention["count"]
+            _merge_examples(mention["examples"], other_mention["examples"])
+
+        self.authors.merge(other.authors)
+        self.cube.merge(other.cube)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        def group(g):
+            return dict(g, sentiment=dict(g["sentiment"]))
+        return {
+            "items": self.items,
+            "sources": dict(self.sources),
+            "ringle": group(self.ringle),
+            "ringle_problem_types": dict(self.ringle_problem_types),
+            "ringle_churn": self.ringle_churn,
+            "competitors": {name: group(g) for name, g in self.competitors.items()},
+            "word_cloud": self.word_cloud.to_dict(),
+            "daily": {
+                date_str: {
+                    "ringle": group(day["ringle"]),
+                    "competitors": {name: group(g) for name, g in day["competitors"].items()},
+                    "issues": {kind: dict(counts) for kind, counts in day["issues"].items()}
+                }
+                for date_str, day in self.daily.items()
+            },
+            "issues": {
+                sentiment: {
+                    pt: {"count": issue["count"], "keywords": issue["keywords"].to_dict(), "examples": issue["examples"]}
+                    for pt, issue in issues.items()
+                }
+                for sentiment, issues in self.issues.items()
+            },
+            "churn_keywords": self.churn_keywords.to_dict(),
+            "churn_examples": self.churn_examples,
+            "mentions": self.mentions,
+            "authors": self.authors.to_dict(),
+            "cube": self.cube.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PartialAggregate":
+        def group(g):
+            return dict(g, sentiment=Counter(g["sentiment"]))
+        partial = cls()
+        partial.items = data["items"]
+        partial.sources = Counter(data["sources"])
+        partial.ringle = group(data["ringle"])
+        partial.ringle_problem_types = Counter(data["ringle_problem_types"])
+        partial.ringle_churn = data["ringle_churn"]
+        partial.competitors = {name: group(g) for name, g in data["competitors"].items()}
+        partial.word_cloud = SpaceSaving.from_dict(data["word_cloud"])
+        partial.daily = {
+            date_str: {
+                "ringle": group(day["ringle"]),
+                "competitors": {name: group(g) for name, g in day["competitors"].items()},
+                "issues": {kind: Counter(counts) for kind, counts in day["issues"].items()}
+            }
+            for date_str, day in data["daily"].items()
+        }
+        partial.issues = {
+            sentiment: {
+                pt: {"count": issue["count"], "keywords": SpaceSaving.from_dict(issue["keywords"]), "examples": issue["examples"]}
+                for pt, issue in issues.items()
+            }
+            for sentiment, issues in data["issues"].items()
+        }
+        partial.churn_keywords = SpaceSaving.from_dict(data["churn_keywords"])
+        partial.churn_examples = data["churn_examples"]
+        partial.mentions = data["mentions"]
+        partial.authors = DistinctAuthors.from_dict(data["authors"])
+        partial.cube = RollupCube.from_dict(data["cube"])
+        return partial
+
+
+class SlidingCounter:
+    """
+    일별 버킷 슬라이딩 합계
+    - 새 날짜 버킷을 더하고 window일 전 버킷을 빼서 구간 합계 유지
+    - 날짜 하나당 해당 버킷의 키 수만큼만 갱신 -> 전체 비용 O(days)
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.totals = Counter()
+        self._buckets = deque()
+
+    def push(self, bucket: Counter) -> None:
+        self.totals.update(bucket)
+        self._buckets.append(bucket)
+        if len(self._buckets) > self.window:
+            oldest = self._buckets.popleft()
+            self.totals.subtract(oldest)
+            for key in oldest:
+                if self.totals[key] <= 0:
+                    del self.totals[key]
+
+    def snapshot(self) -> Counter:
+        return Counter(self.totals)
+
+
+def _ranked_deltas(current: Counter, previous: Counter, top_n: int, field: str, label: Any = None) -> List[Dict[str, Any]]:
+    """현재 구간 상위 top_n (동률은 키 순서) + 직전 구간 대비 증감"""
+    ranked = sorted(current.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]
+    rows = []
+    for key, count in ranked:
+        prev = previous.get(key, 0)
+        rows.append({
+            field: label(key) if label else key,
+            "count": count,
+            "previous_count": prev,
+            "delta": count - prev,
+            "delta_rate": round((count - prev) / prev, 2) if prev else None
+        })
+    return rows
+
+
+def read_analyzed_file(path: str) -> Tuple[AnalyzedReview, int]:
+    """분석 결과 파일 1개 로드 -> (레코드, 읽은 바이트)"""
+    with open(path, "rb") as f:
+        payload = f.read()
+    return AnalyzedReview.from_dict(loads(payload)), len(payload)
+
+def map_partition(paths: List[str]) -> PartialAggregate:
+    """map 단계: 파티션의 분석 결과 파일을 읽어 부분 집계 생성 (프로세스 풀 작업 함수)"""
+    partial = PartialAggregate()
+    for path in paths:
+        try:
+            item, size = read_analyzed_file(path)
+        except Exception as e:
+            logger.error(f"Error loading {os.path.basename(path)}: {e}")
+            continue
+        partial.bytes_read += size
+        partial.add(item)
+    return partial
+
+
 class DataAggregator:
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, workers: int = None):
         self.data_dir = data_dir
         self.analyzed_dir = os.path.join(data_dir, "analyzed")
         self.aggregated_dir = os.path.join(data_dir, "aggregated")
-        
+        self.partials_dir = os.path.join(data_dir, "state", "partials")
+        self.signatures: Dict[str, str] = {}  # 파티션 키 -> 파일 구성 서명 (map 단계에서 계산)
+        self.workers = workers or AGGREGATION_CONFIG["workers"] or os.cpu_count() or 1
+        self.clusterer = SubIssueClusterer(os.path.join(data_dir, "state"), CLUSTER_CONFIG)
+        self.clusters: List[Dict[str, Any]] = []  # 부정/이탈 리뷰 세부 이슈 (top-issues.json issue_clusters)
+        # 출력 파일 해시/실행 시각 기록 (aggregated/updated.json)
+        self.outputs = OutputSidecar(self.aggregated_dir)
+
         # 집계 데이터 저장 디렉토리 생성
         os.makedirs(self.aggregated_dir, exist_ok=True)
 
     def aggregate_all(self) -> None:
-        """모든 집계 데이터 생성/업데이트"""
-        items = self._load_analyzed_items()
-        if not items:
+        """
+        모든 집계 데이터 생성/업데이트 (map-reduce)
+        - map: <source>/<YYYY-MM> 파티션별 부분 집계 (workers > 1이면 프로세스 풀, 변경 없는 파티션은 캐시 사용)
+        - reduce: 파티션 키 순서로 병합 -> workers 수와 무관하게 같은 결과
+        """
+        partitions = self._partitions()
+        with pipeline_metrics.stage("map") as stage:
+            partials = self._map_partitions(partitions)
+            stage.items_in = len(partitions)
+        with pipeline_metrics.stage("reduce") as stage:
+            merged = PartialAggregate()
+            for key in sorted(partials):
+                merged.merge(partials[key])
+            stage.items_out = merged.items
+        if not merged.items:
             logger.warning("No analyzed items found.")
             return
 
-        logger.info(f"Aggregating {len(items)} items...")
-        self.generate_stats(items)
-        self.generate_trends(items)
-        self.generate_top_issues(items)
+        logger.info(f"Aggregating {merged.items} items from {len(partitions)} partitions...")
+        with pipeline_metrics.stage("clusters") as stage:
+            docs = self.clusterer.load_docs(partitions, self.signatures, _cluster_doc)
+            self.clusters = self.clusterer.run(docs, AGGREGATION_CONFIG["example_pool"])
+            stage.items_in = len(docs)
+            stage.items_out = len(self.clusters)
+        for name, write in (("stats", self._write_stats), ("trends", self._write_trends), ("top_issues", self._write_top_issues),
+                            ("cube", self._write_cube)):
+            with pipeline_metrics.stage(name) as stage:
+                stage.items_in = merged.items
+                write(merged)
+        with pipeline_metrics.stage("alerts") as stage:
+            stage.items_out = len(self._write_alerts(merged, partitions)["alerts"])
+        with pipeline_metrics.stage("search_index") as stage:
+            builder = SearchIndexBuilder(self.aggregated_dir, os.path.join(self.data_dir, "state", "search"), SEARCH_INDEX_CONFIG)
+            stage.items_out = builder.build(partitions, self.signatures)["docs"]
         logger.info("Aggregation complete.")
-    
-    def _load_analyzed_items(self) -> List[Dict[str, Any]]:
-        items = []
+
+    def _partitions(self) -> Dict[str, List[str]]:
+        """
+        파티션 키 -> 파일 목록
+        - analyzed/<source>/<YYYY-MM>/<id>.json
+        - 파티션 도입 이전의 analyzed/<id>.json 파일은 legacy-<n> 묶음으로 처리
+        """
+        partitions = {}
         if not os.path.exists(self.analyzed_dir):
-            return items
-            
-        for filename in os.listdir(self.analyzed_dir):
-            if filename.endswith(".json"):
+            return partitions
+
+        for root, dirs, names in os.walk(self.analyzed_dir):
+            rel = os.path.relpath(root, self.analyzed_dir).replace(os.sep, "/")
+            files = sorted(os.path.join(root, n) for n in names if n.endswith(".json"))
+            if rel == ".":
+                chunk = AGGREGATION_CONFIG["legacy_chunk_size"]
+                for start in range(0, len(files), chunk):
+                    partitions[f"legacy-{start // chunk:05d}"] = files[start:start + chunk]
+            elif files:
+                partitions[rel] = files
+        return partitions
+
+    def _signature(self, paths: List[str]) -> str:
+        # CI 체크아웃 시 mtime이 바뀌므로 파일명 + 크기로 변경 여부 판단
+        digest = hashlib.sha1(f"v{PartialAggregate.VERSION}\n".encode("utf-8"))
+        for path in paths:
+            digest.update(f"{os.path.basename(path)}:{os.path.getsize(path)}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.partials_dir, key.replace("/", "__") + ".json")
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """
+        파티션 캐시(부분 집계, 검색 문서, 클러스터 입력 문서) 삭제
+        - 캐시 서명은 파일명 + 크기 기준이므로 재분석처럼 내용만 바뀐 파티션은 직접 무효화
+        """
+        search_dir = os.path.join(self.data_dir, "state", "search")
+        for key in keys:
+            name = key.replace("/", "__") + ".json"
+            for path in (os.path.join(self.partials_dir, name), os.path.join(search_dir, name),
+                         os.path.join(self.clusterer.cache_dir, name)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _load_cached(self, key: str, signature: str) -> Any:
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = loads(f.read())
+            if data.get("signature") == signature:
+                return PartialAggregate.from_dict(data["partial"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable partial cache for {key}: {e}")
+        return None
+
+    def _map_partitions(self, partitions: Dict[str, List[str]]) -> Dict[str, PartialAggregate]:
+        """변경된 파티션만 map (workers > 1이면 프로세스 풀), 나머지는 캐시된 부분 집계 사용"""
+        partials = {}
+        pending = {}
+        for key, paths in partitions.items():
+            signature = self.signatures[key] = self._signature(paths)
+            cached = self._load_cached(key, signature)
+            if cached is not None:
+                partials[key] = cached
+            else:
+                pending[key] = (paths, signature)
+
+        if pending:
+            logger.info(f"Mapping {len(pending)} changed partitions ({len(partials)} cached) with {self.workers} workers...")
+            keys = sorted(pending)
+            if self.workers > 1 and len(keys) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(keys))) as pool:
+                    results = list(pool.map(map_partition, [pending[k][0] for k in keys]))
+            else:
+                results = [map_partition(pending[k][0]) for k in keys]
+
+            for key, partial in zip(keys, results):
+                # 워커 프로세스의 읽기 바이트는 부분 집계로 전달받아 기록
+                pipeline_metrics.add_bytes(read=partial.bytes_read)
+                partials[key] = partial
+                atomic_write_json(self._cache_path(key), {"signature": pending[key][1], "partial": partial})
+
+        # 사라진 파티션의 캐시 정리
+        if os.path.exists(self.partials_dir):
+            live = {os.path.basename(self._cache_path(k)) for k in partitions}
+            for name in os.listdir(self.partials_dir):
+                if name.endswith(".json") and name not in live:
+                    os.remove(os.path.join(self.partials_dir, name))
+        return partials
+
+    def _load_analyzed_items(self) -> List[AnalyzedReview]:
+        """분석 결과 파일 전체를 검증된 AnalyzedReview로 로드 (형식 오류 파일은 건너뜀)"""
+        items = []
+        for key, paths in sorted(self._partitions().items()):
+            for path in paths:
                 try:
-                    with open(os.path.join(self.analyzed_dir, filename), "r", encoding="utf-8") as f:
-                        items.append(json.load(f))
+                    item, size = read_analyzed_file(path)
                 except Exception as e:
-                    logger.error(f"Error loading {filename}: {e}")
+                    logger.error(f"Error loading {os.path.basename(path)}: {e}")
+                    continue
+                pipeline_metrics.add_bytes(read=size)
+                items.append(item)
         return items
 
-    def generate_stats(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _build_partial(self, items: List[AnalyzedReview]) -> PartialAggregate:
+        partial = PartialAggregate()
+        for item in items:
+            partial.add(item)
+        return partial
+
+    def generate_stats(self, items: List[AnalyzedReview]) -> Dict[str, Any]:
         """기본 통계 생성 (stats.json)"""
+        return self._write_stats(self._build_partial(items))
+
+    def generate_trends(self, items: List[AnalyzedReview]) -> Dict[str, Any]:
+        """시계열 트렌드 생성 (trends.json)"""
+        return self._write_trends(self._build_partial(items))
+
+    def generate_top_issues(self, items: List[AnalyzedReview]) -> Dict[str, Any]:
+        """Top 이슈 추출 (top-issues.json)"""
+        docs = [_cluster_doc(item) for item in items if self.clusterer.wants(item)]
+        self.clusters = self.clusterer.run(docs, AGGREGATION_CONFIG["example_pool"])
+        return self._write_top_issues(self._build_partial(items))
+
+    def generate_cube(self, items: List[AnalyzedReview]) -> Dict[str, RollupCube]:
+        """다차원 롤업 큐브 생성 (cube/<grain>.json)"""
+        return self._write_cube(self._build_partial(items))
+
+    def _write_output(self, name: str, data: Dict[str, Any]) -> bool:
+        """aggregated/<name> 저장 (updated_at 외 내용이 바뀐 경우에만 재기록)"""
+        written = write_output(os.path.join(self.aggregated_dir, name), data, sidecar=self.outputs)
+        self.outputs.save()
+        return written
+
+    def _write_stats(self, agg: PartialAggregate) -> Dict[str, Any]:
+        # 고유 작성자 수는 파티션 부분 집계 스케치를 병합한 값만 사용 (재분석/삭제된 항목이 남지 않도록)
+        authors = agg.authors
+        ringle = agg.ringle
+        r_total = ringle["count"]
+
         stats = {
             "updated_at": datetime.now().isoformat(),
             "total": {
-                "reviews": len(items),
-                "sources": defaultdict(int)
+                "reviews": agg.items,
+                "sources": dict(sorted(agg.sources.items())),
+                # 고유 작성자 수 (HyperLogLog 추정치, 소수 작성자 편중 확인용)
+                "unique_authors": authors.count("total", "all"),
+                "source_unique_authors": authors.counts("sources")
             },
             "ringle": {
-                "total": 0,
+                "total": r_total,
                 "average_rating": 0.0,
-                "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
-                "problem_type_distribution": defaultdict(int),
-                "churn_signal_rate": 0.0
+                "sentiment_distribution": {k: 0 for k in SENTIMENT_KEYS},
+                "problem_type_distribution": {},
+                "churn_signal_rate": 0.0,
+                "unique_authors": authors.count("ringle", "all"),
+                "problem_type_unique_authors": authors.counts("problem_types")
             },
-            "competitors": defaultdict(lambda: {
-                "total": 0,
-                "average_rating": 0.0,
-                "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
-                "ratings": [] # 임시 저장
-            })
+            "competitors": {}
         }
-        
-        ringle_ratings = []
-        ringle_churn_count = 0
-        word_counts = Counter()
-        
-        for item in items:
-            # Source count
-            source_type = item.get("source_type", "unknown")
-            stats["total"]["sources"][source_type] += 1
-            
-            analysis = item.get("analysis", {})
-            sentiment = analysis.get("sentiment", "neutral")
-            rating = item.get("rating")
-            
-            if item.get("is_target"):
-                # Ringle
-                stats["ringle"]["total"] += 1
-                stats["ringle"]["sentiment_distribution"][sentiment] += 1
-                if rating is not None:
-                    ringle_ratings.append(rating)
-                
-                pt = analysis.get("problem_type")
-                if pt:
-                    stats["ringle"]["problem_type_distribution"][pt] += 1
-                
-                # Word Cloud Keywords
-                phrases = analysis.get("key_phrases", [])
-                if phrases:
-                    for p in phrases:
-                        word_counts[p] += 1
-                
-                if analysis.get("churn_signal"):
-                    ringle_churn_count += 1
-            else:
-                # Competitors
-                comp_name = item.get("source_name", "unknown")
-                comp_stats = stats["competitors"][comp_name]
-                comp_stats["total"] += 1
-                comp_stats["sentiment_distribution"][sentiment] += 1
-                if rating is not None:
-                    comp_stats["ratings"].append(rating)
 
         # Calculate Ringle Averages
-        r_total = stats["ringle"]["total"]
         if r_total > 0:
-            if ringle_ratings:
-                stats["ringle"]["average_rating"] = round(sum(ringle_ratings) / len(ringle_ratings), 2)
-            
-            for k in stats["ringle"]["sentiment_distribution"]:
-                stats["ringle"]["sentiment_distribution"][k] = round(stats["ringle"]["sentiment_distribution"][k] / r_total, 2)
-            
-            for k in stats["ringle"]["problem_type_distribution"]:
-                stats["ringle"]["problem_type_distribution"][k] = round(stats["ringle"]["problem_type_distribution"][k] / r_total, 2)
-                
-            stats["ringle"]["churn_signal_rate"] = round(ringle_churn_count / r_total, 2)
+            stats["ringle"]["average_rating"] = _avg_rating(ringle) or 0.0
+            for k in SENTIMENT_KEYS:
+                stats["ringle"]["sentiment_distribution"][k] = round(ringle["sentiment"][k] / r_total, 2)
+            for k, v in sorted(agg.ringle_problem_types.items()):
+                stats["ringle"]["problem_type_distribution"][k] = round(v / r_total, 2)
+            stats["ringle"]["churn_signal_rate"] = round(agg.ringle_churn / r_total, 2)
 
         # Calculate Competitor Averages
-        for name, data in stats["competitors"].items():
-            c_total = data["total"]
-            if c_total > 0:
-                ratings = data.pop("ratings")
-                if ratings:
-                    data["average_rating"] = round(sum(ratings) / len(ratings), 2)
-                
-                for k in data["sentiment_distribution"]:
-                    data["sentiment_distribution"][k] = round(data["sentiment_distribution"][k] / c_total, 2)
-            else:
-                data.pop("ratings", None)
+        for name, data in sorted(agg.competitors.items()):
+            c_total = data["count"]
+            stats["competitors"][name] = {
+                "total": c_total,
+                "average_rating": _avg_rating(data) or 0.0,
+                "sentiment_distribution": {k: round(data["sentiment"][k] / c_total, 2) for k in SENTIMENT_KEYS},
+                "unique_authors": authors.count("competitors", name)
+            }
 
         # Word Cloud Data (Top 50)
-        stats["word_cloud"] = [{"text": k, "weight": v} for k, v in word_counts.most_common(50)]
+        stats["word_cloud"] = [{"text": label, "weight": v} for _, label, v in agg.word_cloud.top(50)]
 
         # Save
-        with open(os.path.join(self.aggregated_dir, "stats.json"), "w", encoding="utf-8") as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
-            
+        self._write_output("stats.json", stats)
+
         return stats
 
-    def generate_trends(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """시계열 트렌드 생성 (trends.json)"""
-        daily_groups = defaultdict(lambda: {
-            "ringle": {"count": 0, "ratings": [], "sentiment": {"positive": 0, "neutral": 0, "negative": 0}, "churn_signals": 0},
-            "competitors": defaultdict(lambda: {"count": 0, "ratings": [], "sentiment": {"positive": 0, "neutral": 0, "negative": 0}})
-        })
-        
-        for item in items:
-            created_at = item.get("created_at")
-            if not created_at:
-                continue
-            date_str = created_at.split("T")[0]
-            
-            group = daily_groups[date_str]
-            analysis = item.get("analysis", {})
-            sentiment = analysis.get("sentiment", "neutral")
-            rating = item.get("rating")
-            
-            if item.get("is_target"):
-                group["ringle"]["count"] += 1
-                group["ringle"]["sentiment"][sentiment] += 1
-                if rating is not None:
-                    group["ringle"]["ratings"].append(rating)
-                if analysis.get("churn_signal"):
-                    group["ringle"]["churn_signals"] += 1
-            else:
-                comp_name = item.get("source_name", "unknown")
-                c_group = group["competitors"][comp_name]
-                c_group["count"] += 1
-                c_group["sentiment"][sentiment] += 1
-                if rating is not None:
-                    c_group["ratings"].append(rating)
-        
+    def _write_trends(self, agg: PartialAggregate) -> Dict[str, Any]:
+        authors = agg.authors
         daily_list = []
-        for date in sorted(daily_groups.keys()):
-            data = daily_groups[date]
-            
-            # Ringle Avg
-            r_ratings = data["ringle"].pop("ratings")
-            data["ringle"]["avg_rating"] = round(sum(r_ratings) / len(r_ratings), 2) if r_ratings else None
-            
-            # Competitor Avg
-            for c_name, c_data in data["competitors"].items():
-                c_ratings = c_data.pop("ratings")
-                c_data["avg_rating"] = round(sum(c_ratings) / len(c_ratings), 2) if c_ratings else None
-            
+        for date in sorted(agg.daily.keys()):
+            day = agg.daily[date]
+            ringle = day["ringle"]
             daily_list.append({
                 "date": date,
-                **data
+                "ringle": {
+                    "count": ringle["count"],
+                    "sentiment": {k: ringle["sentiment"][k] for k in SENTIMENT_KEYS},
+                    "churn_signals": ringle["churn_signals"],
+                    "avg_rating": _avg_rating(ringle),
+                    "unique_authors": authors.count("daily", date)
+                },
+                "competitors": {
+                    name: {
+                        "count": group["count"],
+                        "sentiment": {k: group["sentiment"][k] for k in SENTIMENT_KEYS},
+                        "avg_rating": _avg_rating(group)
+                    }
+                    for name, group in sorted(day["competitors"].items())
+                }
             })
-            
+
         trends = {
             "updated_at": datetime.now().isoformat(),
             "daily": daily_list
         }
-        
-        with open(os.path.join(self.aggregated_dir, "trends.json"), "w", encoding="utf-8") as f:
-            json.dump(trends, f, ensure_ascii=False, indent=2)
-            
+
+        self._write_output("trends.json", trends)
+        # 대시보드는 manifest.json + 월별 열 지향 파일 사용 (trends.json은 기존 소비자 호환용)
+        TrendPartitionWriter(self.aggregated_dir, self.outputs).write(daily_list)
+        self.outputs.save()
+
         return trends
 
-    def generate_top_issues(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Top 이슈 추출 (top-issues.json)"""
-        ringle_items = [i for i in items if i.get("is_target")]
-        
+    def _write_cube(self, agg: PartialAggregate) -> Dict[str, RollupCube]:
+        """
+        다차원 롤업 큐브 (cube/day.json, week.json, month.json)
+        - 날짜 x 소스 유형 x 소스 이름 x 감성 x 문제 유형 x 이탈 신호 셀별 건수/평점 합계
+        - 대시보드 필터 조합은 원본 리뷰를 다시 읽지 않고 큐브 셀 합산으로 계산 (RollupCube.query)
+        """
+        cubes = {}
+        for grain in AGGREGATION_CONFIG["cube_grains"]:
+            cube = agg.cube if grain == agg.cube.grain else agg.cube.rollup(grain)
+            cube.save(cube_path(self.aggregated_dir, grain), self.outputs)
+            cubes[grain] = cube
+        self.outputs.save()
+        logger.info(f"Rollup cube: {len(agg.cube)} day cells ({', '.join(f'{g} {len(c)}' for g, c in cubes.items())})")
+        return cubes
+
+    def _rolling_rankings(self, agg: PartialAggregate) -> Dict[str, Any]:
+        """
+        최근 N일(7/30일) 문제 유형/이탈 키워드 순위와 직전 N일 대비 증감
+        - 기준일은 데이터의 마지막 날짜
+        - 일별 버킷을 2N일 구간에 걸쳐 한 번 슬라이딩 (직전 구간 끝에서 스냅샷, 마지막 날 현재 구간)
+        """
+        days = {}
+        for date_str, day in agg.daily.items():
+            parsed = _parse_date(date_str)
+            if parsed is not None:
+                days[parsed] = day["issues"]
+        if not days:
+            return {}
+
+        end = max(days)
+        top_n = AGGREGATION_CONFIG["rolling_top_n"]
+        empty = {"negative": Counter(), "positive": Counter(), "churn": Counter()}
+        labels = agg.churn_keywords.labels
+        rolling = {}
+        for window in AGGREGATION_CONFIG["rolling_windows"]:
+            counters = {kind: SlidingCounter(window) for kind in empty}
+            previous = {kind: Counter() for kind in empty}
+            start = end - timedelta(days=2 * window - 1)
+            for offset in range(2 * window):
+                current_day = start + timedelta(days=offset)
+                buckets = days.get(current_day, empty)
+                for kind, counter in counters.items():
+                    counter.push(buckets[kind])
+                if offset == window - 1:
+                    previous = {kind: counter.snapshot() for kind, counter in counters.items()}
+
+            rows = {kind: counter.totals for kind, counter in counters.items()}
+            rolling[f"{window}d"] = {
+                "start": (end - timedelta(days=window - 1)).isoformat(),
+                "end": end.isoformat(),
+                "previous_start": start.isoformat(),
+                "previous_end": (end - timedelta(days=window)).isoformat(),
+                "negative_issues": _ranked_deltas(rows["negative"], previous["negative"], top_n, "problem_type"),
+                "positive_highlights": _ranked_deltas(rows["positive"], previous["positive"], top_n, "problem_type"),
+                "churn_alerts": _ranked_deltas(rows["churn"], previous["churn"], top_n, "keyword", lambda key: labels.get(key, key))
+            }
+        return rolling
+
+    def _daily_series(self, agg: PartialAggregate) -> Dict[date, Dict[str, int]]:
+        """이상 감지 입력: 날짜 -> {시계열 키: 건수}"""
+        series = {}
+        for date_str, day in agg.daily.items():
+            parsed = _parse_date(date_str)
+            if parsed is None:
+                continue
+            values = {
+                "ringle:reviews": day["ringle"]["count"],
+                "ringle:negative": day["ringle"]["sentiment"]["negative"]
+            }
+            values.update((f"problem_type:{pt}", n) for pt, n in day["issues"]["negative"].items())
+            values.update((f"churn_keyword:{kw}", n) for kw, n in day["issues"]["churn"].items())
+            values.update((f"competitor:{name}", g["count"]) for name, g in day["competitors"].items())
+            series[parsed] = {key: n for key, n in values.items() if n}
+        return series
+
+    def _alert_matches(self, alert: Dict[str, Any], item: AnalyzedReview, keyword_key: Any) -> bool:
+        analysis = item.analysis
+        kind, name = alert["series"], alert["name"]
+        if kind == "competitor":
+            return not item.is_target and item.source_name == name
+        if not item.is_target:
+            return False
+        if kind == "problem_type":
+            return analysis.sentiment == "negative" and analysis.problem_type == name
+        if kind == "churn_keyword":
+            return analysis.churn_signal and any(keyword_key(k) == name for k in analysis.churn_keywords)
+        if name == "negative":
+            return analysis.sentiment == "negative"
+        return True
+
+    def _attach_reviews(self, alerts: List[Dict[str, Any]], partitions: Dict[str, List[str]], keyword_key: Any) -> None:
+        """알림 날짜가 속한 월 파티션만 다시 읽어 알림별 대표 리뷰(최대 3건) 첨부"""
+        by_date = defaultdict(list)
+        for alert in alerts:
+            alert["reviews"] = []
+            by_date[alert["date"]].append(alert)
+        months = {d[:7] for d in by_date}
+        for key in sorted(partitions):
+            if key.rsplit("/", 1)[-1] not in months:
+                continue
+            for path in partitions[key]:
+                try:
+                    item, size = read_analyzed_file(path)
+                except Exception as e:
+                    logger.error(f"Error loading {os.path.basename(path)}: {e}")
+                    continue
+                pipeline_metrics.add_bytes(read=size)
+                for alert in by_date.get(item.date, ()):
+                    if self._alert_matches(alert, item, keyword_key):
+                        _push_example(alert["reviews"], _example(item))
+        for alert in alerts:
+            alert["reviews"] = _select_examples(_rank_examples(alert["reviews"]))
+
+    def _write_alerts(self, agg: PartialAggregate, partitions: Dict[str, List[str]]) -> Dict[str, Any]:
+        """일별 급증 알림 (alerts.json), 감지 상태는 data/state/anomaly-state.json에 누적"""
+        detector = AnomalyDetector(os.path.join(self.data_dir, "state", "anomaly-state.json"), ANOMALY_CONFIG)
+        alerts = detector.detect(self._daily_series(agg))
+        labels = agg.churn_keywords.labels
+        for alert in alerts:
+            if alert["series"] == "churn_keyword":
+                alert["label"] = labels.get(alert["name"], alert["name"])
+        self._attach_reviews(alerts, partitions, agg.churn_keywords.key)
+        detector.save()
+
+        result = {
+            "updated_at": datetime.now().isoformat(),
+            "last_closed": detector.last_closed.isoformat() if detector.last_closed else None,
+            "alerts": alerts
+        }
+        self._write_output("alerts.json", result)
+
+        return result
+
+    def _write_top_issues(self, agg: PartialAggregate) -> Dict[str, Any]:
+        def ranked(issues):
+            return sorted(issues.items(), key=lambda kv: (-kv[1]["count"], kv[0]))[:5]
+
+        # 0. Issue Clusters (문제 유형 안의 세부 이슈, 문자 n-gram 클러스터링)
+        clustered = sum(c["count"] for c in self.clusters)
+        issue_clusters = []
+        for cluster in self.clusters[:CLUSTER_CONFIG["top_n"]]:
+            problem_type, pt_count = min(cluster["problem_types"].items(), key=lambda kv: (-kv[1], kv[0]))
+            issue_clusters.append({
+                "cluster_id": cluster["cluster"],
+                "label": _cluster_label(cluster),
+                "count": cluster["count"],
+                "share": round(cluster["count"] / clustered, 3),
+                "problem_type": problem_type,
+                "problem_type_share": round(pt_count / cluster["count"], 2),
+                "keywords": [p for p, _ in sorted(cluster["key_phrases"].items(), key=lambda kv: (-kv[1], kv[0]))[:5]],
+                "terms": cluster["terms"],
+                "representative_reviews": _select_examples(cluster["members"])
+            })
+
         # 1. Negative Issues
-        neg_items = [i for i in ringle_items if i.get("analysis", {}).get("sentiment") == "negative"]
-        neg_counts = Counter([i.get("analysis", {}).get("problem_type") for i in neg_items if i.get("analysis", {}).get("problem_type")])
-        
         negative_issues = []
-        for pt, count in neg_counts.most_common(5):
-            related = [i for i in neg_items if i.get("analysis", {}).get("problem_type") == pt]
-            keywords = Counter()
-            for r in related:
-                for k in r.get("analysis", {}).get("key_phrases", []):
-                    keywords[k] += 1
-            
+        for pt, issue in ranked(agg.issues["negative"]):
             negative_issues.append({
                 "problem_type": pt,
-                "count": count,
-                "severity": "high" if count >= 10 else "medium",
-                "representative_reviews": self._select_representative_reviews(related),
-                "keywords": [k for k, v in keywords.most_common(5)]
+                "count": issue["count"],
+                "severity": "high" if issue["count"] >= 10 else "medium",
+                "representative_reviews": _select_examples(_rank_examples(issue["examples"])),
+                "keywords": [label for _, label, _ in issue["keywords"].top(5)],
+                "sub_issues": [{"cluster_id": c["cluster_id"], "label": c["label"], "count": c["count"]}
+                               for c in issue_clusters if c["problem_type"] == pt]
             })
-            
+
         # 2. Positive Highlights
-        pos_items = [i for i in ringle_items if i.get("analysis", {}).get("sentiment") == "positive"]
-        pos_counts = Counter([i.get("analysis", {}).get("problem_type") for i in pos_items if i.get("analysis", {}).get("problem_type")])
-        
         positive_highlights = []
-        for pt, count in pos_counts.most_common(5):
-            related = [i for i in pos_items if i.get("analysis", {}).get("problem_type") == pt]
-            keywords = Counter()
-            for r in related:
-                for k in r.get("analysis", {}).get("key_phrases", []):
-                    keywords[k] += 1
-            
+        for pt, issue in ranked(agg.issues["positive"]):
             positive_highlights.append({
                 "problem_type": pt,
-                "count": count,
-                "representative_reviews": self._select_representative_reviews(related),
-                "keywords": [k for k, v in keywords.most_common(5)]
+                "count": issue["count"],
+                "representative_reviews": _select_examples(_rank_examples(issue["examples"])),
+                "keywords": [label for _, label, _ in issue["keywords"].top(5)]
             })
-            
+
         # 3. Churn Alerts
-        churn_items = [i for i in ringle_items if i.get("analysis", {}).get("churn_signal")]
         churn_alerts = []
-        if churn_items:
-            churn_kws = Counter()
-            for i in churn_items:
-                for k in i.get("analysis", {}).get("churn_keywords", []):
-                    churn_kws[k] += 1
-            
-            for kw, count in churn_kws.most_common(5):
-                related = [i for i in churn_items if kw in i.get("analysis", {}).get("churn_keywords", [])]
-                churn_alerts.append({
-                    "keyword": kw,
-                    "count": count,
-                    "recent_examples": self._select_representative_reviews(related)
-                })
-                
+        for key, kw, count in agg.churn_keywords.top(5):
+            churn_alerts.append({
+                "keyword": kw,
+                "count": count,
+                "recent_examples": _select_examples(_rank_examples(agg.churn_examples.get(key, [])))
+            })
+
         # 4. Competitor Comparisons
-        comp_items = [i for i in ringle_items if i.get("analysis", {}).get("competitor_mentions")]
         competitor_comparisons = []
-        comp_mentions = Counter()
-        for i in comp_items:
-            for m in i.get("analysis", {}).get("competitor_mentions", []):
-                comp_mentions[m] += 1
-        
-        for comp, count in comp_mentions.most_common():
-            related = [i for i in comp_items if comp in i.get("analysis", {}).get("competitor_mentions", [])]
+        for comp, mention in sorted(agg.mentions.items(), key=lambda kv: (-kv[1]["count"], kv[0])):
             competitor_comparisons.append({
                 "competitor": comp,
-                "mention_count": count,
-                "examples": self._select_representative_reviews(related)
+                "mention_count": mention["count"],
+                "examples": _select_examples(_rank_examples(mention["examples"]))
             })
-            
+
         top_issues = {
             "updated_at": datetime.now().isoformat(),
             "ringle": {
                 "negative_issues": negative_issues,
                 "positive_highlights": positive_highlights,
                 "churn_alerts": churn_alerts,
-                "competitor_comparisons": competitor_comparisons
+                "competitor_comparisons": competitor_comparisons,
+                "issue_clusters": issue_clusters,
+                # 5. Rolling Windows (최근 N일 순위 + 직전 N일 대비 증감)
+                "rolling": self._rolling_rankings(agg)
             }
         }
-        
-        with open(os.path.join(self.aggregated_dir, "top-issues.json"), "w", encoding="utf-8") as f:
-            json.dump(top_issues, f, ensure_ascii=False, indent=2)
-            
-        return top_issues
 
-    def _select_representative_reviews(self, items: List[Dict[str, Any]], count: int = 3) -> List[Dict[str, Any]]:
-        """대표 리뷰 선정 (길이순 + 최신순)"""
-        # 텍스트 길이로 정렬
-        sorted_items = sorted(items, key=lambda x: len(x.get("text", "")), reverse=True)
-        
-        selected = []
-        for item in sorted_items[:count]:
-            selected.append({
-                "id": item.get("id"),
-                "text": item.get("text"),
-                "source": item.get("source_type"),
-                "rating": item.get("rating"),
-                "created_at": item.get("created_at")
-            })
-        return selected
\ No newline at end of file
+        self._write_output("top-issues.json", top_issues)
+
+        return top_issues
@@ -0,0 +1,156 @@
+import os
+import json
+import math
+import hashlib
+import logging
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional
+
+try:
+    from .fileio import write_output
+except ImportError:
+    from fileio import write_output
+
+logger = logging.getLogger(__name__)
+
+class SeriesState:
+    """일별 시계열 하나의 EWMA 평균/분산 (새 날짜 1개당 O(1) 갱신)"""
+
+    __slots__ = ("mean", "var")
+
+    def __init__(self, mean: float = 0.0, var: float = 0.0):
+        self.mean = mean
+        self.var = var
+
+    def update(self, value: float, alpha: float) -> None:
+        # West(1979) 방식 지수가중 평균/분산 증분 갱신
+        diff = value - self.mean
+        incr = alpha * diff
+        self.mean += incr
+        self.var = (1 - alpha) * (self.var + diff * incr)
+
+    def zscore(self, value: float, min_std: float) -> float:
+        return (value - self.mean) / max(math.sqrt(self.var), min_std)
+
+
+class AnomalyDetector:
+    """
+    일별 급증 감지 (EWMA z-score, data/state/anomaly-state.json)
+    - 시계열 키: "problem_type:<유형>", "churn_keyword:<키워드>", "competitor:<이름>", "ringle:<지표>"
+    - 마감된 날짜(마지막 날짜 이전)만 상태에 반영 -> 실행마다 새로 마감된 날짜만 O(시계열 수)로 갱신
+    - 마지막 날짜는 아직 수집 중일 수 있으므로 상태를 바꾸지 않고 점수만 계산
+    - 새로 등장한 시계열은 그동안 0이었던 것으로 간주 (평균 0, 분산 0에서 시작)
+    - 마감된 날짜별 건수 해시를 함께 저장 -> 늦게 분석/가져오기/백필된 리뷰로 마감일 건수가 바뀌면
+      기준선과 알림을 처음부터 다시 계산 (바뀐 날 이전 상태는 저장하지 않으므로 전체 재계산, O(날짜 수 x 시계열 수))
+    """
+
+    def __init__(self, path: Optional[str], config: Dict[str, Any]):
+        self.path = path
+        self.config = config
+        self.series: Dict[str, SeriesState] = {}
+        self.days = 0
+        self.last_closed: Optional[date] = None
+        self.alerts: List[Dict[str, Any]] = []  # 마감된 날짜의 알림 (retention_days 동안 보관)
+        self.closed: Dict[str, str] = {}  # 마감된 날짜 -> 건수 해시 (건수가 있는 날만)
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.series = {key: SeriesState(*values) for key, values in data.get("series", {}).items()}
+            self.days = data.get("days", 0)
+            self.last_closed = date.fromisoformat(data["last_closed"]) if data.get("last_closed") else None
+            self.alerts = data.get("alerts", [])
+            self.closed = data.get("closed", {})
+
+    @staticmethod
+    def _digest(values: Dict[str, float]) -> Optional[str]:
+        if not values:
+            return None
+        return hashlib.sha1(json.dumps(sorted(values.items())).encode("utf-8")).hexdigest()[:12]
+
+    def _changed_since(self, daily: Dict[date, Dict[str, float]]) -> Optional[date]:
+        """저장 이후 건수가 바뀐 가장 이른 마감일 (없으면 None)"""
+        if self.last_closed is None:
+            return None
+        days = {d for d in daily if d <= self.last_closed} | {date.fromisoformat(d) for d in self.closed}
+        changed = [d for d in days if self._digest(daily.get(d, {})) != self.closed.get(d.isoformat())]
+        return min(changed) if changed else None
+
+    def _check(self, day: date, values: Dict[str, float]) -> List[Dict[str, Any]]:
+        """현재 기준선 대비 급증 시계열 (상태 변경 없음)"""
+        if self.days < self.config["warmup_days"]:
+            return []
+        alerts = []
+        for key, value in values.items():
+            if value < self.config["min_count"]:
+                continue
+            state = self.series.get(key) or SeriesState()
+            z = state.zscore(value, self.config["min_std"])
+            if z < self.config["z_threshold"]:
+                continue
+            kind, _, name = key.partition(":")
+            alerts.append({
+                "date": day.isoformat(),
+                "series": kind,
+                "name": name,
+                "count": value,
+                "baseline": round(state.mean, 2),
+                "zscore": round(z, 2),
+                "severity": "high" if z >= self.config["high_z"] else "medium"
+            })
+        return alerts
+
+    def _close(self, day: date, values: Dict[str, float]) -> None:
+        """마감된 날짜 반영: 알림 판정 후 모든 시계열 EWMA 갱신 (값이 없는 시계열은 0)"""
+        self.alerts.extend(self._check(day, values))
+        alpha = self.config["alpha"]
+        for key in values.keys() - self.series.keys():
+            self.series[key] = SeriesState()
+        for key, state in self.series.items():
+            state.update(values.get(key, 0), alpha)
+        # 오래 0이었던 시계열 정리 (상태 크기 유지)
+        floor = self.config["prune_below"]
+        for key in [k for k, s in self.series.items() if s.mean < floor and k not in values]:
+            del self.series[key]
+        self.days += 1
+        self.last_closed = day
+        digest = self._digest(values)
+        if digest:
+            self.closed[day.isoformat()] = digest
+
+    def detect(self, daily: Dict[date, Dict[str, float]]) -> List[Dict[str, Any]]:
+        """
+        새로 마감된 날짜를 상태에 반영하고 현재 알림 목록 반환
+        (보관 중인 마감일 알림 + 마지막 날짜 잠정 알림, severity/zscore 순)
+        """
+        if not daily:
+            return []
+        end = max(daily)
+        changed = self._changed_since(daily)
+        if changed is not None:
+            logger.info(f"Daily counts changed on closed day {changed}, re-folding anomaly baseline")
+            self.series, self.days, self.last_closed, self.alerts, self.closed = {}, 0, None, [], {}
+        day = min(daily) if self.last_closed is None else self.last_closed + timedelta(days=1)
+        while day < end:
+            self._close(day, daily.get(day, {}))
+            day += timedelta(days=1)
+
+        cutoff = (end - timedelta(days=self.config["retention_days"])).isoformat()
+        self.alerts = [a for a in self.alerts if a["date"] > cutoff]
+        current = [dict(a, provisional=False) for a in self.alerts]
+        if self.last_closed is None or end > self.last_closed:
+            current.extend(dict(a, provisional=True) for a in self._check(end, daily.get(end, {})))
+        return sorted(current, key=lambda a: (a["severity"] != "high", -a["zscore"], a["date"], a["series"], a["name"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "days": self.days,
+            "last_closed": self.last_closed.isoformat() if self.last_closed else None,
+            "series": {key: [round(s.mean, 6), round(s.var, 6)] for key, s in sorted(self.series.items())},
+            "alerts": self.alerts,
+            "closed": dict(sorted(self.closed.items()))
+        }
+
+    def save(self) -> None:
+        if self.path:
+            write_output(self.path, self.to_dict())
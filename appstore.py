@@ -2,14 +2,16 @@ import time
 import uuid
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 
 from app_store_scraper import AppStore
 from config import APPS, COLLECTION_CONFIG
 try:
     from .base import BaseCollector
+    from .scraper_compat import AppStorePager
 except ImportError:
     from base import BaseCollector
+    from scraper_compat import AppStorePager
 
 logger = logging.getLogger(__name__)
 
@@ -48,26 +50,7 @@ class AppStoreCollector(BaseCollector):
                 scraper.review(how_many=self.config.get("count_per_app", 200))
                 
                 for review in scraper.reviews:
-                    item = {
-                        "id": str(uuid.uuid4()),
-                        "source": {
-                            "type": "appstore",
-                            "name": app_name,
-                            "app_key": app_key,
-                            "url": f"https://apps.apple.com/kr/app/id{app_id}"
-                        },
-                        # App Store는 고유 ID를 제공하지 않으므로 조합해서 생성
-                        "external_id": f"{app_id}_{review['userName']}_{review['date'].timestamp()}",
-                        "author": review['userName'],
-                        "rating": review['rating'],
-                        "text": f"{review.get('title', '')}\n{review['review']}",
-                        "created_at": review['date'].isoformat() if review.get('date') else datetime.now().isoformat(),
-                        "collected_at": datetime.now().isoformat(),
-                        "metadata": {
-                            "is_edited": review.get('isEdited', False)
-                        }
-                    }
-                    results.append(item)
+                    results.append(self._to_item(review, app_key, app_info))
                 
                 logger.info(f"Collected {len(scraper.reviews)} reviews for {app_name}")
                 time.sleep(1)
@@ -75,4 +58,58 @@ class AppStoreCollector(BaseCollector):
             except Exception as e:
                 logger.error(f"Error collecting App Store reviews for {app_name}: {e}")
                 
-        return results
\ No newline at end of file
+        return results
+
+    def backfill_units(self) -> List[str]:
+        return [app_key for app_key, app_info in self.apps.items() if app_info.get("appstore")]
+
+    def iter_backfill(self, unit: str, cursor: Any, since: datetime) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """리뷰 API의 offset 페이지를 따라 since 시점까지 최신순으로 거슬러 올라가며 수집"""
+        app_info = self.apps[unit]
+        page_size = self.config.get("backfill_page_size", 200)
+
+        scraper = AppStore(
+            country=self.config.get("country", "kr"),
+            app_name=unit,
+            app_id=app_info["appstore"]
+        )
+        pager = AppStorePager(scraper, cursor)
+
+        while True:
+            batch = pager.fetch(page_size)
+            if not batch and pager.next_offset is not None:
+                # 스크레이퍼가 내부에서 예외를 삼키므로 빈 페이지는 실패로 간주 (체크포인트 유지)
+                raise RuntimeError(f"App Store page fetch failed for {unit}")
+
+            items = [self._to_item(r, unit, app_info) for r in batch if not r.get('date') or r['date'] >= since]
+            reached_cutoff = any(r.get('date') and r['date'] < since for r in batch)
+            # 마지막 페이지 이후 next_offset은 None
+            next_offset = pager.next_offset
+            next_cursor = None if (not batch or reached_cutoff or next_offset is None) else next_offset
+
+            yield items, next_cursor
+            if next_cursor is None:
+                return
+            time.sleep(1)
+
+    def _to_item(self, review: Dict[str, Any], app_key: str, app_info: Dict[str, Any]) -> Dict[str, Any]:
+        app_id = app_info["appstore"]
+        return {
+            "id": str(uuid.uuid4()),
+            "source": {
+                "type": "appstore",
+                "name": app_info["name"],
+                "app_key": app_key,
+                "url": f"https://apps.apple.com/kr/app/id{app_id}"
+            },
+            # App Store는 고유 ID를 제공하지 않으므로 조합해서 생성
+            "external_id": f"{app_id}_{review['userName']}_{review['date'].timestamp()}",
+            "author": review['userName'],
+            "rating": review['rating'],
+            "text": f"{review.get('title', '')}\n{review['review']}",
+            "created_at": review['date'].isoformat() if review.get('date') else datetime.now().isoformat(),
+            "collected_at": datetime.now().isoformat(),
+            "metadata": {
+                "is_edited": review.get('isEdited', False)
+            }
+        }
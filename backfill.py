@@ -0,0 +1,99 @@
+import os
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Any
+
+try:
+    from .raw_store import RawStore
+    from .fileio import atomic_write_json
+except ImportError:
+    from raw_store import RawStore
+    from fileio import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+class BackfillRunner:
+    """
+    과거 데이터 백필
+    - 수집기별 작업 단위(앱/키워드)를 병렬로 처리하며 각 단위는 since 시점까지 페이지를 거슬러 올라감
+    - 페이지 저장 직후 커서를 체크포인트에 기록하므로 중단 후 재실행 시 이어서 수집
+    - 저장은 RawStore를 거치므로 일일 수집과 중복 집계되지 않음
+    """
+
+    def __init__(self, data_dir: str, collectors: List[Any], since: datetime, workers: int = 4):
+        self.collectors = collectors
+        self.since = since
+        self.workers = max(1, workers)
+        self.store = RawStore(data_dir)
+        self.checkpoint_path = os.path.join(self.store.state_dir, "backfill-checkpoint.json")
+        self._lock = threading.Lock()
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        since_str = self.since.date().isoformat()
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("since") == since_str:
+                return checkpoint
+            logger.info(f"Backfill cutoff changed ({checkpoint.get('since')} -> {since_str}), starting over.")
+        return {"since": since_str, "units": {}}
+
+    def _save_checkpoint(self) -> None:
+        # 호출자가 self._lock을 보유한 상태여야 함
+        self.checkpoint["updated_at"] = datetime.now().isoformat()
+        atomic_write_json(self.checkpoint_path, self.checkpoint)
+
+    def run(self) -> Dict[str, int]:
+        """백필 실행, 작업 단위별 신규 저장 건수 반환"""
+        jobs = []
+        for collector in self.collectors:
+            for unit in collector.backfill_units():
+                jobs.append((collector, unit))
+
+        pending = [(c, u) for c, u in jobs if not self._unit_state(c, u).get("done")]
+        print(f"    {len(jobs)} backfill units, {len(jobs) - len(pending)} already complete.")
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._run_unit, c, u): self._unit_key(c, u) for c, u in pending}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                    print(f"    [{key}] done ({results[key]} new items)")
+                except Exception as e:
+                    # 체크포인트는 마지막 성공 페이지 기준으로 남아 있으므로 재실행 시 이어서 진행
+                    logger.error(f"Backfill unit {key} failed: {e}")
+                    print(f"    [{key}] failed, will resume from checkpoint: {e}")
+        return results
+
+    def _unit_key(self, collector: Any, unit: str) -> str:
+        return f"{collector.get_source_type()}:{unit}"
+
+    def _unit_state(self, collector: Any, unit: str) -> Dict[str, Any]:
+        with self._lock:
+            return self.checkpoint["units"].setdefault(
+                self._unit_key(collector, unit),
+                {"cursor": None, "done": False, "pages": 0, "saved": 0}
+            )
+
+    def _run_unit(self, collector: Any, unit: str) -> int:
+        source_type = collector.get_source_type()
+        state = self._unit_state(collector, unit)
+        saved = 0
+
+        for items, next_cursor in collector.iter_backfill(unit, state["cursor"], self.since):
+            _, count = self.store.save(source_type, items, tag="backfill")
+            saved += count
+            with self._lock:
+                state["cursor"] = next_cursor
+                state["pages"] += 1
+                state["saved"] += count
+                state["done"] = next_cursor is None
+                self._save_checkpoint()
+
+        return saved
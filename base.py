@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Tuple
 
 class BaseCollector(ABC):
     def __init__(self, config: Dict[str, Any]):
@@ -13,4 +14,17 @@ class BaseCollector(ABC):
     @abstractmethod
     def get_source_type(self) -> str:
         """소스 타입 반환"""
-        pass
\ No newline at end of file
+        pass
+
+    def backfill_units(self) -> List[str]:
+        """백필 작업 단위 목록 (앱 키, 검색 키워드 등). 백필 미지원 시 빈 리스트"""
+        return []
+
+    def iter_backfill(self, unit: str, cursor: Any, since: datetime) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """
+        백필 수집: cursor 위치부터 since 시점까지 과거 방향으로 페이지 단위 수집
+        페이지마다 (items, next_cursor) 반환, next_cursor가 None이면 해당 단위 완료
+        cursor는 체크포인트에 저장되므로 JSON 직렬화 가능해야 함
+        백필 미지원 시 빈 이터레이터 (backfill_units가 빈 리스트이므로 보통 호출되지 않음)
+        """
+        return iter(())
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Any, Callable
+
+try:
+    from .synthetic import SyntheticCorpus
+    from .aggregator import DataAggregator
+    from .preprocessor import TextPreprocessor
+    from .budget import BudgetGovernor, prioritize
+    from .claude_client import ClaudeAnalyzer
+    from .config import APPS, ANALYSIS_BUDGET, REPLAY_CONFIG
+    from .records import RawReview, AnalyzedReview
+    from .raw_store import RawStore
+    from .registry import available_sources, create_collector
+    from .http_replay import Cassette, FaultInjector, replaying, default_cassette_dir
+except ImportError:
+    from synthetic import SyntheticCorpus
+    from aggregator import DataAggregator
+    from preprocessor import TextPreprocessor
+    from budget import BudgetGovernor, prioritize
+    from claude_client import ClaudeAnalyzer
+    from config import APPS, ANALYSIS_BUDGET, REPLAY_CONFIG
+    from records import RawReview, AnalyzedReview
+    from raw_store import RawStore
+    from registry import available_sources, create_collector
+    from http_replay import Cassette, FaultInjector, replaying, default_cassette_dir
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+class BenchmarkSuite:
+    """
+    파이프라인 단계별 성능 측정
+    - serialize: 분석 결과를 항목별 JSON 파일로 저장 (run_analysis 출력 경로와 동일)
+    - load: DataAggregator._load_analyzed_items
+    - preprocess: TextPreprocessor 정제/언어감지/스팸/문장분리
+    - analysis_prep: raw 항목 대상 우선순위 큐 + 프롬프트 생성(요약 포함) + 토큰 추정 (API 호출 제외)
+    - aggregate: DataAggregator stats/trends/top-issues 생성
+    - startup: 새 인터프리터에서 main 모듈 임포트 (수집기 지연 로드 확인용, STARTUP_RUNS회 반복)
+    - collect: 녹화된 카세트를 로컬 재생 서버로 돌려주며 전체 수집 단계(수집기 + RawStore 저장) 실행
+      (카세트가 없으면 건너뜀, 수집기 내부 요청 간 대기(time.sleep)는 기본적으로 생략하고 합계만 기록)
+    단계별 wall time, 처리량, tracemalloc 기준 peak 메모리를 기록
+    """
+
+    STAGES = ["serialize", "load", "preprocess", "analysis_prep", "aggregate", "startup", "collect"]
+    STARTUP_RUNS = 5
+
+    def __init__(self, items: int, seed: int = 42, track_memory: bool = True, work_dir: str = None,
+                 replay: Dict[str, Any] = None):
+        self.count = items
+        self.seed = seed
+        self.track_memory = track_memory
+        self.replay = dict(REPLAY_CONFIG, cassette_dir=default_cassette_dir(), real_sleeps=False)
+        self.replay.update(replay or {})
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="rvi-bench-")
+        self.data_dir = os.path.join(self.work_dir, "data")
+        self.items: List[AnalyzedReview] = []
+        self.skipped_sleep = 0.0
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def _measure(self, name: str, func: Callable[[], int]) -> None:
+        if self.track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        processed = func()
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if self.track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        self.results[name] = {
+            "seconds": round(elapsed, 4),
+            "items_per_sec": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+            "peak_mb": round(peak / (1024 * 1024), 2)
+        }
+        print(f"  {name:<14} {elapsed:8.3f}s  {self.results[name]['items_per_sec']:>12,.0f} items/s  peak {self.results[name]['peak_mb']:>8.2f} MB")
+
+    def run(self, stages: List[str] = None) -> Dict[str, Dict[str, float]]:
+        stages = stages or self.STAGES
+        print(f"[Benchmark] {self.count:,} synthetic items (seed={self.seed}) in {self.work_dir}")
+
+        corpus = SyntheticCorpus(seed=self.seed)
+        analyzed_dir = os.path.join(self.data_dir, "analyzed")
+        try:
+            if "serialize" in stages or "load" in stages:
+                self._measure("serialize", lambda: corpus.write_analyzed(analyzed_dir, self.count))
+                if "serialize" not in stages:
+                    self.results.pop("serialize")
+
+            aggregator = DataAggregator(self.data_dir)
+            if "load" in stages:
+                self._measure("load", lambda: len(self._load(aggregator)))
+            if not self.items:
+                self.items = [AnalyzedReview.from_dict(item) for item in SyntheticCorpus(seed=self.seed).iter_items(self.count)]
+
+            if "preprocess" in stages:
+                self._measure("preprocess", self._preprocess)
+            if "analysis_prep" in stages:
+                raw_items = [RawReview.from_dict(item) for item in SyntheticCorpus(seed=self.seed).iter_raw_items(self.count)]
+                self._measure("analysis_prep", lambda: self._analysis_prep(raw_items))
+            if "aggregate" in stages:
+                self._measure("aggregate", lambda: self._aggregate(aggregator))
+            if "startup" in stages:
+                self._measure("startup", self._startup)
+            if "collect" in stages:
+                self._collect_stage()
+        finally:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+        return self.results
+
+    def _load(self, aggregator: DataAggregator) -> List[AnalyzedReview]:
+        self.items = aggregator._load_analyzed_items()
+        return self.items
+
+    def _preprocess(self) -> int:
+        pre = TextPreprocessor()
+        for item in self.items:
+            text = pre.clean(item.text)
+            pre.detect_language(text)
+            pre.is_spam(text)
+            pre.split_utterances(text)
+        return len(self.items)
+
+    def _analysis_prep(self, raw_items: List[RawReview]) -> int:
+        analyzer = ClaudeAnalyzer()  # 프롬프트 생성 로직만 사용 (API 호출 없음)
+        governor = BudgetGovernor(os.path.join(self.data_dir, "state"), ANALYSIS_BUDGET)
+        candidates = [(item, None) for item in raw_items]
+        count = 0
+        for item, _ in prioritize(candidates, lambda item: APPS.get(item.app_key, {}).get("is_target", True)):
+            governor.estimate(analyzer.build_prompt(item))
+            count += 1
+        return count
+
+    def _aggregate(self, aggregator: DataAggregator) -> int:
+        aggregator.generate_stats(self.items)
+        aggregator.generate_trends(self.items)
+        aggregator.generate_top_issues(self.items)
+        return len(self.items)
+
+    def _startup(self) -> int:
+        # aggregate/analyze 모드 시작 비용: 수집기 의존성 없이 main 임포트가 끝나야 함
+        repo_dir = os.path.dirname(os.path.abspath(__file__))
+        for _ in range(self.STARTUP_RUNS):
+            subprocess.run([sys.executable, "-c", "import main"], cwd=repo_dir, check=True)
+        return self.STARTUP_RUNS
+
+    def _collect_stage(self) -> None:
+        cassette_dir = self.replay["cassette_dir"]
+        cassette = Cassette.load_dir(cassette_dir)
+        if not len(cassette):
+            print(f"  {'collect':<14} skipped (no cassettes in {cassette_dir}, run: python http_replay.py record)")
+            return
+        sources = [s for s in available_sources() if os.path.exists(os.path.join(cassette_dir, f"{s}.json"))]
+        faults = FaultInjector(self.replay["latency_ms"], self.replay["jitter_ms"], self.replay["error_rate"],
+                               self.replay["rate_limit"], seed=self.seed)
+        with replaying(cassette, faults) as server:
+            self._measure("collect", lambda: self._collect(sources))
+        self.results["collect"].update(requests=server.stats["requests"], skipped_sleep_sec=round(self.skipped_sleep, 1))
+        print(f"  {'':<14} {server.stats['requests']} requests ({server.stats['unmatched']} unmatched, "
+              f"{server.stats['errors']} injected errors, {server.stats['throttled']} throttled), "
+              f"{self.skipped_sleep:.1f}s of collector sleeps skipped")
+
+    def _collect(self, sources: List[str]) -> int:
+        """run_collection과 같은 순서로 수집 + 저장 (자격 증명은 재생 서버가 무시하므로 빈 값만 채움)"""
+        store = RawStore(os.path.join(self.data_dir, "collect"))
+        self.skipped_sleep = 0.0
+        real_sleep = time.sleep
+        if not self.replay["real_sleeps"]:
+            # 수집기의 요청 간 매너 대기는 실제 서버 보호용이므로 재생 시에는 시간만 합산
+            def no_sleep(seconds):
+                self.skipped_sleep += seconds
+            time.sleep = no_sleep
+        total = 0
+        try:
+            for source in sources:
+                collector = create_collector(source)
+                for attr in ("api_key", "client_id", "client_secret"):
+                    if hasattr(collector, attr) and not getattr(collector, attr):
+                        setattr(collector, attr, "replay")
+                try:
+                    items = collector.collect()
+                except Exception as e:
+                    print(f"    Error in {source} collector: {e}")
+                    continue
+                if items:
+                    store.save(source, items)
+                total += len(items)
+        finally:
+            time.sleep = real_sleep
+        return total
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float) -> List[str]:
+    """baseline 대비 시간/메모리가 tolerance 비율 이상 늘어난 단계 목록"""
+    regressions = []
+    for stage, current in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if base.get(metric) and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{stage}.{metric}: {base[metric]} -> {current[metric]} (+{(current[metric] / base[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RVI pipeline benchmark")
+    parser.add_argument("--items", type=int, default=10_000, help="합성 코퍼스 크기 (10k ~ 5M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stages", help=f"쉼표로 구분한 단계 목록 (기본: {','.join(BenchmarkSuite.STAGES)})")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략 (시간 측정 오버헤드 제거)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline 파일 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 baseline으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판정 허용 비율 (기본 25%%)")
+    parser.add_argument("--cassettes", help="collect 단계 카세트 디렉토리 (기본 benchmarks/cassettes)")
+    parser.add_argument("--latency-ms", type=float, help=f"재생 서버 응답 지연 (기본 {REPLAY_CONFIG['latency_ms']}ms)")
+    parser.add_argument("--jitter-ms", type=float, help=f"응답 지연 편차 (기본 ±{REPLAY_CONFIG['jitter_ms']}ms)")
+    parser.add_argument("--error-rate", type=float, help="500 응답 주입 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=float, help="초당 허용 요청 수 (초과 시 429)")
+    parser.add_argument("--real-sleeps", action="store_true", help="수집기의 요청 간 time.sleep을 생략하지 않음")
+    args = parser.parse_args()
+
+    stages = args.stages.split(",") if args.stages else None
+    replay = {key: value for key, value in {
+        "cassette_dir": args.cassettes,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "rate_limit": args.rate_limit
+    }.items() if value is not None}
+    replay["real_sleeps"] = args.real_sleeps
+    suite = BenchmarkSuite(args.items, seed=args.seed, track_memory=not args.no_memory, replay=replay)
+    results = suite.run(stages)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    key = str(args.items)
+
+    if args.save_baseline:
+        baselines[key] = {"recorded_at": datetime.now().isoformat(), "stages": results}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        print(f"Saved baseline for {key} items to {args.baseline}")
+        return
+
+    if key not in baselines:
+        print(f"No baseline for {key} items. Run with --save-baseline to record one.")
+        return
+
+    regressions = compare_to_baseline(results, baselines[key]["stages"], args.tolerance)
+    if regressions:
+        print("Performance regressions detected:")
+        for r in regressions:
+            print(f"  - {r}")
+        sys.exit(1)
+    print(f"No regressions against baseline (tolerance {args.tolerance:.0%}).")
+
+if __name__ == "__main__":
+    main()
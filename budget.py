@@ -0,0 +1,134 @@
+import os
+import json
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+try:
+    from .fileio import write_output
+    from .preprocessor import TextPreprocessor
+except ImportError:
+    from fileio import write_output
+    from preprocessor import TextPreprocessor
+
+logger = logging.getLogger(__name__)
+
+class BudgetGovernor:
+    """
+    분석 단계 토큰/비용 예산 관리
+    - 호출 전: 입력 토큰 사전 추정 + 최대 출력 토큰으로 최악의 비용을 예약
+    - 호출 후: response usage로 실제 사용량 기록 (data/state/usage.json, 일별 누적)
+    - 실행당/일별 토큰·비용 상한을 넘는 호출은 거부 -> 남은 항목은 다음 실행으로 이월
+    """
+
+    def __init__(self, state_dir: str, config: Dict[str, Any]):
+        self.config = config
+        self.path = os.path.join(state_dir, "usage.json")
+        self.preprocessor = TextPreprocessor()
+        self.today = datetime.now().date().isoformat()
+        self.run_usage = self._empty_usage()
+
+        self.daily = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.daily = json.load(f).get("daily", {})
+        self.daily.setdefault(self.today, self._empty_usage())
+
+    @staticmethod
+    def _empty_usage() -> Dict[str, Any]:
+        return {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        prices = self.config["price_per_mtok"]
+        return (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1_000_000
+
+    def estimate(self, prompt: str) -> int:
+        """프롬프트 입력 토큰 추정치"""
+        return self.preprocessor.estimate_tokens(prompt)
+
+    def can_afford(self, estimated_input: int) -> bool:
+        """추정 입력 + 최대 출력 토큰 기준으로 실행/일 상한 이내인지 확인"""
+        max_output = self.config["max_output_tokens"]
+        tokens = estimated_input + max_output
+        cost = self.cost(estimated_input, max_output)
+        today = self.daily[self.today]
+
+        if self.run_usage["input_tokens"] + self.run_usage["output_tokens"] + tokens > self.config["max_tokens_per_run"]:
+            return False
+        if today["input_tokens"] + today["output_tokens"] + tokens > self.config["max_tokens_per_day"]:
+            return False
+        if self.run_usage["cost_usd"] + cost > self.config["max_cost_per_run_usd"]:
+            return False
+        if today["cost_usd"] + cost > self.config["max_cost_per_day_usd"]:
+            return False
+        return True
+
+    def max_requests(self, min_input_tokens: int) -> int:
+        """
+        남은 실행/일 예산으로 가능한 최대 호출 수 (상한 추정, 최소 1)
+        - 호출당 최소 소비를 본문 없는 프롬프트 입력 토큰으로 잡아 실제 호출 수보다 크게 추정
+        """
+        min_input_tokens = max(min_input_tokens, 1)
+        today = self.daily[self.today]
+        tokens_left = min(
+            self.config["max_tokens_per_run"] - self.run_usage["input_tokens"] - self.run_usage["output_tokens"],
+            self.config["max_tokens_per_day"] - today["input_tokens"] - today["output_tokens"]
+        )
+        cost_left = min(
+            self.config["max_cost_per_run_usd"] - self.run_usage["cost_usd"],
+            self.config["max_cost_per_day_usd"] - today["cost_usd"]
+        )
+        by_tokens = tokens_left // min_input_tokens
+        by_cost = int(cost_left / self.cost(min_input_tokens, 0))
+        return max(1, min(by_tokens, by_cost) + 1)
+
+    def record(self, usage: Dict[str, int], estimated_input: int = 0) -> None:
+        """
+        실제 사용량 기록
+        usage가 없으면(응답 전 실패 등) 추정치로 기록해 상한을 보수적으로 유지
+        """
+        if usage:
+            input_tokens, output_tokens = usage["input_tokens"], usage["output_tokens"]
+        else:
+            input_tokens, output_tokens = estimated_input, 0
+
+        cost = self.cost(input_tokens, output_tokens)
+        for bucket in (self.run_usage, self.daily[self.today]):
+            bucket["requests"] += 1
+            bucket["input_tokens"] += input_tokens
+            bucket["output_tokens"] += output_tokens
+            bucket["cost_usd"] = round(bucket["cost_usd"] + cost, 6)
+
+    def save(self) -> None:
+        # 최근 N일만 보관
+        cutoff = (datetime.now() - timedelta(days=self.config.get("history_days", 90))).date().isoformat()
+        self.daily = {day: usage for day, usage in self.daily.items() if day >= cutoff}
+        write_output(self.path, {"daily": self.daily, "updated_at": datetime.now().isoformat()})
+
+
+def prioritize(candidates: Iterable[Tuple[Any, Any]], is_target, limit: int = None) -> Iterator[Tuple[Any, Any]]:
+    """
+    분석 우선순위 큐: 링글(is_target) 항목 먼저, 같은 그룹 내에서는 최신 항목 먼저
+    candidates: (RawReview, 호출자 정의 위치 정보) 목록 또는 스트림
+    limit: 우선순위 상위 limit개만 유지 (크기 limit의 heap으로 스트림을 한 번 훑음, 메모리 O(limit))
+    """
+    def keyed():
+        for seq, (item, ref) in enumerate(candidates):
+            # 최신순 정렬을 위해 타임스탬프 음수를 키로 사용
+            try:
+                ts = datetime.fromisoformat((item.created_at or "").replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                ts = 0.0
+            yield (0 if is_target(item) else 1, -ts, seq), item, ref
+
+    if limit is not None:
+        for _, item, ref in heapq.nsmallest(limit, keyed(), key=lambda entry: entry[0]):
+            yield item, ref
+        return
+
+    heap = list(keyed())
+    heapq.heapify(heap)
+    while heap:
+        _, item, ref = heapq.heappop(heap)
+        yield item, ref
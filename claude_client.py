@@ -1,17 +1,54 @@
 import os
 import json
+import time
+import hashlib
 import logging
 try:
     import anthropic
 except ImportError:
     anthropic = None
 
+try:
+    from .config import APPS, SEARCH_KEYWORDS, CONDENSE_CONFIG
+    from .preprocessor import TextPreprocessor
+    from .metrics import pipeline_metrics
+except ImportError:
+    from config import APPS, SEARCH_KEYWORDS, CONDENSE_CONFIG
+    from preprocessor import TextPreprocessor
+    from metrics import pipeline_metrics
+
 logger = logging.getLogger(__name__)
 
+PROBLEM_TYPES = ["Audio Quality", "App Stability", "Tutor Matching", "Pricing", "UI/UX", "Curriculum"]
+
+PROMPT_TEMPLATE = """
+        Analyze the following review for Ringle (English tutoring service).
+        Review: "{text}"
+        
+        Output JSON only with these fields:
+        - sentiment: "positive", "neutral", or "negative"
+        - problem_type: One of {problem_types} or null if positive/neutral.
+        - key_phrases: List of 1-3 key phrases (Korean or English).
+        - churn_signal: boolean (true if user indicates quitting).
+        - churn_keywords: List of keywords indicating churn (e.g., "refund", "cancel").
+        """
+
+def prompt_version(problem_types=None) -> str:
+    """프롬프트 버전 해시 (템플릿/문제 유형 목록/요약 설정 중 하나라도 바뀌면 달라짐)"""
+    source = json.dumps([PROMPT_TEMPLATE, problem_types or PROBLEM_TYPES, CONDENSE_CONFIG], sort_keys=True)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
 class ClaudeAnalyzer:
     def __init__(self):
         self.api_key = os.environ.get("CLAUDE_API_KEY")
         self.client = None
+        self.model = "claude-3-haiku-20240307"
+        self.max_tokens = 300
+        self.problem_types = PROBLEM_TYPES
+        self.last_usage = None  # 마지막 호출의 response usage (input_tokens/output_tokens)
+        self.last_condensation = None  # 마지막 프롬프트의 요약 정보 (원문 대비 압축률)
+        self.preprocessor = TextPreprocessor()
+        self.keywords = self._build_keywords()
         
         if not self.api_key:
             logger.warning("CLAUDE_API_KEY not found in environment variables.")
@@ -22,42 +59,87 @@ class ClaudeAnalyzer:
         else:
             logger.warning("anthropic package is not installed.")
 
-    def analyze(self, item):
+    def analyze(self, item, prompt=None):
         """
         리뷰 데이터를 받아 Claude API로 분석 수행
+        prompt: 예산 추정 시 build_prompt로 만든 프롬프트 (전달 시 요약을 다시 하지 않음)
         """
         if not self.client:
             return None
 
-        text = item.get("text", "")
+        text = item.text
         if not text:
             return None
 
-        prompt = f"""
-        Analyze the following review for Ringle (English tutoring service).
-        Review: "{text}"
-        
-        Output JSON only with these fields:
-        - sentiment: "positive", "neutral", or "negative"
-        - problem_type: One of ["Audio Quality", "App Stability", "Tutor Matching", "Pricing", "UI/UX", "Curriculum"] or null if positive/neutral.
-        - key_phrases: List of 1-3 key phrases (Korean or English).
-        - churn_signal: boolean (true if user indicates quitting).
-        - churn_keywords: List of keywords indicating churn (e.g., "refund", "cancel").
-        """
+        self.last_usage = None
+        if prompt is None:
+            prompt = self.build_prompt(item)
 
         try:
+            started = time.perf_counter()
             message = self.client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=300,
+                model=self.model,
+                max_tokens=self.max_tokens,
                 temperature=0,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
             )
+            pipeline_metrics.observe_latency("claude_messages", time.perf_counter() - started)
+            
+            usage = getattr(message, "usage", None)
+            if usage is not None:
+                self.last_usage = {
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens
+                }
+                pipeline_metrics.add_tokens(self.last_usage)
             
             response_text = message.content[0].text
             # JSON 파싱 시도
             return json.loads(response_text)
         except Exception as e:
-            logger.error(f"Error analyzing review {item.get('id')}: {e}")
-            return None
\ No newline at end of file
+            logger.error(f"Error analyzing review {item.id}: {e}")
+            return None
+
+    @property
+    def version(self):
+        """분석 결과에 기록하는 버전 (model + prompt 해시), 재분석 대상 판정 기준"""
+        return {"model": self.model, "prompt": prompt_version(self.problem_types)}
+
+    def _build_keywords(self):
+        """요약 시 문장 관련도 점수에 사용할 키워드 가중치 (링글 직접 언급 > 검색 키워드 > 경쟁사)"""
+        keywords = {"링글": 3.0, "ringle": 3.0}
+        for group, weight in (("primary", 1.0), ("secondary", 0.5), ("competitive", 0.5)):
+            for phrase in SEARCH_KEYWORDS.get(group, []):
+                for word in phrase.lower().split():
+                    if len(word) >= 2 and word != "vs":
+                        keywords.setdefault(word, weight)
+        for app_info in APPS.values():
+            if not app_info.get("is_target"):
+                keywords.setdefault(app_info["name"].lower(), 1.0)
+        return keywords
+
+    def prepare_text(self, item):
+        """분석 입력 텍스트 (긴 글은 관련 문장 위주로 요약)"""
+        text = item.text or ""
+        condensed, ratio = self.preprocessor.condense(
+            text,
+            self.keywords,
+            max_tokens=CONDENSE_CONFIG["max_tokens"],
+            window=CONDENSE_CONFIG["window"]
+        )
+        self.last_condensation = {
+            "original_tokens": self.preprocessor.estimate_tokens(text),
+            "compression_ratio": ratio
+        }
+        return condensed
+
+    def build_prompt(self, item):
+        """분석 프롬프트 생성 (토큰 사전 추정에도 사용)"""
+        text = self.prepare_text(item)
+        return PROMPT_TEMPLATE.format(text=text, problem_types=json.dumps(self.problem_types))
+
+    def base_prompt(self):
+        """본문이 빈 프롬프트 (호출당 최소 입력 토큰 추정용)"""
+        return PROMPT_TEMPLATE.format(text="", problem_types=json.dumps(self.problem_types))
@@ -0,0 +1,434 @@
+import os
+import re
+import json
+import math
+import heapq
+import random
+import hashlib
+import logging
+from array import array
+from datetime import datetime
+from collections import Counter
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+
+try:
+    from .fileio import atomic_write_json, write_output
+    from .records import AnalyzedReview, loads
+except ImportError:
+    from fileio import atomic_write_json, write_output
+    from records import AnalyzedReview, loads
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT = "clusters-v2"
+
+_WORD = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+# 라벨로 쓰지 않는 조사/어미 음절 (n-gram이 이 음절로만 이루어지면 제외)
+_STOP_SYLLABLES = frozenset("이가은는을를에의도로와과고서요다니습합해어아게지네죠데예돼면며했하한할함것들좀더잘너무")
+
+_LATIN = re.compile(r"[a-z0-9]+")
+
+Vector = Dict[int, float]  # n-gram id -> 가중치
+
+def char_ngrams(text: str, sizes: List[int], max_chars: int) -> Counter:
+    """단어 경계(앞뒤 공백) 포함 문자 n-gram 빈도 (한글 띄어쓰기/조사 변형에 강함)"""
+    words = [f" {word} " for word in _WORD.findall((text or "")[:max_chars].lower())]
+    return Counter([w[i:i + n] for n in sizes for w in words for i in range(len(w) - n + 1)])
+
+def _normalize(vector: Vector) -> Vector:
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+def _truncate(vector: Vector, size: int) -> Vector:
+    """상위 size개 성분만 남기고 정규화 (희소 중심점 유지)"""
+    if len(vector) > size:
+        vector = dict(heapq.nsmallest(size, vector.items(), key=lambda kv: (-kv[1], kv[0])))
+    return _normalize(vector)
+
+
+class _SparseRows:
+    """문서 벡터 CSR 행렬 (indptr/indices/data를 array로 보관, 행 i = indices/data[indptr[i]:indptr[i+1]])"""
+
+    def __init__(self):
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.data = array("d")
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def append(self, vector: Vector) -> None:
+        self.indices.extend(vector.keys())
+        self.data.extend(vector.values())
+        self.indptr.append(len(self.indices))
+
+    def row(self, i: int) -> Tuple[array, array]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+
+class _Vocabulary:
+    """n-gram <-> 정수 id, idf는 id 순서 array (모델 파일에는 n-gram 문자열 기준 dict로 저장)"""
+
+    def __init__(self, idf: Dict[str, float]):
+        self.terms = list(idf)
+        self.ids = {term: i for i, term in enumerate(self.terms)}
+        self.idf = array("d", idf.values())
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def vector(self, grams: Counter) -> Vector:
+        # sublinear tf * idf, L2 정규화
+        ids, idf = self.ids, self.idf
+        vector = {}
+        for gram, tf in grams.items():
+            i = ids.get(gram)
+            if i is not None:
+                vector[i] = (1 + math.log(tf)) * idf[i]
+        return _normalize(vector)
+
+    def encode(self, centroid: Dict[str, float]) -> Vector:
+        return {self.ids[term]: weight for term, weight in centroid.items() if term in self.ids}
+
+    def decode(self, centroid: Vector) -> Dict[str, float]:
+        return {self.terms[i]: round(weight, 6) for i, weight in sorted(centroid.items(), key=lambda kv: (-kv[1], kv[0]))}
+
+
+class _CentroidIndex:
+    """중심점 역색인 (n-gram id -> [(클러스터, 가중치)]), 문서-중심점 내적을 문서 n-gram별 postings만 훑어 계산"""
+
+    def __init__(self, centroids: List[Vector], size: int):
+        self.k = len(centroids)
+        self.postings: List[Optional[List[Tuple[int, float]]]] = [None] * size
+        for c, centroid in enumerate(centroids):
+            for term, weight in centroid.items():
+                if self.postings[term] is None:
+                    self.postings[term] = []
+                self.postings[term].append((c, weight))
+
+    def nearest(self, indices: Iterable[int], data: Iterable[float]) -> Tuple[int, float]:
+        scores = [0.0] * self.k
+        postings = self.postings
+        for term, value in zip(indices, data):
+            posting = postings[term]
+            if posting is not None:
+                for c, weight in posting:
+                    scores[c] += value * weight
+        best = max(range(self.k), key=lambda c: (scores[c], -c)) if self.k else -1
+        return best, (scores[best] if best >= 0 else 0.0)
+
+    def nearest_vector(self, vector: Vector) -> Tuple[int, float]:
+        return self.nearest(vector.keys(), vector.values()) if vector else (-1, 0.0)
+
+    def nearest_grams(self, grams: Counter, vocab: _Vocabulary) -> Tuple[int, float]:
+        """n-gram 빈도에서 바로 최근접 중심점 (배정만 할 문서는 벡터를 만들지 않고 tf-idf 가중치와 norm만 계산)"""
+        scores = [0.0] * self.k
+        postings, ids, idf = self.postings, vocab.ids, vocab.idf
+        norm = 0.0
+        for gram, tf in grams.items():
+            term = ids.get(gram)
+            if term is None:
+                continue
+            value = (1 + math.log(tf)) * idf[term]
+            norm += value * value
+            posting = postings[term]
+            if posting is not None:
+                for c, weight in posting:
+                    scores[c] += value * weight
+        if not norm or not self.k:
+            return -1, 0.0
+        best = max(range(self.k), key=lambda c: (scores[c], -c))
+        return best, scores[best] / math.sqrt(norm)
+
+
+class SubIssueClusterer:
+    """
+    부정/이탈 리뷰 세부 이슈 클러스터링 (top-issues.json issue_clusters)
+    - 문자 n-gram TF-IDF 희소 벡터(array 기반 CSR, n-gram은 정수 id) + 구면 mini-batch k-means (Sculley 2010), 중심점은 상위 n-gram만 유지
+    - 어휘/중심점은 최대 fit_sample개 표본으로 학습하고 나머지 문서는 배정만 수행
+    - 학습 결과(어휘 idf, 중심점, 문서별 배정)는 data/state/clusters.json에 저장
+    - 다음 실행부터 새 문서만 가장 가까운 중심점에 배정하고 중심점을 점진 갱신
+      (미배정 비율/신규 문서 비율이 기준을 넘거나 설정이 바뀌면 전체 재학습)
+    - 파티션별 입력 문서는 data/state/cluster-docs/에 캐시 (변경된 파티션만 다시 읽음)
+    """
+
+    def __init__(self, state_dir: str, config: Dict[str, Any]):
+        self.model_path = os.path.join(state_dir, "clusters.json")
+        self.cache_dir = os.path.join(state_dir, "cluster-docs")
+        self.config = config
+        self.config_hash = hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.refitted = False
+
+    # --- 입력 문서 ---
+
+    @staticmethod
+    def wants(item: AnalyzedReview) -> bool:
+        """클러스터링 대상: 링글 부정 리뷰 + 이탈 신호 리뷰"""
+        return item.is_target and (item.analysis.sentiment == "negative" or item.analysis.churn_signal)
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key.replace("/", "__") + ".json")
+
+    def load_docs(self, partitions: Dict[str, List[str]], signatures: Dict[str, str],
+                  make_doc: Callable[[AnalyzedReview], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        docs = []
+        for key in sorted(partitions):
+            path = self._cache_path(key)
+            cached = None
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        cached = loads(f.read())
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable cluster doc cache for {key}: {e}")
+            if cached and cached.get("signature") == signatures[key] and cached.get("format") == MODEL_FORMAT:
+                docs.extend(cached["docs"])
+                continue
+
+            partition_docs = []
+            for file_path in partitions[key]:
+                try:
+                    with open(file_path, "rb") as f:
+                        item = AnalyzedReview.from_dict(loads(f.read()))
+                except Exception as e:
+                    logger.error(f"Error loading {os.path.basename(file_path)}: {e}")
+                    continue
+                if self.wants(item):
+                    partition_docs.append(make_doc(item))
+            atomic_write_json(path, {"format": MODEL_FORMAT, "signature": signatures[key], "docs": partition_docs})
+            docs.extend(partition_docs)
+
+        # 사라진 파티션 캐시 정리
+        if os.path.exists(self.cache_dir):
+            live = {os.path.basename(self._cache_path(key)) for key in partitions}
+            for name in os.listdir(self.cache_dir):
+                if name not in live:
+                    os.remove(os.path.join(self.cache_dir, name))
+        return docs
+
+    # --- 벡터화 / 학습 ---
+
+    def _grams(self, doc: Dict[str, Any]) -> Counter:
+        return char_ngrams(doc["text"], self.config["ngram_sizes"], self.config["max_chars"])
+
+    def _fit_idf(self, grams: List[Counter]) -> Dict[str, float]:
+        df = Counter()
+        for g in grams:
+            df.update(g.keys())
+        n = len(grams)
+        max_df = self.config["max_df"] * n
+        kept = [(count, term) for term, count in df.items() if self.config["min_df"] <= count <= max_df]
+        kept.sort(key=lambda ct: (-ct[0], ct[1]))
+        return {term: round(math.log((1 + n) / (1 + count)) + 1, 6) for count, term in kept[:self.config["max_features"]]}
+
+    def _init_centroids(self, rows: _SparseRows, k: int, size: int, rng: random.Random) -> List[Vector]:
+        """k-means++ 초기화 (학습 표본 중 최대 2000개에서 선택)"""
+        picks = range(len(rows)) if len(rows) <= 2000 else rng.sample(range(len(rows)), 2000)
+        sample = [rows.row(i) for i in picks]
+        terms = self.config["centroid_terms"]
+        centroids = [_truncate(dict(zip(*sample[rng.randrange(len(sample))])), terms)]
+        # 코사인 거리 (1 - 유사도) 기준 D^2 가중 샘플링
+        distance = [1.0] * len(sample)
+        while len(centroids) < k:
+            index = _CentroidIndex(centroids[-1:], size)
+            for i, (indices, data) in enumerate(sample):
+                distance[i] = min(distance[i], max(1.0 - index.nearest(indices, data)[1], 0.0))
+            total = sum(d * d for d in distance)
+            if total <= 0:
+                break
+            target, acc = rng.random() * total, 0.0
+            for i, d in enumerate(distance):
+                acc += d * d
+                if acc >= target:
+                    break
+            centroids.append(_truncate(dict(zip(*sample[i])), terms))
+        return centroids
+
+    def _update(self, centroids: List[Vector], counts: List[int], rows: _SparseRows, batch: Iterable[int], size: int) -> None:
+        """mini-batch 갱신: 클러스터별 배치 평균을 누적 건수 비율로 반영 후 상위 n-gram만 유지"""
+        index = _CentroidIndex(centroids, size)
+        sums: Dict[int, Vector] = {}
+        sizes = Counter()
+        for i in batch:
+            indices, data = rows.row(i)
+            c, _ = index.nearest(indices, data)
+            total = sums.setdefault(c, {})
+            for term, value in zip(indices, data):
+                total[term] = total.get(term, 0.0) + value
+            sizes[c] += 1
+        for c, total in sums.items():
+            previous = counts[c]
+            counts[c] += sizes[c]
+            rate = 1.0 / counts[c]
+            merged = {term: weight * previous * rate for term, weight in centroids[c].items()}
+            for term, value in total.items():
+                merged[term] = merged.get(term, 0.0) + value * rate
+            centroids[c] = _truncate(merged, self.config["centroid_terms"])
+
+    def fit(self, docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        전체 재학습 -> 모델 dict
+        - 어휘(idf)와 중심점은 최대 fit_sample개 표본으로 학습하고, 나머지 문서는 가장 가까운 중심점에 배정만 함
+        """
+        config = self.config
+        rng = random.Random(config["seed"])
+        docs = sorted(docs, key=lambda d: d["id"])
+        sample = range(len(docs)) if len(docs) <= config["fit_sample"] else sorted(rng.sample(range(len(docs)), config["fit_sample"]))
+        grams = {i: self._grams(docs[i]) for i in sample}
+        vocab = _Vocabulary(self._fit_idf(list(grams.values())))
+        vectors = {i: vocab.vector(g) for i, g in grams.items()}
+        del grams
+        rows = _SparseRows()
+        for vector in vectors.values():
+            if vector:
+                rows.append(vector)
+        k = min(config["clusters"], max(1, len(rows) // config["min_cluster_size"]))
+
+        centroids: List[Vector] = []
+        counts: List[int] = []
+        if len(rows):
+            centroids = self._init_centroids(rows, k, len(vocab), rng)
+            counts = [0] * len(centroids)
+            positions = range(len(rows))
+            for _ in range(config["iterations"]):
+                batch = positions if len(rows) <= config["batch_size"] else rng.sample(positions, config["batch_size"])
+                self._update(centroids, counts, rows, batch, len(vocab))
+
+        model = {
+            "format": MODEL_FORMAT,
+            "config": self.config_hash,
+            "fitted_at": datetime.now().isoformat(),
+            "fitted_docs": len(docs),
+            "sample_docs": len(sample),
+            "idf": dict(zip(vocab.terms, vocab.idf)),
+            "centroids": [vocab.decode(c) for c in centroids],
+            "counts": counts,
+            "assignments": {}
+        }
+        index = _CentroidIndex(centroids, len(vocab))
+        for i, doc in enumerate(docs):
+            if i in vectors:
+                nearest = index.nearest_vector(vectors[i])
+            else:
+                nearest = index.nearest_grams(self._grams(doc), vocab)
+            model["assignments"][doc["id"]] = self._assign(*nearest)
+        self.refitted = True
+        return model
+
+    def _assign(self, c: int, similarity: float) -> List[Any]:
+        if c < 0:
+            return [-1, 0.0]
+        if similarity < self.config["min_similarity"]:
+            return [-1, round(similarity, 4)]
+        return [c, round(similarity, 4)]
+
+    def _load_model(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.model_path):
+            return None
+        try:
+            with open(self.model_path, "rb") as f:
+                model = loads(f.read())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cluster model: {e}")
+            return None
+        if model.get("format") != MODEL_FORMAT or model.get("config") != self.config_hash:
+            return None
+        return model
+
+    def update(self, docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """저장된 모델에 새 문서만 배정 (필요 시 전체 재학습)"""
+        model = self._load_model()
+        if model is None or not model["centroids"]:
+            return self.fit(docs)
+
+        assignments = model["assignments"]
+        live = {doc["id"] for doc in docs}
+        for doc_id in [d for d in assignments if d not in live]:
+            del assignments[doc_id]
+
+        new_docs = sorted((doc for doc in docs if doc["id"] not in assignments), key=lambda d: d["id"])
+        if len(new_docs) > self.config["refit_growth"] * max(model["fitted_docs"], 1):
+            return self.fit(docs)
+
+        vocab = _Vocabulary(model["idf"])
+        centroids = [vocab.encode(c) for c in model["centroids"]]
+        vectors = [vocab.vector(self._grams(doc)) for doc in new_docs]
+        if vectors:
+            # 새 문서로 중심점 점진 갱신 후 배정
+            rows = _SparseRows()
+            for vector in vectors:
+                if vector:
+                    rows.append(vector)
+            self._update(centroids, model["counts"], rows, range(len(rows)), len(vocab))
+            model["centroids"] = [vocab.decode(c) for c in centroids]
+            index = _CentroidIndex(centroids, len(vocab))
+            for doc, vector in zip(new_docs, vectors):
+                assignments[doc["id"]] = self._assign(*index.nearest_vector(vector))
+
+        unassigned = sum(1 for c, _ in assignments.values() if c < 0)
+        if assignments and unassigned / len(assignments) > self.config["refit_unassigned"]:
+            return self.fit(docs)
+        return model
+
+    def _label_terms(self, centroid: Dict[str, float], df: Dict[str, float], top: int) -> List[str]:
+        """
+        중심점 상위 n-gram 중 라벨로 읽을 수 있는 것만 선택
+        - 짧은 영문 조각("ng", "en"), 조사/어미 음절로만 된 n-gram, 너무 많은 문서에 나오는 n-gram 제외
+        - 이미 고른 n-gram과 포함 관계인 n-gram은 건너뜀
+        """
+        terms = []
+        for gram, _ in sorted(centroid.items(), key=lambda kv: (-kv[1], kv[0])):
+            term = gram.strip()
+            if len(term) < 2 or df.get(gram, 0.0) > self.config["label_max_df"]:
+                continue
+            if _LATIN.fullmatch(term) and len(term) < self.config["label_min_latin"]:
+                continue
+            if all(ch in _STOP_SYLLABLES for ch in term) or any(term in t or t in term for t in terms):
+                continue
+            terms.append(term)
+            if len(terms) >= top:
+                break
+        return terms
+
+    # --- 결과 ---
+
+    def run(self, docs: List[Dict[str, Any]], pool_size: int = 10, top_terms: int = 8) -> List[Dict[str, Any]]:
+        """
+        클러스터링 후 클러스터 목록 (건수 내림차순)
+        각 항목: cluster, count, problem_types(Counter), key_phrases(Counter), terms,
+        members(중심점 유사도 상위 pool_size개 [유사도, id, 대표 리뷰 dict])
+        """
+        model = self.update(docs)
+        write_output(self.model_path, model)
+
+        clusters: Dict[int, Dict[str, Any]] = {}
+        for doc in docs:
+            c, similarity = model["assignments"].get(doc["id"], [-1, 0.0])
+            if c < 0:
+                continue
+            cluster = clusters.get(c)
+            if cluster is None:
+                cluster = clusters[c] = {"cluster": c, "count": 0, "problem_types": Counter(), "key_phrases": Counter(), "members": []}
+            cluster["count"] += 1
+            cluster["problem_types"][doc["problem_type"] or "Unclassified"] += 1
+            cluster["key_phrases"].update({p.strip() for p in doc["key_phrases"]} - {""})
+            candidate = [similarity, doc["id"], doc["example"]]
+            if len(cluster["members"]) < pool_size:
+                heapq.heappush(cluster["members"], candidate)
+            elif candidate[:2] > cluster["members"][0][:2]:
+                heapq.heapreplace(cluster["members"], candidate)
+
+        # 학습 표본 기준 n-gram 문서 비율 (idf 역산)
+        n = model["sample_docs"]
+        df = {gram: ((1 + n) / math.exp(idf - 1) - 1) / n for gram, idf in model["idf"].items()} if n else {}
+        result = []
+        for c, cluster in clusters.items():
+            if cluster["count"] < self.config["min_cluster_size"]:
+                continue
+            cluster["terms"] = self._label_terms(model["centroids"][c], df, top_terms)
+            result.append(cluster)
+        result.sort(key=lambda cl: (-cl["count"], cl["cluster"]))
+        logger.info(f"Issue clusters: {len(result)} from {len(docs)} docs ({'refit' if self.refitted else 'incremental'})")
+        return result
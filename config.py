@@ -91,11 +91,13 @@ COLLECTION_CONFIG = {
     "playstore": {
         "count_per_app": 200,        # 앱당 수집 리뷰 수
         "lang": "ko",
-        "country": "kr"
+        "country": "kr",
+        "backfill_page_size": 200    # 백필 시 페이지(continuation token)당 리뷰 수
     },
     "appstore": {
         "count_per_app": 200,
-        "country": "kr"
+        "country": "kr",
+        "backfill_page_size": 200
     },
     "youtube": {
         "max_results_per_video": 100,
@@ -103,14 +105,173 @@ COLLECTION_CONFIG = {
     },
     "naver_blog": {
         "display": 100,              # 검색당 결과 수
-        "sort": "date"               # 최신순
+        "sort": "date",              # 최신순
+        "max_start": 1000            # 검색 API start 파라미터 상한
     },
     "brunch": {
         "max_articles": 50
     }
 }
 
-# 데이터 스키마 (참조용)
+# 분석 단계 설정
+ANALYSIS_CONFIG = {
+    "max_attempts": 3,               # 같은 항목 분석 실패 시 최대 재시도 횟수 (초과 시 건너뜀)
+    "abort_after_failures": 5,       # 연속 실패 시 실행 중단 (API 장애 등), 다음 실행에서 이어서 진행
+    "checkpoint_every": 50           # N건 분석마다 manifest 저장 (그 사이 진행은 저널로 복구)
+}
+
+# 분석 토큰/비용 예산 (초과분은 다음 실행으로 이월)
+ANALYSIS_BUDGET = {
+    "max_tokens_per_run": 400_000,
+    "max_tokens_per_day": 800_000,
+    "max_cost_per_run_usd": 0.25,
+    "max_cost_per_day_usd": 0.5,     # 월 $15 수준
+    "max_output_tokens": 300,        # ClaudeAnalyzer max_tokens와 동일
+    "price_per_mtok": {"input": 0.25, "output": 1.25},  # claude-3-haiku 단가 (USD / 1M tokens)
+    "history_days": 90               # usage.json 보관 기간
+}
+
+# 버전 변경 시 선택적 재분석 설정 (--mode reanalyze)
+REANALYSIS_CONFIG = {
+    "sample_rate": 0.05,             # 층(이전 버전 x 소스 x 라벨)별 표본 비율
+    "min_sample": 20,                # 층별 최소 표본 수 (층 크기가 더 작으면 전체)
+    "max_sample": 200,               # 층별 최대 표본 수
+    "max_disagreement": 0.1,         # 필드별 불일치율이 이보다 크면 해당 층 전체 재분석
+    "fields": ["sentiment", "problem_type", "churn_signal"]  # 일치율을 비교할 분석 필드
+}
+
+# 긴 글 요약 설정 (블로그/브런치 등 분석 전 입력 토큰 절감)
+CONDENSE_CONFIG = {
+    "max_tokens": 250,               # 항목당 분석 입력 텍스트 토큰 상한 (앱 리뷰 수준)
+    "window": 1                      # 키워드 문장 앞뒤로 함께 점수를 주는 문맥 문장 수
+}
+
+# 과거 데이터 백필 설정 (--mode backfill)
+BACKFILL_CONFIG = {
+    "sources": ["playstore", "appstore", "naver_blog"],  # 페이지 단위 과거 조회가 가능한 소스
+    "workers": 4                     # 병렬 처리할 작업 단위(앱/키워드) 수
+}
+
+# raw 데이터 압축 설정 (--mode compact)
+COMPACTION_CONFIG = {
+    "keep_days": 7,                  # 최근 N일 raw 파일은 원본 유지
+    "codec": "zstd"                  # zstd (zstandard 미설치 시 gzip으로 대체)
+}
+
+# 키워드/워드클라우드 top-k 스케치 (Space-Saving) 설정
+SKETCH_CONFIG = {
+    "capacity": 2000,                # 워드클라우드 스케치 추적 문구 수 (top-50 정확도 유지, 메모리 고정)
+    "issue_capacity": 200            # 문제 유형/이탈 키워드별 스케치 크기 (top-5 추출용)
+}
+
+# 집계 설정 (analyzed/<source>/<YYYY-MM> 파티션 단위 map-reduce)
+AGGREGATION_CONFIG = {
+    "workers": None,                 # map 단계 프로세스 수 (None이면 CPU 수, 1이면 직렬)
+    "legacy_chunk_size": 500,        # 파티션 도입 이전 analyzed/<id>.json 파일을 묶는 단위
+    "rolling_windows": [7, 30],      # top-issues.json 롤링 순위 구간 (일)
+    "rolling_top_n": 5,              # 구간별 순위 항목 수
+    "example_count": 3,              # 이슈/키워드/경쟁사별 대표 리뷰 수
+    "example_pool": 10,              # 대표 리뷰 후보 풀 크기 (점수 상위 k개 heap)
+    "example_weights": {"length": 1.0, "recency": 0.5, "engagement": 1.0},  # recency: 후보 중 최신 리뷰와 같은 날 1, 1년 이상 지나면 0
+    "mmr_lambda": 0.7,               # MMR 점수/다양성 균형 (1이면 점수만 사용)
+    "cube_grains": ["day", "week", "month"]  # 롤업 큐브 저장 단위 (aggregated/cube/<grain>.json)
+}
+
+# 일별 급증 감지 설정 (EWMA z-score, alerts.json)
+ANOMALY_CONFIG = {
+    "alpha": 0.1,                    # EWMA 가중치 (약 2주 반감)
+    "warmup_days": 14,               # 기준선이 쌓이기 전에는 알림 없음
+    "z_threshold": 3.0,              # 이 이상이면 medium
+    "high_z": 5.0,                   # 이 이상이면 high
+    "min_count": 3,                  # 하루 건수가 이보다 적으면 무시
+    "min_std": 1.0,                  # 표준편차 하한 (드문 시계열의 과민 반응 방지)
+    "retention_days": 7,             # 마감된 날짜 알림 보관 기간
+    "prune_below": 0.001             # EWMA 평균이 이보다 작아진 시계열은 상태에서 제거
+}
+
+# 부정/이탈 리뷰 세부 이슈 클러스터링 설정 (문자 n-gram TF-IDF + mini-batch k-means, top-issues.json)
+CLUSTER_CONFIG = {
+    "clusters": 16,                  # 최대 클러스터 수 (문서 수 / min_cluster_size가 더 작으면 그 값)
+    "min_cluster_size": 5,           # 이보다 작은 클러스터는 출력하지 않음
+    "ngram_sizes": [2, 3],           # 단어 경계 포함 문자 n-gram 길이
+    "max_chars": 400,                # 문서당 n-gram 추출 길이 (긴 블로그 글 비용 제한)
+    "min_df": 2,                     # 최소 문서 빈도
+    "max_df": 0.5,                   # 최대 문서 빈도 비율 (너무 흔한 n-gram 제외)
+    "max_features": 20000,           # 어휘 크기 상한 (문서 빈도 상위)
+    "centroid_terms": 300,           # 중심점당 유지할 상위 n-gram 수 (희소 중심점)
+    "batch_size": 1024,              # mini-batch 크기
+    "iterations": 10,                # mini-batch 반복 횟수 (학습 표본 기준 약 2 epoch)
+    "fit_sample": 5000,              # 전체 재학습 시 어휘/중심점 학습 표본 수 (나머지 문서는 배정만)
+    "min_similarity": 0.05,          # 증분 배정 시 최소 코사인 유사도 (미만이면 미배정)
+    "refit_unassigned": 0.2,         # 미배정 비율이 이보다 크면 전체 재학습
+    "refit_growth": 0.5,             # 학습 이후 새 문서가 학습 문서 수의 이 비율을 넘으면 전체 재학습
+    "label_max_df": 0.2,             # 라벨 n-gram 최대 문서 비율 (더 흔하면 클러스터를 구분하지 못함)
+    "label_min_latin": 4,            # 영문/숫자 라벨 n-gram 최소 길이 ("ng", "en" 같은 조각 제외)
+    "top_n": 10,                     # top-issues.json에 출력할 클러스터 수
+    "seed": 42
+}
+
+# explore 페이지 검색 인덱스 설정 (data/aggregated/search/)
+SEARCH_INDEX_CONFIG = {
+    "term_shards": 32,               # 용어 해시 샤드 수 (검색어 1개당 샤드 1개만 로드)
+    "doc_shard_size": 500,           # 표시용 문서 행 샤드 크기
+    "snippet_chars": 300             # 결과 카드에 표시할 본문 길이
+}
+
+# 읽기 API 서버 설정 (--mode serve, 기본 배포는 GitHub Pages 정적 JSON)
+SERVER_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "cache_size": 256,               # 응답 LRU 캐시 항목 수
+    "poll_interval": 10,             # 새 분석 결과 확인 주기 (초)
+    "max_per_page": 200              # /api/reviews 페이지 크기 상한
+}
+
+# 상주 스케줄러 설정 (--mode daemon)
+DAEMON_CONFIG = {
+    "intervals": {                   # 소스별 수집 주기 (초)
+        "playstore": 2 * 3600,
+        "appstore": 3 * 3600,
+        "youtube": 6 * 3600,
+        "naver_blog": 24 * 3600,
+        "brunch": 24 * 3600
+    },
+    "default_interval": 12 * 3600,
+    "jitter": 0.1,                   # 주기의 ±10% 무작위 오차 (요청 시각 분산)
+    "startup_stagger": 120,          # 일정이 없는 소스의 첫 실행 분산 (초)
+    "batch_window": 300,             # 이 시간 안에 다른 수집이 예정돼 있으면 분석/집계를 미룸 (초)
+    "max_backoff": 24 * 3600,        # 연속 실패 시 재시도 간격 상한 (초)
+    "process_retry": 300,            # 분석/집계 실패 후 첫 재시도 간격 (초, 연속 실패 시 2배씩, max_backoff 상한)
+    "poll_interval": 30              # 대기 중 종료 신호/처리 조건 확인 주기 (초)
+}
+
+# 수동 업로드 파일 일괄 가져오기 설정 (--mode import, upload.html CSV 형식 호환)
+IMPORT_CONFIG = {
+    "chunk_size": 5000,              # 청크당 행 수 (청크 1개 = raw 파일 1개 = 분석 단계 처리 단위)
+    "source_type": "manual",         # raw 항목의 source.type
+    "columns": {                     # RAW_SCHEMA 필드 -> 인식할 컬럼명 (대소문자 무시, 앞쪽 우선)
+        "text": ["content", "text", "review", "body", "내용", "본문", "리뷰"],
+        "created_at": ["date", "created_at", "작성일", "날짜", "등록일"],
+        "source_name": ["source", "channel", "출처", "채널", "소스"],
+        "author": ["author", "user", "nickname", "작성자", "닉네임"],
+        "rating": ["rating", "score", "평점", "별점"],
+        "external_id": ["id", "external_id", "ticket_id", "번호"],
+        "source_url": ["url", "link", "링크"]
+    }
+}
+
+# 수집기 HTTP 녹화/재생 설정 (http_replay.py, benchmark.py collect 단계)
+REPLAY_CONFIG = {
+    "cassette_dir": "benchmarks/cassettes",  # 소스별 <source>.json 카세트
+    "scrub_params": ["key", "api_key", "client_id", "client_secret", "access_token", "token"],  # 저장/매칭 시 제외할 쿼리 파라미터
+    "keep_headers": ["content-type"],  # 카세트에 남길 응답 헤더 (쿠키/인증 헤더는 저장하지 않음)
+    "latency_ms": 50,                # 재생 서버 응답 지연 (요청당)
+    "jitter_ms": 20,                 # 지연 무작위 편차 (±)
+    "error_rate": 0.0,               # 500 응답 주입 비율
+    "rate_limit": 0                  # 초당 허용 요청 수 (0이면 제한 없음, 초과 시 429 + Retry-After)
+}
+
+# 데이터 스키마 (참조용, 로드 시 검증은 records.py의 RawReview/AnalyzedReview)
 RAW_SCHEMA = {
     "id": "string (uuid)",
     "source": "dict",
@@ -130,5 +291,6 @@ ANALYZED_SCHEMA = {
     "is_target": "boolean",
     "text": "string",
     "analysis": "dict",
-    "analyzed_at": "ISO datetime"
+    "analyzed_at": "ISO datetime",
+    "analysis_version": "dict|null ({model, prompt})"
 }
\ No newline at end of file
@@ -0,0 +1,217 @@
+import os
+from array import array
+from datetime import date, timedelta
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+try:
+    from .fileio import write_output
+    from .records import AnalyzedReview, loads
+except ImportError:
+    from fileio import write_output
+    from records import AnalyzedReview, loads
+
+CUBE_FORMAT = "cube-v1"
+DIMENSIONS = ("date", "source_type", "source_name", "sentiment", "problem_type", "churn_signal")
+MEASURES = ("count", "rating_sum", "rated")
+GRAINS = ("day", "week", "month")
+
+def bucket(date_str: Optional[str], grain: str) -> Optional[str]:
+    """YYYY-MM-DD -> 집계 단위 키 (day: 날짜, week: 주 시작일(월요일), month: YYYY-MM)"""
+    if not date_str or grain == "day":
+        return date_str
+    if grain == "week":
+        day = date.fromisoformat(date_str)
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if grain == "month":
+        return date_str[:7]
+    raise ValueError(f"Unknown grain '{grain}' ({', '.join(GRAINS)})")
+
+def _sort_key(value: Any) -> Tuple[bool, str]:
+    # None(날짜/문제유형 없음)은 맨 뒤
+    return value is None, str(value)
+
+
+class RollupCube:
+    """
+    날짜 x 소스 유형 x 소스 이름 x 감성 x 문제 유형 x 이탈 신호 롤업 큐브
+    - 값이 있는 셀만 저장 (희소), 차원 값은 사전 인코딩한 정수 코드
+    - 셀 좌표/측정값은 열별 array에 보관 (count, rating_sum, rated = 평점이 있는 건수)
+    - merge는 셀별 합산이므로 파티션 순서와 무관하게 같은 결과 (PartialAggregate에 포함)
+    - rollup으로 day -> week/month 단위 큐브 생성, query로 임의 필터/그룹 조합 집계
+    """
+
+    def __init__(self, grain: str = "day"):
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown grain '{grain}' ({', '.join(GRAINS)})")
+        self.grain = grain
+        self.values: List[List[Any]] = [[] for _ in DIMENSIONS]  # 차원별 코드 -> 값
+        self._codes: List[Dict[Any, int]] = [{} for _ in DIMENSIONS]
+        self.coords = [array("I") for _ in DIMENSIONS]
+        self.count = array("I")
+        self.rating_sum = array("d")
+        self.rated = array("I")
+        self._index: Dict[Tuple[Any, ...], int] = {}  # 셀 값 조합 -> 행 번호
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def _code(self, dim: int, value: Any) -> int:
+        code = self._codes[dim].get(value)
+        if code is None:
+            code = self._codes[dim][value] = len(self.values[dim])
+            self.values[dim].append(value)
+        return code
+
+    def add(self, cell: Tuple[Any, ...], count: int = 1, rating_sum: float = 0.0, rated: int = 0) -> None:
+        """셀 1개에 측정값 합산 (cell은 DIMENSIONS 순서의 값)"""
+        row = self._index.get(cell)
+        if row is None:
+            row = self._index[cell] = len(self.count)
+            for dim, value in enumerate(cell):
+                self.coords[dim].append(self._code(dim, value))
+            self.count.append(0)
+            self.rating_sum.append(0.0)
+            self.rated.append(0)
+        self.count[row] += count
+        self.rating_sum[row] += rating_sum
+        self.rated[row] += rated
+
+    def add_item(self, item: AnalyzedReview) -> None:
+        analysis = item.analysis
+        cell = (bucket(item.date, self.grain), item.source_type, item.source_name, analysis.sentiment,
+                analysis.problem_type, bool(analysis.churn_signal))
+        rated = item.rating is not None
+        self.add(cell, 1, float(item.rating) if rated else 0.0, int(rated))
+
+    def cell(self, row: int) -> Tuple[Any, ...]:
+        return tuple(self.values[dim][self.coords[dim][row]] for dim in range(len(DIMENSIONS)))
+
+    def rows(self) -> Iterable[Tuple[Tuple[Any, ...], int, float, int]]:
+        for row in range(len(self.count)):
+            yield self.cell(row), self.count[row], self.rating_sum[row], self.rated[row]
+
+    def merge(self, other: "RollupCube") -> "RollupCube":
+        if other.grain != self.grain:
+            raise ValueError(f"Cannot merge {other.grain} cube into {self.grain} cube")
+        for cell, count, rating_sum, rated in other.rows():
+            self.add(cell, count, rating_sum, rated)
+        return self
+
+    def rollup(self, grain: str) -> "RollupCube":
+        """더 큰 날짜 단위 큐브 (day -> week/month)"""
+        if GRAINS.index(grain) < GRAINS.index(self.grain) or (self.grain == "week" and grain == "month"):
+            raise ValueError(f"Cannot roll up {self.grain} cube to {grain}")
+        cube = RollupCube(grain)
+        for cell, count, rating_sum, rated in self.rows():
+            cube.add((bucket(cell[0], grain),) + cell[1:], count, rating_sum, rated)
+        return cube
+
+    # --- 조회 ---
+
+    def query(self, filters: Dict[str, Any] = None, group_by: Iterable[str] = (),
+              start: str = None, end: str = None) -> List[Dict[str, Any]]:
+        """
+        필터 조합 집계
+        - filters: 차원 -> 값 또는 값 목록 (예: {"source_name": ["ELSA", "스픽"], "problem_type": "Pricing"})
+        - group_by: 결과를 나눌 차원 (비우면 전체 합계 1행)
+        - start/end: date 차원 범위 (큐브 단위 키 기준, 양 끝 포함)
+        반환: 그룹 값 + count, rating_sum, rated, avg_rating 행 목록 (그룹 값 순)
+        """
+        masks = []
+        for name, allowed in (filters or {}).items():
+            dim = self._dim(name)
+            allowed = set(allowed) if isinstance(allowed, (list, tuple, set, frozenset)) else {allowed}
+            masks.append((self.coords[dim], {code for code, value in enumerate(self.values[dim]) if value in allowed}))
+        if start is not None or end is not None:
+            masks.append((self.coords[0], {
+                code for code, value in enumerate(self.values[0])
+                if value is not None and (start is None or value >= start) and (end is None or value <= end)
+            }))
+        groups = [self._dim(name) for name in group_by]
+
+        totals: Dict[Tuple[int, ...], List[Any]] = {}
+        for row in range(len(self.count)):
+            if any(column[row] not in codes for column, codes in masks):
+                continue
+            key = tuple(self.coords[dim][row] for dim in groups)
+            total = totals.get(key)
+            if total is None:
+                total = totals[key] = [0, 0.0, 0]
+            total[0] += self.count[row]
+            total[1] += self.rating_sum[row]
+            total[2] += self.rated[row]
+        if not groups and not totals:
+            totals[()] = [0, 0.0, 0]
+
+        result = []
+        for key, (count, rating_sum, rated) in totals.items():
+            entry = {DIMENSIONS[dim]: self.values[dim][code] for dim, code in zip(groups, key)}
+            entry.update({
+                "count": count,
+                "rating_sum": round(rating_sum, 4),
+                "rated": rated,
+                "avg_rating": round(rating_sum / rated, 2) if rated else None
+            })
+            result.append(entry)
+        result.sort(key=lambda e: [_sort_key(e[DIMENSIONS[dim]]) for dim in groups])
+        return result
+
+    def total(self, **filters: Any) -> Dict[str, Any]:
+        """필터 조합 전체 합계 (예: cube.total(source_type="playstore", churn_signal=True))"""
+        return self.query(filters)[0]
+
+    def _dim(self, name: str) -> int:
+        if name not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{name}' ({', '.join(DIMENSIONS)})")
+        return DIMENSIONS.index(name)
+
+    # --- 저장 형식 ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        열 지향 저장 형식
+        - values: 차원별 값 목록 (정렬), cells: 차원별 셀 코드 배열, 측정값 배열 (같은 인덱스 = 같은 셀)
+        - 값/셀을 정렬해 같은 데이터는 항상 같은 출력 (병합 순서 무관)
+        """
+        values = [sorted(vals, key=_sort_key) for vals in self.values]
+        remap = [array("I", [0] * len(vals)) for vals in self.values]
+        for dim, vals in enumerate(values):
+            for new_code, value in enumerate(vals):
+                remap[dim][self._codes[dim][value]] = new_code
+        rows = sorted(range(len(self.count)),
+                      key=lambda row: tuple(remap[dim][self.coords[dim][row]] for dim in range(len(DIMENSIONS))))
+        return {
+            "format": CUBE_FORMAT,
+            "grain": self.grain,
+            "dimensions": list(DIMENSIONS),
+            "values": {name: values[dim] for dim, name in enumerate(DIMENSIONS)},
+            "cells": {name: [remap[dim][self.coords[dim][row]] for row in rows] for dim, name in enumerate(DIMENSIONS)},
+            "count": [self.count[row] for row in rows],
+            "rating_sum": [round(self.rating_sum[row], 4) for row in rows],
+            "rated": [self.rated[row] for row in rows]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RollupCube":
+        if data.get("format") != CUBE_FORMAT:
+            raise ValueError(f"Unsupported cube format {data.get('format')!r}")
+        cube = cls(data["grain"])
+        values = [data["values"][name] for name in DIMENSIONS]
+        columns = [data["cells"][name] for name in DIMENSIONS]
+        for row, count in enumerate(data["count"]):
+            cell = tuple(values[dim][columns[dim][row]] for dim in range(len(DIMENSIONS)))
+            cube.add(cell, count, data["rating_sum"][row], data["rated"][row])
+        return cube
+
+    @classmethod
+    def load(cls, path: str) -> "RollupCube":
+        """저장된 큐브 파일 로드 (예: RollupCube.load("data/aggregated/cube/month.json"))"""
+        with open(path, "rb") as f:
+            return cls.from_dict(loads(f.read()))
+
+    def save(self, path: str, sidecar: Any = None) -> bool:
+        return write_output(path, self.to_dict(), sidecar=sidecar)
+
+
+def cube_path(aggregated_dir: str, grain: str) -> str:
+    return os.path.join(aggregated_dir, "cube", f"{grain}.json")
@@ -0,0 +1,177 @@
+import os
+import json
+import random
+import signal
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Callable, Optional
+
+try:
+    from .fileio import write_output
+except ImportError:
+    from fileio import write_output
+
+logger = logging.getLogger(__name__)
+
+class ScheduleState:
+    """
+    소스별 실행 일정 (data/state/schedule.json)
+    - next_run / last_run / last_status / last_items / failures
+    - 프로세스가 재시작돼도 이미 수집한 소스를 바로 다시 수집하지 않음
+    - pending_items: 수집됐지만 아직 분석/집계하지 않은 건수 (재시작 후 이어서 처리)
+    - process_failures / next_process: 분석/집계 연속 실패 횟수와 다음 재시도 시각
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.last_aggregate: Optional[str] = None
+        self.pending_items = 0
+        self.process_failures = 0
+        self.next_process: Optional[str] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.sources = data.get("sources", {})
+            self.last_aggregate = data.get("last_aggregate")
+            self.pending_items = data.get("pending_items", 0)
+            self.process_failures = data.get("process_failures", 0)
+            self.next_process = data.get("next_process")
+
+    def next_run(self, source: str) -> Optional[datetime]:
+        value = self.sources.get(source, {}).get("next_run")
+        return datetime.fromisoformat(value) if value else None
+
+    def record(self, source: str, next_run: datetime, status: str, items: int = 0) -> None:
+        self.pending_items += items
+        entry = self.sources.setdefault(source, {"failures": 0})
+        entry["last_run"] = datetime.now().isoformat()
+        entry["last_status"] = status
+        entry["last_items"] = items
+        entry["failures"] = 0 if status == "ok" else entry.get("failures", 0) + 1
+        entry["next_run"] = next_run.isoformat()
+        self.save()
+
+    def schedule(self, source: str, next_run: datetime) -> None:
+        self.sources.setdefault(source, {"failures": 0})["next_run"] = next_run.isoformat()
+        self.save()
+
+    def failures(self, source: str) -> int:
+        return self.sources.get(source, {}).get("failures", 0)
+
+    def save(self) -> None:
+        write_output(self.path, {
+            "sources": self.sources,
+            "last_aggregate": self.last_aggregate,
+            "pending_items": self.pending_items,
+            "process_failures": self.process_failures,
+            "next_process": self.next_process
+        })
+
+
+class PipelineDaemon:
+    """
+    상주 수집 스케줄러 (--mode daemon)
+    - 소스별 주기(DAEMON_CONFIG["intervals"]) + 지터로 각자 실행 -> 자주 바뀌는 앱 스토어는 자주, 블로그는 드물게
+    - 수집기/분석 클라이언트는 프로세스 수명 동안 재사용 (매 실행 cold start 없음)
+    - 새 항목이 저장되면 batch_window 안에 예정된 다른 소스가 없을 때 분석 + 증분 집계 실행
+    - 실패한 소스는 주기를 2배씩 늘려 재시도 (max_backoff 상한)
+    """
+
+    def __init__(self, state_dir: str, sources: List[str], config: Dict[str, Any],
+                 create_collector: Callable[[str], Any], collect: Callable[[str, Any], int],
+                 process: Callable[[], None]):
+        self.sources = sources
+        self.config = config
+        self.state = ScheduleState(os.path.join(state_dir, "schedule.json"))
+        self.create_collector = create_collector
+        self.collect = collect
+        self.process = process
+        self.collectors: Dict[str, Any] = {}
+        self.stop_event = threading.Event()
+        self.random = random.Random()
+
+    def _interval(self, source: str) -> float:
+        return self.config["intervals"].get(source, self.config["default_interval"])
+
+    def _jittered(self, seconds: float) -> timedelta:
+        jitter = self.config["jitter"]
+        return timedelta(seconds=seconds * (1 + self.random.uniform(-jitter, jitter)))
+
+    def _initial_schedule(self) -> None:
+        # 일정이 없는 소스는 시작 직후 조금씩 어긋나게 실행 (동시 요청 방지)
+        now = datetime.now()
+        for source in self.sources:
+            if self.state.next_run(source) is None:
+                stagger = self.random.uniform(0, self.config["startup_stagger"])
+                self.state.schedule(source, now + timedelta(seconds=stagger))
+
+    def _due(self) -> Optional[str]:
+        """다음 실행 소스 (예정 시각이 가장 이른 소스)"""
+        return min(self.sources, key=lambda s: (self.state.next_run(s), s)) if self.sources else None
+
+    def run_source(self, source: str) -> None:
+        try:
+            collector = self.collectors.get(source)
+            if collector is None:
+                collector = self.collectors[source] = self.create_collector(source)
+            count = self.collect(source, collector)
+        except Exception as e:
+            failures = self.state.failures(source) + 1
+            backoff = min(self._interval(source) * (2 ** failures), self.config["max_backoff"])
+            logger.error(f"{source} collection failed ({failures} in a row), retrying in {backoff / 3600:.1f}h: {e}")
+            print(f"    Error in {source} collector: {e}")
+            self.collectors.pop(source, None)  # 클라이언트 상태가 꼬였을 수 있으므로 다음에 새로 생성
+            self.state.record(source, datetime.now() + self._jittered(backoff), "error")
+            return
+        self.state.record(source, datetime.now() + self._jittered(self._interval(source)), "ok", count)
+
+    def maybe_process(self) -> None:
+        """새 항목이 있고 곧 실행될 수집이 없으면 분석 + 집계"""
+        if not self.state.pending_items:
+            return
+        if self.state.next_process and datetime.fromisoformat(self.state.next_process) > datetime.now():
+            return  # 직전 실패 후 재시도 대기 중
+        upcoming = self.state.next_run(self._due())
+        if upcoming and upcoming - datetime.now() < timedelta(seconds=self.config["batch_window"]):
+            return
+        print(f">>> Processing {self.state.pending_items} new items")
+        try:
+            self.process()
+        except Exception as e:
+            # 실패가 이어지면 poll마다 전체 분석/집계를 반복하지 않도록 재시도 간격을 2배씩 늘림
+            self.state.process_failures += 1
+            backoff = min(self.config["process_retry"] * 2 ** (self.state.process_failures - 1), self.config["max_backoff"])
+            self.state.next_process = (datetime.now() + timedelta(seconds=backoff)).isoformat()
+            self.state.save()
+            logger.error(f"Processing failed ({self.state.process_failures} in a row), retrying in {backoff / 60:.0f}m: {e}")
+            return
+        self.state.pending_items = 0
+        self.state.process_failures = 0
+        self.state.next_process = None
+        self.state.last_aggregate = datetime.now().isoformat()
+        self.state.save()
+
+    def stop(self, *args) -> None:
+        self.stop_event.set()
+
+    def run(self) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.stop)
+        self._initial_schedule()
+        print(f"    Daemon started for {', '.join(self.sources)} (schedule: {self.state.path})")
+
+        while not self.stop_event.is_set():
+            source = self._due()
+            wait = (self.state.next_run(source) - datetime.now()).total_seconds()
+            if wait > 0:
+                # 대기 중에도 batch_window 조건이 풀리면 미처리 항목 처리
+                self.maybe_process()
+                if self.stop_event.wait(min(wait, self.config["poll_interval"])):
+                    break
+                continue
+            print(f">>> [{datetime.now().strftime('%H:%M:%S')}] Collecting {source}")
+            self.run_source(source)
+            self.maybe_process()
+        print("    Daemon stopped.")
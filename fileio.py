@@ -0,0 +1,185 @@
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    from .metrics import pipeline_metrics
+    from .records import dumps, loads
+except ImportError:
+    from metrics import pipeline_metrics
+    from records import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+VOLATILE_KEYS = ("updated_at",)  # 실행마다 바뀌는 최상위 타임스탬프 키 (변경 판단에서 제외)
+SIDECAR_NAME = "updated.json"
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def atomic_write_json(path: str, data: Any, indent: int = None) -> None:
+    """
+    JSON 파일 원자적 저장
+    - 같은 디렉토리의 임시 파일에 쓰고 fsync 후 os.replace
+    - 중간에 프로세스가 죽어도 기존 파일 또는 새 파일 중 하나만 남음 (잘린 JSON 없음)
+    - 기본은 compact 인코딩 (indent 지정 시 들여쓰기)
+    """
+    atomic_write_bytes(path, dumps(data, indent=indent))
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+_FILE_MODE = 0o666 & ~_umask()  # mkstemp는 0600으로 만들므로 일반 파일 생성과 같은 권한으로 맞춤
+
+def _fsync_dir(directory: str) -> None:
+    # rename 자체를 디스크에 반영 (디렉토리 fsync를 지원하지 않는 OS는 무시)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def atomic_write_bytes(path: str, payload: bytes) -> None:
+    """바이트 파일 원자적 저장 (atomic_write_json과 같은 임시 파일 + os.replace 방식)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, _FILE_MODE)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(directory)
+        pipeline_metrics.add_bytes(written=len(payload))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def append_jsonl(path: str, record: Dict[str, Any], sync: bool = True) -> None:
+    """JSONL 파일에 한 줄 추가 (append-only 로그용)"""
+    line = dumps(record) + b"\n"
+    with open(path, "ab") as f:
+        f.write(line)
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+    pipeline_metrics.add_bytes(written=len(line))
+
+
+def _split_volatile(data: Any, volatile: Sequence[str]) -> Any:
+    if not isinstance(data, dict) or not any(k in data for k in volatile):
+        return data
+    return {k: v for k, v in data.items() if k not in volatile}
+
+def _same_content(path: str, digest: str, volatile: Sequence[str]) -> bool:
+    """
+    기존 파일의 volatile 제외 내용 해시가 digest와 같은지
+    (파일이 없거나 읽을 수 없거나, 이전 형식(들여쓰기/키 순서)으로 저장된 파일이면 False -> 한 번 재기록)
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        existing = loads(raw)
+    except Exception:
+        return False
+    if raw != dumps(existing, sort_keys=True):
+        return False
+    return content_hash(dumps(_split_volatile(existing, volatile), sort_keys=True)) == digest
+
+
+class OutputSidecar:
+    """
+    출력 디렉토리의 변경 기록 (<dir>/updated.json)
+    - 파일별 내용 해시/크기 + 마지막 volatile 값(updated_at 등)
+    - write_output이 기존 파일을 다시 읽지 않고 변경 여부 판단
+    - 실행마다 바뀌는 타임스탬프는 이 파일에만 남음 (출력 파일은 내용이 바뀔 때만 재기록)
+    """
+
+    def __init__(self, directory: str, name: str = SIDECAR_NAME):
+        self.directory = directory
+        self.path = os.path.join(directory, name)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as f:
+                    self.files = loads(f.read()).get("files", {})
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable output sidecar {self.path}: {e}")
+
+    def key(self, path: str) -> str:
+        return os.path.relpath(path, self.directory).replace(os.sep, "/")
+
+    def unchanged(self, path: str, digest: str) -> bool:
+        entry = self.files.get(self.key(path))
+        if entry is None or entry.get("hash") != digest:
+            return False
+        try:
+            return os.path.getsize(path) == entry.get("bytes")
+        except OSError:
+            return False
+
+    def record(self, path: str, digest: str, size: int, stamps: Dict[str, Any]) -> None:
+        entry = {"hash": digest, "bytes": size, **stamps}
+        key = self.key(path)
+        if self.files.get(key) != entry:
+            self.files[key] = entry
+            self.dirty = True
+
+    def forget(self, path: str) -> None:
+        if self.files.pop(self.key(path), None) is not None:
+            self.dirty = True
+
+    def save(self) -> None:
+        if self.dirty:
+            atomic_write_bytes(self.path, dumps({"files": self.files}, sort_keys=True))
+            self.dirty = False
+
+
+def write_output(path: str, data: Any, volatile: Sequence[str] = VOLATILE_KEYS,
+                 sidecar: Optional[OutputSidecar] = None, force: bool = False) -> bool:
+    """
+    커밋 대상 JSON 출력 저장 (내용이 바뀐 경우에만)
+    - 키 정렬 + compact 인코딩 -> 같은 데이터는 항상 같은 바이트 (git diff 최소화)
+    - volatile 최상위 키를 뺀 내용 해시가 기존 파일과 같으면 쓰지 않음
+      -> 파일 안의 updated_at은 마지막 내용 변경 시각
+    - 변경 시 atomic_write_bytes로 원자적 교체
+    - sidecar 지정 시 해시/크기/이번 실행의 volatile 값은 sidecar에 기록 (호출 측에서 sidecar.save())
+      sidecar에 기록이 없으면 기존 파일을 읽어 비교
+    - force: 내용 비교 없이 기록 (volatile 값도 새로 반영)
+    반환: 실제로 기록했으면 True
+    """
+    stable_data = _split_volatile(data, volatile)
+    stable = dumps(stable_data, sort_keys=True)
+    digest = content_hash(stable)
+
+    if force:
+        unchanged = False
+    elif sidecar is not None and sidecar.key(path) in sidecar.files:
+        unchanged = sidecar.unchanged(path, digest)
+    else:
+        unchanged = _same_content(path, digest, volatile)
+
+    if not unchanged:
+        payload = stable if stable_data is data else dumps(data, sort_keys=True)
+        atomic_write_bytes(path, payload)
+    if sidecar is not None:
+        size = os.path.getsize(path) if unchanged else len(payload)
+        stamps = {k: data[k] for k in volatile if k in data} if stable_data is not data else {}
+        sidecar.record(path, digest, size, stamps)
+    return not unchanged
@@ -1,5 +1,154 @@
+// 집계 단계(search_index.py)가 생성한 검색 인덱스 경로
+const SEARCH_INDEX_URL = '../data/aggregated/search';
+const PAGE_SIZE = 50; // 인덱스 모드에서 한 번에 표시할 결과 수
+
+/**
+ * 검색어 토큰화 (search_index.py의 tokenize와 같은 규칙)
+ * 한글은 연속 구간의 문자 bigram, 영문/숫자는 2자 이상 토큰
+ */
+function tokenize(text) {
+    const lower = (text || '').toLowerCase();
+    const terms = [];
+    for (const run of lower.match(/[가-힣]+/g) || []) {
+        if (run.length === 1) terms.push(run);
+        else for (let i = 0; i < run.length - 1; i++) terms.push(run.slice(i, i + 2));
+    }
+    return terms.concat(lower.match(/[a-z0-9]{2,}/g) || []);
+}
+
+/**
+ * 용어 샤드 번호 (FNV-1a 32bit, search_index.py의 term_shard와 동일)
+ */
+function termShard(term, shards) {
+    let h = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(term)) {
+        h = Math.imul(h ^ byte, 0x01000193) >>> 0;
+    }
+    return h % shards;
+}
+
+function deltaDecode(gaps) {
+    const ids = new Int32Array(gaps.length);
+    let total = 0;
+    for (let i = 0; i < gaps.length; i++) ids[i] = (total += gaps[i]);
+    return ids;
+}
+
+function intersectSorted(a, b) {
+    const out = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+        else if (a[i] < b[j]) i++;
+        else j++;
+    }
+    return Int32Array.from(out);
+}
+
+// 문서 번호는 오래된 순으로 매겨지므로 posting list를 뒤에서부터 읽으면 최신순
+function newestFirst(ids) {
+    return ids.slice().reverse();
+}
+
+function unionSorted(lists) {
+    if (lists.length === 1) return lists[0];
+    const merged = new Int32Array(lists.reduce((n, l) => n + l.length, 0));
+    let offset = 0;
+    for (const l of lists) { merged.set(l, offset); offset += l.length; }
+    return merged.sort(); // 패싯 값끼리는 문서가 겹치지 않음
+}
+
+/**
+ * 사전 생성된 검색 인덱스 (meta/facets는 처음에, 용어/문서 샤드는 필요할 때 로드)
+ */
+class SearchIndex {
+    static async load(baseUrl) {
+        const [metaResponse, facetsResponse] = await Promise.all([
+            fetch(`${baseUrl}/meta.json`, { cache: 'no-cache' }),
+            fetch(`${baseUrl}/facets.json`, { cache: 'no-cache' })
+        ]);
+        if (!metaResponse.ok || !facetsResponse.ok) throw new Error('Search index not found');
+        return new SearchIndex(baseUrl, await metaResponse.json(), await facetsResponse.json());
+    }
+
+    constructor(baseUrl, meta, facets) {
+        this.baseUrl = baseUrl;
+        this.meta = meta;
+        this.facets = facets; // 값은 필요할 때 Int32Array로 디코딩
+        this.termShards = new Map();
+        this.docShards = new Map();
+    }
+
+    async fetchJson(path, cache) {
+        if (!cache.has(path)) {
+            cache.set(path, fetch(`${this.baseUrl}/${path}?v=${encodeURIComponent(this.meta.updated_at)}`).then(r => r.json()));
+        }
+        return cache.get(path);
+    }
+
+    facetIds(name, value) {
+        const values = this.facets[name] || {};
+        if (Array.isArray(values[value])) values[value] = deltaDecode(values[value]);
+        return values[value] || new Int32Array(0);
+    }
+
+    async termIds(term) {
+        const shard = String(termShard(term, this.meta.term_shards)).padStart(2, '0');
+        const postings = await this.fetchJson(`terms/${shard}.json`, this.termShards);
+        if (Array.isArray(postings[term])) postings[term] = deltaDecode(postings[term]);
+        return postings[term] || new Int32Array(0);
+    }
+
+    /**
+     * 검색어(AND) + 패싯(같은 패싯 내 OR, 패싯 간 AND) -> 문서 번호 오름차순 (= 오래된 순, 최신순은 newestFirst)
+     */
+    async search(keyword, facetFilters) {
+        // 토큰이 되지 않는 검색어(1글자 영문 등)는 검색어 없음으로 처리
+        let ids = null;
+        const terms = [...new Set(tokenize(keyword))];
+        for (const postings of await Promise.all(terms.map(t => this.termIds(t)))) {
+            ids = ids === null ? postings : intersectSorted(ids, postings);
+        }
+        for (const [name, values] of Object.entries(facetFilters)) {
+            if (values.length === 0) continue;
+            const allowed = unionSorted(values.map(v => this.facetIds(name, v)));
+            ids = ids === null ? allowed : intersectSorted(ids, allowed);
+        }
+        if (ids === null) {
+            ids = new Int32Array(this.meta.docs);
+            for (let i = 0; i < ids.length; i++) ids[i] = i;
+        }
+        return ids;
+    }
+
+    /**
+     * 문서 번호 목록을 화면 표시용 객체로 변환 (필요한 문서 샤드만 로드)
+     */
+    async docs(ids) {
+        const size = this.meta.doc_shard_size;
+        const shards = [...new Set(Array.from(ids, id => Math.floor(id / size)))];
+        const loaded = new Map(await Promise.all(shards.map(async s => [s, await this.fetchJson(`docs/${s}.json`, this.docShards)])));
+        return Array.from(ids, id => {
+            const shard = loaded.get(Math.floor(id / size));
+            const row = Object.fromEntries(shard.columns.map((c, i) => [c, shard.rows[id % size][i]]));
+            return {
+                year: row.created_at.slice(0, 4),
+                half: row.created_at.slice(5, 7) <= '06' ? 'h1' : 'h2',
+                source: row.source,
+                category: row.problem_type || '-',
+                content: row.text,
+                sentiment: row.sentiment
+            };
+        });
+    }
+}
+
 class FilterManager {
-    constructor(data) {
+    constructor(data, index = null) {
+        this.index = index;
+        this.resultIds = null;
+        this.searchSeq = 0;
+        this.sortCriteria = 'newest';
         this.originalData = data;
         this.filteredData = data;
         this.filters = {
@@ -15,15 +164,20 @@ class FilterManager {
 
     init() {
         this.renderFilters();
-        this.renderReviews();
+        if (this.index) this.applyIndexFilters();
+        else this.renderReviews();
         this.attachEventListeners();
     }
 
     renderFilters() {
         const container = document.getElementById('dynamicFilters');
         
+        // 인덱스가 있으면 실제 데이터의 패싯 값 사용
+        const facets = this.index?.meta.facets;
+        const facetValues = (name, fallback) => facets ? Object.keys(facets[name] || {}).filter(v => v) : fallback;
+
         // 소스 필터
-        const sources = ['playstore', 'appstore', 'blog', 'youtube', 'community'];
+        const sources = facetValues('source', ['playstore', 'appstore', 'blog', 'youtube', 'community']);
         const sourceHtml = this.createCheckboxGroup('소스', 'source', sources);
 
         // 감성 필터
@@ -31,7 +185,7 @@ class FilterManager {
         const sentimentHtml = this.createCheckboxGroup('감성', 'sentiment', sentiments);
 
         // 문제유형 필터 (자주 등장하는 것들)
-        const problems = ['accuracy', 'pricing', 'ux_ui', 'effectiveness', 'support'];
+        const problems = facetValues('problem_type', ['accuracy', 'pricing', 'ux_ui', 'effectiveness', 'support']);
         const problemHtml = this.createCheckboxGroup('문제유형', 'problemType', problems);
 
         // 이탈 신호 토글
@@ -106,6 +260,10 @@ class FilterManager {
     }
 
     applyFilters() {
+        if (this.index) {
+            this.applyIndexFilters();
+            return;
+        }
         this.filteredData = this.originalData.filter(item => {
             // 키워드 검색
             if (this.filters.keyword && !item.content.toLowerCase().includes(this.filters.keyword)) {
@@ -135,7 +293,46 @@ class FilterManager {
         this.renderReviews();
     }
 
+    /**
+     * 인덱스 검색 (입력 중 이전 요청 결과는 무시)
+     */
+    async applyIndexFilters() {
+        const seq = ++this.searchSeq;
+        const facetFilters = {
+            source: this.filters.source,
+            sentiment: this.filters.sentiment,
+            problem_type: this.filters.problemType,
+            churn: this.filters.churnOnly ? ['true'] : []
+        };
+        const matched = await this.index.search(this.filters.keyword, facetFilters);
+        let ids;
+        if (this.sortCriteria === 'rating_asc') {
+            // 평점 대신 감성 순 (부정 -> 중립 -> 긍정), 같은 감성 내에서는 최신순
+            ids = Int32Array.from(['negative', 'neutral', 'positive'].flatMap(s => Array.from(newestFirst(intersectSorted(matched, this.index.facetIds('sentiment', s))))));
+        } else {
+            ids = newestFirst(matched);
+        }
+        const page = await this.index.docs(ids.subarray(0, PAGE_SIZE));
+        if (seq !== this.searchSeq) return;
+        this.resultIds = ids;
+        this.filteredData = page;
+        this.renderReviews();
+    }
+
+    reset() {
+        this.filters = { keyword: '', source: [], sentiment: [], problemType: [], churnOnly: false };
+        document.querySelectorAll('#filterPanel input[type="checkbox"]').forEach(input => { input.checked = false; });
+        const searchInput = document.getElementById('searchInput');
+        if (searchInput) searchInput.value = '';
+        this.applyFilters();
+    }
+
     sortReviews(criteria) {
+        this.sortCriteria = criteria;
+        if (this.index) {
+            this.applyIndexFilters();
+            return;
+        }
         if (criteria === 'newest') {
             // 연도/반기 문자열 비교 (임시)
             this.filteredData.sort((a, b) => (b.year + b.half).localeCompare(a.year + a.half));
@@ -151,7 +348,8 @@ class FilterManager {
         const container = document.getElementById('reviewList');
         const countEl = document.getElementById('resultCount');
         
-        countEl.textContent = `검색 결과: ${this.filteredData.length}건`;
+        const total = this.resultIds ? this.resultIds.length : this.filteredData.length;
+        countEl.textContent = `검색 결과: ${total.toLocaleString()}건`;
         
         if (this.filteredData.length === 0) {
             container.innerHTML = '<div style="text-align:center; padding:40px; color:#666;">검색 결과가 없습니다.</div>';
@@ -185,7 +383,13 @@ class FilterManager {
 }
 
 // Initialize
-document.addEventListener('DOMContentLoaded', () => {
-    // reviewData는 data.js에서 로드됨
-    window.filterManager = new FilterManager(reviewData);
+document.addEventListener('DOMContentLoaded', async () => {
+    // 검색 인덱스가 없으면 data.js의 reviewData를 선형 탐색
+    let index = null;
+    try {
+        index = await SearchIndex.load(SEARCH_INDEX_URL);
+    } catch (error) {
+        console.warn('검색 인덱스를 불러오지 못해 기본 데이터를 사용합니다:', error);
+    }
+    window.filterManager = new FilterManager(reviewData, index);
 });
\ No newline at end of file
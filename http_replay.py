@@ -0,0 +1,405 @@
+import io
+import os
+import json
+import time
+import base64
+import random
+import hashlib
+import logging
+import argparse
+import threading
+import contextlib
+import urllib.request
+import urllib.response
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    import httplib2
+except ImportError:
+    httplib2 = None
+
+try:
+    from .fileio import atomic_write_json
+    from .config import REPLAY_CONFIG
+except ImportError:
+    from fileio import atomic_write_json
+    from config import REPLAY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_FORMAT = "cassette-v1"
+
+def default_cassette_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), *REPLAY_CONFIG["cassette_dir"].split("/"))
+
+def normalize_url(url: str, scrub_params: List[str] = None) -> str:
+    """
+    매칭용 URL 정규화
+    - 쿼리 파라미터 정렬 (requests/urllib 파라미터 순서 차이 무시)
+    - API 키/클라이언트 시크릿 등 scrub_params는 제외 (카세트에 자격 증명을 남기지 않음)
+    """
+    scrub = set(REPLAY_CONFIG["scrub_params"] if scrub_params is None else scrub_params)
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in scrub)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+def interaction_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """메서드 + 정규화 URL (+ 요청 본문 해시, 같은 엔드포인트에 본문만 다른 POST 구분)"""
+    key = f"{method.upper()} {normalize_url(url)}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += " #" + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+class Cassette:
+    """
+    녹화된 HTTP 응답 모음 (benchmarks/cassettes/<source>.json)
+    - 키(interaction_key)마다 응답 목록, 재생 시 녹화 순서대로 반환하고 마지막 응답은 반복
+    - 응답 헤더는 keep_headers만 저장 (본문은 디코딩된 바이트를 base64로)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data.get("interactions", []):
+                self.interactions.setdefault(entry["key"], []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.interactions.values())
+
+    def add(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        keep = set(REPLAY_CONFIG["keep_headers"])
+        entry = {
+            "key": key,
+            "status": status,
+            "headers": {name.lower(): value for name, value in headers.items() if name.lower() in keep},
+            "body": base64.b64encode(body or b"").decode("ascii")
+        }
+        with self.lock:
+            self.interactions.setdefault(key, []).append(entry)
+
+    def update(self, other: "Cassette") -> None:
+        for key, entries in other.interactions.items():
+            self.interactions.setdefault(key, []).extend(entries)
+
+    def save(self) -> None:
+        with self.lock:
+            entries = [entry for key in sorted(self.interactions) for entry in self.interactions[key]]
+        atomic_write_json(self.path, {"format": CASSETTE_FORMAT, "interactions": entries}, indent=1)
+
+    @classmethod
+    def load_dir(cls, directory: str) -> "Cassette":
+        """디렉토리의 카세트를 하나로 합침 (키에 호스트가 포함되므로 소스 간 충돌 없음)"""
+        merged = cls()
+        for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            if name.endswith(".json"):
+                merged.update(cls(os.path.join(directory, name)))
+        return merged
+
+
+class _Patches:
+    """requests / urllib / httplib2 요청 진입점 교체 (설치된 라이브러리만)"""
+
+    def __init__(self):
+        self.restore: List[Tuple[Any, str, Any]] = []
+
+    def patch(self, owner: Any, name: str, factory) -> None:
+        original = getattr(owner, name)
+        self.restore.append((owner, name, original))
+        setattr(owner, name, factory(original))
+
+    def undo(self) -> None:
+        for owner, name, original in reversed(self.restore):
+            setattr(owner, name, original)
+        self.restore = []
+
+
+@contextlib.contextmanager
+def recording(cassette: Cassette) -> Iterator[Cassette]:
+    """
+    실제 네트워크 요청을 그대로 보내면서 응답을 카세트에 기록
+    - requests: Session.request (requests.get, app-store-scraper)
+    - urllib: OpenerDirector.open (google-play-scraper)
+    - httplib2: Http.request (googleapiclient)
+    """
+    patches = _Patches()
+
+    if requests is not None:
+        def wrap_requests(original):
+            def request(session, method, url, *args, **kwargs):
+                response = original(session, method, url, *args, **kwargs)
+                first = response.history[0] if response.history else response
+                cassette.add(interaction_key(method, first.request.url, first.request.body),
+                             response.status_code, response.headers, response.content)
+                return response
+            return request
+        patches.patch(requests.Session, "request", wrap_requests)
+
+    def wrap_urllib(original):
+        def open_url(opener, fullurl, data=None, *args, **kwargs):
+            if isinstance(fullurl, str):
+                url, method, body = fullurl, "POST" if data is not None else "GET", data
+            else:
+                body = data if data is not None else fullurl.data
+                url, method = fullurl.full_url, fullurl.get_method()
+            key = interaction_key(method, url, body)
+            try:
+                response = original(opener, fullurl, data, *args, **kwargs)
+            except urllib.error.HTTPError as e:
+                payload = e.read()
+                cassette.add(key, e.code, dict(e.headers or {}), payload)
+                raise urllib.error.HTTPError(e.url, e.code, e.msg, e.headers, io.BytesIO(payload))
+            payload = response.read()
+            cassette.add(key, response.status, dict(response.headers), payload)
+            return urllib.response.addinfourl(io.BytesIO(payload), response.headers, response.geturl(), response.status)
+        return open_url
+    patches.patch(urllib.request.OpenerDirector, "open", wrap_urllib)
+
+    if httplib2 is not None:
+        def wrap_httplib2(original):
+            def request(http, uri, method="GET", body=None, *args, **kwargs):
+                response, content = original(http, uri, method, body, *args, **kwargs)
+                cassette.add(interaction_key(method, uri, body), response.status, dict(response), content)
+                return response, content
+            return request
+        patches.patch(httplib2.Http, "request", wrap_httplib2)
+
+    try:
+        yield cassette
+    finally:
+        patches.undo()
+
+
+class FaultInjector:
+    """재생 서버 응답 지연/오류/속도 제한 (seed 고정 시 같은 순서로 재현)"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 rate_limit: float = 0, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = float(rate_limit)
+        self.refilled = time.monotonic()
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            return max(self.latency_ms + jitter, 0) / 1000
+
+    def fail(self) -> bool:
+        with self.lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def throttled(self) -> bool:
+        """토큰 버킷 (초당 rate_limit개 충전, 최대 rate_limit개 누적)"""
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled) * self.rate_limit)
+            self.refilled = now
+            if self.tokens < 1:
+                return True
+            self.tokens -= 1
+            return False
+
+
+class ReplayServer:
+    """
+    카세트 응답을 돌려주는 로컬 대체 서버
+    - 요청 경로 /<scheme>/<host>/<path>?<query> 를 원래 URL로 복원해 매칭
+    - 카세트에 없는 요청은 404, 서버 통계는 stats (served/unmatched/errors/throttled)
+    """
+
+    def __init__(self, cassette: Cassette, faults: FaultInjector = None, host: str = "127.0.0.1", port: int = 0):
+        self.cassette = cassette
+        self.faults = faults or FaultInjector()
+        self.positions: Dict[str, int] = {}
+        self.stats = {"requests": 0, "served": 0, "unmatched": 0, "errors": 0, "throttled": 0}
+        self.lock = threading.Lock()
+        self.unmatched: List[str] = []
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rewrite(self, url: str) -> str:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return url
+        return f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+    def _next_response(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entries = self.cassette.interactions.get(key)
+            if not entries:
+                self.unmatched.append(key)
+                return None
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    def _count(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, body: bytes, headers: Dict[str, str] = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _serve(self) -> None:
+                server._count("requests")
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                scheme, _, rest = self.path.lstrip("/").partition("/")
+                url = f"{scheme}://{rest}"
+
+                faults = server.faults
+                threading.Event().wait(faults.delay())  # time.sleep은 벤치마크에서 무력화될 수 있으므로 사용하지 않음
+                if faults.throttled():
+                    server._count("throttled")
+                    return self._reply(429, b"rate limited", {"Retry-After": "1", "Content-Type": "text/plain"})
+                if faults.fail():
+                    server._count("errors")
+                    return self._reply(500, b"injected error", {"Content-Type": "text/plain"})
+
+                entry = server._next_response(interaction_key(self.command, url, body))
+                if entry is None:
+                    server._count("unmatched")
+                    return self._reply(404, b"no recorded response", {"Content-Type": "text/plain"})
+                server._count("served")
+                self._reply(entry["status"], base64.b64decode(entry["body"]), entry["headers"])
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@contextlib.contextmanager
+def replaying(cassette: Cassette, faults: FaultInjector = None) -> Iterator[ReplayServer]:
+    """
+    requests / urllib / httplib2 요청을 로컬 재생 서버로 우회
+    - 클라이언트 라이브러리의 파싱/세션/재시도 코드는 그대로 실행되고 네트워크 구간만 대체됨
+    """
+    server = ReplayServer(cassette, faults).start()
+    patches = _Patches()
+
+    if requests is not None:
+        def wrap_requests(original):
+            def request(session, method, url, *args, **kwargs):
+                return original(session, method, server.rewrite(url), *args, **kwargs)
+            return request
+        patches.patch(requests.Session, "request", wrap_requests)
+
+    def wrap_urllib(original):
+        def open_url(opener, fullurl, *args, **kwargs):
+            if isinstance(fullurl, str):
+                fullurl = server.rewrite(fullurl)
+            else:
+                fullurl.full_url = server.rewrite(fullurl.full_url)
+            return original(opener, fullurl, *args, **kwargs)
+        return open_url
+    patches.patch(urllib.request.OpenerDirector, "open", wrap_urllib)
+
+    if httplib2 is not None:
+        def wrap_httplib2(original):
+            def request(http, uri, *args, **kwargs):
+                return original(http, server.rewrite(uri), *args, **kwargs)
+            return request
+        patches.patch(httplib2.Http, "request", wrap_httplib2)
+
+    try:
+        yield server
+    finally:
+        patches.undo()
+        server.stop()
+        if server.unmatched:
+            logger.warning(f"{len(server.unmatched)} requests had no recorded response (first: {server.unmatched[0]})")
+
+
+def record_sources(sources: List[str], cassette_dir: str) -> Dict[str, int]:
+    """실제 API로 소스별 수집을 1회 실행하며 카세트 저장 (자격 증명 필요), 소스별 녹화 응답 수 반환"""
+    try:
+        from .registry import create_collector
+    except ImportError:
+        from registry import create_collector
+
+    counts = {}
+    for source in sources:
+        cassette = Cassette()  # 다시 녹화하면 이전 응답은 교체
+        cassette.path = os.path.join(cassette_dir, f"{source}.json")
+        print(f"  - Recording {source}...")
+        with recording(cassette):
+            items = create_collector(source).collect()
+        cassette.save()
+        counts[source] = len(cassette)
+        print(f"    {len(items)} items, {len(cassette)} responses -> {cassette.path}")
+    return counts
+
+
+def main():
+    try:
+        from .registry import available_sources, parse_sources
+    except ImportError:
+        from registry import available_sources, parse_sources
+
+    parser = argparse.ArgumentParser(description="수집기 HTTP 응답 녹화 (재생/벤치마크는 benchmark.py --stages collect)")
+    parser.add_argument("command", choices=["record"])
+    parser.add_argument("--sources", help=f"쉼표로 구분한 소스 목록 (기본: {','.join(available_sources())})")
+    parser.add_argument("--cassettes", default=default_cassette_dir(), help="카세트 저장 디렉토리")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        sources = parse_sources(args.sources)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"[Record] Recording {', '.join(sources)} into {args.cassettes}")
+    record_sources(sources, args.cassettes)
+
+if __name__ == "__main__":
+    main()
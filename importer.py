@@ -0,0 +1,294 @@
+import os
+import csv
+import json
+import time
+import uuid
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    from .raw_store import RawStore
+except ImportError:
+    from raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y%m%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M",
+                 "%Y.%m.%d %H:%M", "%Y/%m/%d %H:%M:%S")
+
+class ImportFormatError(ValueError):
+    """가져오기 파일 형식/컬럼 오류"""
+
+
+def parse_date(value: Any) -> Optional[str]:
+    """날짜 셀 -> ISO datetime 문자열 (해석 불가 시 None)"""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).isoformat()
+    text = str(value).strip().rstrip(".")
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).replace(tzinfo=None).isoformat()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).isoformat()
+        except ValueError:
+            continue
+    return None
+
+def parse_rating(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool) or str(value).strip() == "":
+        return None
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid rating {value!r}")
+    return int(rating) if rating.is_integer() else rating
+
+
+class ColumnMapper:
+    """
+    파일 컬럼 -> RAW_SCHEMA 필드 매핑
+    - 기본은 IMPORT_CONFIG["columns"] 별칭 (대소문자/앞뒤 공백 무시)
+    - --map text=본문,created_at=작성일 형식의 지정이 별칭보다 우선
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]], overrides: Dict[str, str] = None):
+        self.aliases = aliases
+        self.overrides = overrides or {}
+        unknown = set(self.overrides) - set(aliases)
+        if unknown:
+            raise ImportFormatError(f"Unknown field(s) in --map: {', '.join(sorted(unknown))}. Fields: {', '.join(aliases)}")
+        self._cache: Dict[Tuple[str, ...], Dict[str, str]] = {}
+
+    def resolve(self, headers: Tuple[str, ...]) -> Dict[str, str]:
+        """필드 -> 실제 컬럼명 (같은 헤더 조합은 캐시)"""
+        mapping = self._cache.get(headers)
+        if mapping is not None:
+            return mapping
+        normalized = {str(h).strip().casefold(): h for h in headers if h is not None}
+        mapping = {}
+        for field, names in self.aliases.items():
+            if field in self.overrides:
+                name = self.overrides[field].strip().casefold()
+                if name not in normalized:
+                    raise ImportFormatError(f"Column '{self.overrides[field]}' for '{field}' not found. Columns: {', '.join(map(str, headers))}")
+                mapping[field] = normalized[name]
+                continue
+            for name in names:
+                if name.casefold() in normalized:
+                    mapping[field] = normalized[name.casefold()]
+                    break
+        if "text" not in mapping:
+            raise ImportFormatError(f"No review text column found (expected one of {self.aliases['text']} or --map text=<column>). "
+                                    f"Columns: {', '.join(map(str, headers))}")
+        self._cache[headers] = mapping
+        return mapping
+
+
+class BulkImporter:
+    """
+    CSV/TSV/XLSX/JSONL 리뷰 파일 스트리밍 가져오기 (--mode import)
+    - 파일 전체를 메모리에 올리지 않고 행 단위로 읽어 chunk_size개씩 처리 (메모리는 청크 크기에 비례)
+    - 청크마다 RawStore.save -> (source type, external_id) 중복 제거 후 raw 파일 1개로 저장
+      -> 분석 단계가 raw 파일 단위로 이어서 처리 (같은 파일을 다시 가져와도 중복 저장 없음)
+    - external_id: id 컬럼이 있으면 "<출처>:<id>", 없으면 출처/작성일/본문 해시
+    """
+
+    def __init__(self, store: RawStore, config: Dict[str, Any], overrides: Dict[str, str] = None,
+                 source_name: str = None, chunk_size: int = None):
+        self.store = store
+        self.config = config
+        self.mapper = ColumnMapper(config["columns"], overrides)
+        self.source_type = config["source_type"]
+        self.source_name = source_name
+        self.chunk_size = chunk_size or config["chunk_size"]
+        self.stats = Counter()
+        self.rejected = 0
+        self.collected_at = datetime.now().isoformat()
+        self.file_name = None
+        self.file_size = 0
+        self._progress_file = None  # 진행률 계산용 바이너리 버퍼 (CSV/JSONL)
+
+    # --- 행 읽기 (파일 형식별 스트리밍) ---
+
+    def _iter_csv(self, path: str, delimiter: str) -> Iterator[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            self._progress_file = f.buffer
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield row
+
+    def _iter_jsonl(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            self._progress_file = f.buffer
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    self._reject("json", f"line {line_no}: {e}")
+                    continue
+                if isinstance(row, dict):
+                    yield row
+                else:
+                    self._reject("json", f"line {line_no}: not an object")
+
+    def _iter_xlsx(self, path: str) -> Iterator[Dict[str, Any]]:
+        if openpyxl is None:
+            raise ImportFormatError("openpyxl is required for .xlsx files (pip install openpyxl)")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)  # read_only: 행 단위 스트리밍
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = tuple(str(h).strip() if h is not None else f"column_{i}" for i, h in enumerate(next(rows, ())))
+            for values in rows:
+                if any(v is not None for v in values):
+                    yield dict(zip(headers, values))
+        finally:
+            workbook.close()
+
+    def iter_rows(self, path: str) -> Iterator[Dict[str, Any]]:
+        ext = os.path.splitext(path)[1].lower()
+        self._progress_file = None
+        if ext == ".csv":
+            return self._iter_csv(path, ",")
+        if ext in (".tsv", ".tab"):
+            return self._iter_csv(path, "\t")
+        if ext in (".jsonl", ".ndjson"):
+            return self._iter_jsonl(path)
+        if ext in (".xlsx", ".xlsm"):
+            return self._iter_xlsx(path)
+        raise ImportFormatError(f"Unsupported file type '{ext}' (csv, tsv, jsonl, xlsx)")
+
+    # --- 행 -> raw 항목 ---
+
+    def _reject(self, reason: str, detail: str) -> None:
+        self.stats[f"invalid_{reason}"] += 1
+        self.rejected += 1
+        if self.rejected <= 5:  # 같은 오류가 반복되는 대용량 파일에서 로그 폭주 방지
+            logger.warning(f"Skipping row ({reason}): {detail}")
+
+    def to_item(self, row: Dict[str, Any], row_no: int) -> Optional[Dict[str, Any]]:
+        try:
+            mapping = self.mapper.resolve(tuple(row.keys()))
+        except ImportFormatError as e:
+            if row_no == 1:
+                raise  # 첫 행(헤더)부터 맞지 않으면 매핑 오류로 중단
+            self._reject("columns", f"row {row_no}: {e}")  # JSONL은 행마다 키가 다를 수 있음
+            return None
+
+        def cell(field: str) -> Any:
+            column = mapping.get(field)
+            value = row.get(column) if column is not None else None
+            return value.strip() if isinstance(value, str) else value
+
+        text = cell("text")
+        if text is None or str(text).strip() == "":
+            self._reject("no_text", f"row {row_no}")
+            return None
+        text = str(text)
+
+        raw_date = cell("created_at")
+        if raw_date is None or raw_date == "":
+            created_at = self.collected_at  # upload.html과 같이 작성일이 없으면 가져온 시각
+        else:
+            created_at = parse_date(raw_date)
+            if created_at is None:
+                self._reject("date", f"row {row_no}: {raw_date!r}")
+                return None
+
+        try:
+            rating = parse_rating(cell("rating"))
+        except ValueError as e:
+            self._reject("rating", f"row {row_no}: {e}")
+            return None
+
+        source_name = self.source_name or cell("source_name") or "Manual Upload"
+        source_name = str(source_name)
+        row_id = cell("external_id")
+        if row_id not in (None, ""):
+            external_id = f"{source_name}:{row_id}"
+        else:
+            digest = hashlib.sha1(f"{source_name}\n{created_at}\n{text}".encode("utf-8")).hexdigest()[:20]
+            external_id = f"{source_name}:{digest}"
+
+        author = cell("author")
+        source = {"type": self.source_type, "name": source_name, "app_key": self.source_type}
+        url = cell("source_url")
+        if url:
+            source["url"] = str(url)
+        return {
+            "id": str(uuid.uuid4()),
+            "source": source,
+            "external_id": external_id,
+            "author": str(author) if author not in (None, "") else None,
+            "rating": rating,
+            "text": text,
+            "created_at": created_at,
+            "collected_at": self.collected_at,
+            "metadata": {"import_file": self.file_name, "import_row": row_no}
+        }
+
+    # --- 실행 ---
+
+    def _progress(self, started: float) -> str:
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        line = f"{self.stats['rows']:,} rows ({self.stats['rows'] / elapsed:,.0f} rows/s), {self.stats['saved']:,} new, {self.stats['duplicates']:,} duplicates"
+        if self._progress_file is not None and self.file_size:
+            try:
+                line = f"{min(self._progress_file.tell() / self.file_size, 1.0):6.1%} " + line
+            except (OSError, ValueError):
+                pass
+        return line
+
+    def _flush(self, chunk: List[Dict[str, Any]]) -> None:
+        filename, count = self.store.save(self.source_type, chunk, tag="import")
+        self.stats["saved"] += count
+        self.stats["duplicates"] += len(chunk) - count
+        if filename:
+            self.stats["files"] += 1
+
+    def run(self, path: str) -> Dict[str, int]:
+        self.file_name = os.path.basename(path)
+        self.file_size = os.path.getsize(path)
+        started = time.perf_counter()
+        chunk: List[Dict[str, Any]] = []
+        for row_no, row in enumerate(self.iter_rows(path), 1):
+            self.stats["rows"] += 1
+            item = self.to_item(row, row_no)
+            if item is not None:
+                chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+                print(f"    {self._progress(started)}")
+        if chunk:
+            self._flush(chunk)
+        print(f"    Done: {self._progress(started)}")
+        invalid = {k: v for k, v in self.stats.items() if k.startswith("invalid")}
+        if invalid:
+            print(f"    Skipped invalid rows: {', '.join(f'{k[8:]}={v}' for k, v in sorted(invalid.items()))}")
+        return dict(self.stats)
+
+
+def parse_column_map(value: Optional[str]) -> Dict[str, str]:
+    """'text=본문,created_at=작성일' -> {"text": "본문", "created_at": "작성일"}"""
+    overrides = {}
+    for pair in (value or "").split(","):
+        if not pair.strip():
+            continue
+        field, sep, column = pair.partition("=")
+        if not sep or not column.strip():
+            raise ImportFormatError(f"Invalid --map entry '{pair}' (expected field=column)")
+        overrides[field.strip()] = column.strip()
+    return overrides
@@ -0,0 +1,72 @@
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+try:
+    from .fileio import append_jsonl
+except ImportError:
+    from fileio import append_jsonl
+
+logger = logging.getLogger(__name__)
+
+class AnalysisJournal:
+    """
+    분석 저널 (data/state/analysis-journal.jsonl)
+    - 항목별 결과 파일 커밋 직후 한 줄씩 append (fsync)
+    - manifest는 주기적으로만 저장되므로, 중단된 실행의 진행 상황은 저널을 재생해 복구
+    - 복구가 끝나면 manifest에 반영하고 저널을 비움
+    """
+
+    def __init__(self, state_dir: str):
+        self.path = os.path.join(state_dir, "analysis-journal.jsonl")
+
+    def record(self, rel_path: str, index: int, item_id: str, status: str, attempt: int = None) -> None:
+        """
+        status: done(결과 저장) / skipped(분석 대상 아님 또는 재시도 초과) / failed(분석 실패)
+        attempt: failed인 경우 누적 실패 횟수
+        """
+        record = {
+            "file": rel_path,
+            "index": index,
+            "id": item_id,
+            "status": status,
+            "at": datetime.now().isoformat()
+        }
+        if attempt is not None:
+            record["attempt"] = attempt
+        append_jsonl(self.path, record)
+
+    def recover(self, manifest: Any) -> int:
+        """
+        이전 실행이 남긴 저널을 manifest에 반영
+        반환: 복구된 완료 항목 수 (0이면 정상 종료된 상태)
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        recovered = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 종료되어 잘린 마지막 줄
+                    continue
+                if record["status"] == "failed":
+                    manifest.fail(record["file"], record["index"], record.get("attempt", 1))
+                else:
+                    manifest.complete(record["file"], record["index"])
+                    recovered += 1
+
+        manifest.save()
+        self.clear()
+
+        if recovered:
+            logger.info(f"Recovered {recovered} analyzed items from interrupted run.")
+        return recovered
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
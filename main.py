@@ -1,9 +1,8 @@
 import argparse
 import os
 import sys
-import json
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # 부모 디렉토리의 모듈을 임포트하기 위해 경로 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,167 +16,334 @@ except ImportError as e:
     print(f"Critical Error: Failed to import 'aggregator'. {e}")
     sys.exit(1)
 
-try:
-    from claude_client import ClaudeAnalyzer
-except ImportError as e:
-    print(f"Warning: Failed to import 'claude_client' ({e}). Analysis features will be disabled.")
-    ClaudeAnalyzer = None
+from raw_store import RawStore, AnalysisManifest
+from backfill import BackfillRunner
+from journal import AnalysisJournal
+from budget import BudgetGovernor, prioritize
+from fileio import write_output
+from synthetic import SyntheticCorpus
+from metrics import pipeline_metrics
+from records import Analysis, AnalyzedReview, RecordValidationError, analyzed_path
+from config import APPS, ANALYSIS_CONFIG, ANALYSIS_BUDGET, BACKFILL_CONFIG, COMPACTION_CONFIG, DAEMON_CONFIG, REANALYSIS_CONFIG, IMPORT_CONFIG
 
-# 수집기 모듈 임포트
-try:
-    # 패키지로 실행 시 (.playstore)
-    from .playstore import PlayStoreCollector
-    from .appstore import AppStoreCollector
-    from .youtube import YouTubeCollector
-    from .naver_blog import NaverBlogCollector
-    from .brunch import BrunchCollector
-except ImportError:
-    # 스크립트로 실행 시 (playstore)
-    from playstore import PlayStoreCollector
-    from appstore import AppStoreCollector
-    from youtube import YouTubeCollector
-    from naver_blog import NaverBlogCollector
-    from brunch import BrunchCollector
-
-def generate_mock_data(base_dir):
-    """MVP 테스트를 위한 더미 데이터 생성"""
-    analyzed_dir = os.path.join(base_dir, "data", "analyzed")
-    aggregated_dir = os.path.join(base_dir, "data", "aggregated")
-    os.makedirs(analyzed_dir, exist_ok=True)
-    os.makedirs(aggregated_dir, exist_ok=True)
-    
-    print(f"[Mock] Generating sample data in {analyzed_dir}...")
-    
-    sources = ["AppStore", "PlayStore", "NaverBlog", "YouTube"]
-    sentiments = ["positive", "neutral", "negative"]
-    problem_types = ["Audio Quality", "App Stability", "Tutor Matching", "Pricing", "UI/UX"]
-    
-    # 50개의 더미 리뷰 생성
-    for i in range(50):
-        is_target = random.choice([True, True, False]) # Ringle 비중을 높게
-        source = random.choice(sources)
-        sentiment = random.choice(sentiments)
-        created_at = datetime.now() - timedelta(days=random.randint(0, 30))
-        
-        data = {
-            "id": f"mock_{i}",
-            "source_type": source,
-            "source_name": "Ringle" if is_target else "Competitor_A",
-            "is_target": is_target,
-            "text": f"This is a mock review content #{i}. The service is {sentiment}.",
-            "rating": random.randint(1, 5) if sentiment != "negative" else random.randint(1, 3),
-            "created_at": created_at.isoformat(),
-            "analysis": {
-                "sentiment": sentiment,
-                "problem_type": random.choice(problem_types) if sentiment == "negative" else None,
-                "key_phrases": ["mock", "test", "service"],
-                "churn_signal": (random.random() < 0.2) if sentiment == "negative" else False,
-                "churn_keywords": ["refund", "cancel", "quit"] if sentiment == "negative" else []
-            }
-        }
-        
-        with open(os.path.join(analyzed_dir, f"mock_{i}.json"), "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            
-    # Mock Top Issues 생성
-    top_issues = {
-        "issues": [
-            {"problem_type": "Audio Quality", "count": 12, "summary": "음질 끊김 및 잡음 문제 다수 발생", "sentiment_score": -0.8},
-            {"problem_type": "Pricing", "count": 8, "summary": "구독료 인상에 대한 불만", "sentiment_score": -0.6},
-            {"problem_type": "App Stability", "count": 5, "summary": "업데이트 후 앱 강제 종료 현상", "sentiment_score": -0.9},
-            {"problem_type": "UI/UX", "count": 4, "summary": "메뉴 찾기가 어려움", "sentiment_score": -0.4}
-        ],
-        "churn_alerts": [
-            {
-                "keyword": "환불",
-                "count": 5,
-                "recent_examples": [{"text": "환불 절차가 너무 복잡해서 다시는 이용하고 싶지 않습니다."}]
-            }
-        ]
-    }
-    with open(os.path.join(aggregated_dir, "top-issues.json"), "w", encoding="utf-8") as f:
-        json.dump(top_issues, f, ensure_ascii=False, indent=2)
-
-def run_analysis(base_dir):
-    """Claude API를 사용하여 수집된 데이터 분석"""
-    print("[Analyze] Starting analysis with Claude API...")
-    
-    raw_dir = os.path.join(base_dir, "data", "raw")
+# 수집기는 실행할 소스만 registry에서 지연 임포트 (aggregate/analyze 모드는 스크래퍼 의존성 없이 시작)
+from registry import available_sources, create_collector, parse_sources
+
+def generate_mock_data(base_dir, count=50, seed=None, days=30):
+    """
+    MVP 테스트를 위한 더미 데이터 생성
+    SyntheticCorpus로 실제와 유사한 소스/경쟁사/날짜/이탈 분포의 분석 결과를 생성 (대량 생성은 benchmark.py 참고)
+    """
     analyzed_dir = os.path.join(base_dir, "data", "analyzed")
-    os.makedirs(analyzed_dir, exist_ok=True)
     
-    if ClaudeAnalyzer is None:
-        print("    Skipping analysis: ClaudeAnalyzer module is missing.")
-        return
+    print(f"[Mock] Generating {count} sample items in {analyzed_dir}...")
+    corpus = SyntheticCorpus(seed=seed if seed is not None else random.randrange(2 ** 32), days=days)
+    written = corpus.write_analyzed(analyzed_dir, count)
+    print(f"    Wrote {written} items. Run '--mode aggregate' to build dashboard data.")
+
+def create_analyzer():
+    """ClaudeAnalyzer 생성 (실패 시 None), anthropic SDK는 분석 단계에서만 로드"""
+    try:
+        from claude_client import ClaudeAnalyzer
+    except ImportError as e:
+        print(f"    Skipping analysis: Failed to import 'claude_client' ({e}).")
+        return None
 
     try:
         analyzer = ClaudeAnalyzer()
         if not analyzer.client:
             print("    Skipping analysis: Claude client not initialized (check API Key).")
-            return
+            return None
     except Exception as e:
         print(f"    Error initializing ClaudeAnalyzer: {e}")
+        return None
+    return analyzer
+
+def run_analysis(base_dir, analyzer=None):
+    """Claude API를 사용하여 수집된 데이터 분석 (analyzer 전달 시 재사용, daemon 모드)"""
+    print("[Analyze] Starting analysis with Claude API...")
+    
+    analyzed_dir = os.path.join(base_dir, "data", "analyzed")
+    os.makedirs(analyzed_dir, exist_ok=True)
+    
+    analyzer = analyzer or create_analyzer()
+    if analyzer is None:
         return
 
-    raw_files = []
-    for root, dirs, files in os.walk(raw_dir):
-        for file in files:
-            if file.endswith(".json"):
-                raw_files.append(os.path.join(root, file))
+    store = RawStore(os.path.join(base_dir, "data"))
+    manifest = AnalysisManifest(store.state_dir)
+    journal = AnalysisJournal(store.state_dir)
     
-    print(f"    Found {len(raw_files)} raw data files.")
+    # 이전 실행이 중단되었다면 저널을 재생해 마지막 완료 항목 다음부터 이어서 진행
+    recovered = journal.recover(manifest)
+    if recovered:
+        print(f"    Resuming interrupted run ({recovered} items recovered from journal).")
     
-    for file_path in raw_files:
+    raw_files = store.pending_files(manifest)
+    print(f"    Found {len(raw_files)} new or unfinished raw data files.")
+    
+    max_attempts = ANALYSIS_CONFIG["max_attempts"]
+    governor = BudgetGovernor(store.state_dir, ANALYSIS_BUDGET)
+    tried = set()  # 이번 실행에서 이미 호출한 항목 (실패 항목을 같은 실행에서 다시 고르지 않음)
+    scanned = [0]
+
+    def scan():
+        """
+        분석 대상 스트리밍 (raw 파일을 하나씩 읽음, 텍스트 없음/재시도 초과/결과 존재 항목은 바로 완료 처리)
+        """
+        scanned[0] = 0
+        for rel_path in raw_files:
+            if manifest.is_complete(rel_path):
+                continue
+            try:
+                items = store.read_file(store.abspath(rel_path))
+            except Exception as e:
+                print(f"    Error reading {rel_path}: {e}")
+                continue
+
+            manifest.mark(rel_path, len(items))
+            for index in manifest.pending_indices(rel_path):
+                if (rel_path, index) in tried:
+                    continue
+                item = items[index]
+                result_path = analyzed_path(analyzed_dir, item.source_type, item.created_at, item.id)
+                # 파티션 도입 이전 결과(analyzed/<id>.json)도 완료로 간주
+                if os.path.exists(result_path) or os.path.exists(os.path.join(analyzed_dir, f"{item.id}.json")):
+                    manifest.complete(rel_path, index)
+                elif not item.text or manifest.attempts(rel_path, index) >= max_attempts:
+                    journal.record(rel_path, index, item.id, "skipped")
+                    manifest.complete(rel_path, index)
+                else:
+                    scanned[0] += 1
+                    yield item, (rel_path, index)
+
+    # 우선순위(링글 > 경쟁사, 최신순) 순서로 예산 내에서 분석
+    # - 남은 예산으로 가능한 최대 호출 수만큼만 상위 항목을 heap에 유지 (전체 backlog를 메모리에 올리지 않음)
+    # - 예산이 남았는데 잘린 항목이 있으면 다시 스캔해 다음 상위 항목을 처리
+    with pipeline_metrics.stage("llm") as stage:
+        stage.items_in = 0
+        analyzed = 0
+        attempted = 0
+        consecutive_failures = 0
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                items = json.load(f)
-            if isinstance(items, dict): items = [items]
-                
-            print(f"    Analyzing {os.path.basename(file_path)} ({len(items)} items)...")
-            for item in items:
-                if item.get("text"):
-                    result = analyzer.analyze(item)
-                    if result:
-                        with open(os.path.join(analyzed_dir, f"{item['id']}.json"), "w", encoding="utf-8") as f:
-                            json.dump(result, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"    Error analyzing {file_path}: {e}")
+            while True:
+                limit = governor.max_requests(governor.estimate(analyzer.base_prompt()))
+                batch = list(prioritize(scan(), is_target_item, limit=limit))
+                if not stage.items_in:
+                    stage.items_in = scanned[0]
+                    print(f"    {scanned[0]} items queued for analysis.")
+                stopped = False
+                for n, (item, (rel_path, index)) in enumerate(batch):
+                    # 예산 추정에 쓴 프롬프트를 그대로 호출에 사용 (요약 1회)
+                    prompt = analyzer.build_prompt(item)
+                    estimated = governor.estimate(prompt)
+                    if not governor.can_afford(estimated):
+                        print(f"    Budget limit reached. Deferring {scanned[0] - n} items to the next run.")
+                        stopped = True
+                        break
+
+                    attempted += 1
+                    tried.add((rel_path, index))
+                    analysis = analyzer.analyze(item, prompt)
+                    governor.record(analyzer.last_usage, estimated)
+
+                    record = None
+                    if analysis is not None:
+                        try:
+                            record = build_analyzed_item(item, analysis, analyzer.last_condensation, analyzer.version)
+                        except RecordValidationError as e:
+                            print(f"    Invalid analysis for {item.id}: {e}")
+
+                    if record is None:
+                        # 완료 처리하지 않아 다음 실행에서 재시도 (max_attempts 초과 시 건너뜀)
+                        attempt = manifest.fail(rel_path, index)
+                        journal.record(rel_path, index, item.id, "failed", attempt=attempt)
+                        consecutive_failures += 1
+                        if consecutive_failures >= ANALYSIS_CONFIG["abort_after_failures"]:
+                            print(f"    Aborting analysis after {consecutive_failures} consecutive failures. Remaining items will resume next run.")
+                            stopped = True
+                            break
+                        continue
+
+                    consecutive_failures = 0
+                    write_output(analyzed_path(analyzed_dir, item.source_type, item.created_at, item.id), record)
+                    journal.record(rel_path, index, item.id, "done")
+                    manifest.complete(rel_path, index)
+                    analyzed += 1
+
+                    if analyzed % ANALYSIS_CONFIG["checkpoint_every"] == 0:
+                        manifest.save()
+                        journal.clear()
+                if stopped or scanned[0] <= len(batch):
+                    break
+        finally:
+            manifest.save()
+            journal.clear()
+            governor.save()
+        stage.items_out = analyzed
+
+    usage = governor.run_usage
+    print(f"    Analyzed {analyzed} items ({usage['input_tokens']} input / {usage['output_tokens']} output tokens, ${usage['cost_usd']:.4f}).")
+
+def run_reanalysis(base_dir, sample_rate=None, max_disagreement=None):
+    """분석 버전(model/prompt) 변경 후 표본 일치율 기반 선택적 재분석"""
+    print("[Reanalyze] Checking analyzed items against the current analysis version...")
+    analyzer = create_analyzer()
+    if analyzer is None:
+        return
+
+    from reanalysis import ReanalysisRunner
+    config = dict(REANALYSIS_CONFIG)
+    if sample_rate is not None:
+        config["sample_rate"] = sample_rate
+    if max_disagreement is not None:
+        config["max_disagreement"] = max_disagreement
+
+    data_dir = os.path.join(base_dir, "data")
+    governor = BudgetGovernor(os.path.join(data_dir, "state"), ANALYSIS_BUDGET)
+    runner = ReanalysisRunner(data_dir, analyzer, governor, config, ANALYSIS_CONFIG["abort_after_failures"])
+    with pipeline_metrics.stage("llm") as stage:
+        summary = runner.run()
+        stage.items_in = summary["stale"]
+        stage.items_out = summary["reanalyzed"]
+    # 파일 크기가 같아도 바뀐 파티션은 다음 집계에서 다시 읽도록 캐시 무효화
+    DataAggregator(data_dir).invalidate(summary["partitions"])
+    return summary
+
+def is_target_item(item):
+    """raw 항목의 링글 대상 여부 (앱 리뷰는 앱 설정 기준, 키워드 검색 소스는 링글 대상 검색이므로 True)"""
+    return APPS.get(item.app_key, {}).get("is_target", True)
+
+def build_analyzed_item(item, analysis, condensation=None, version=None):
+    """RawReview + Claude 분석 결과 -> ANALYZED_SCHEMA 레코드 (분석 결과 형식 오류 시 RecordValidationError)"""
+    return AnalyzedReview(
+        id=item.id,
+        raw_id=item.id,
+        source_type=item.source_type,
+        source_name=item.source_name or "unknown",
+        is_target=is_target_item(item),
+        text=item.text,
+        rating=item.rating,
+        author=item.author,
+        created_at=item.created_at,
+        metadata=item.metadata,
+        analysis=Analysis.from_dict(analysis),
+        analyzed_at=datetime.now().isoformat(),
+        # 요약된 입력으로 분석한 경우 압축률 기록
+        condensation=condensation if condensation and condensation["compression_ratio"] < 1.0 else None,
+        analysis_version=version
+    )
 
-def run_collection(base_dir):
-    """모든 채널 데이터 수집 실행"""
+def run_compaction(base_dir, keep_days=None):
+    """분석이 끝난 오래된 raw 파일을 월 단위 압축 아카이브로 병합"""
+    print("[Compact] Compacting analyzed raw files...")
+    store = RawStore(os.path.join(base_dir, "data"))
+    manifest = AnalysisManifest(store.state_dir)
+    result = store.compact(
+        manifest,
+        keep_days=COMPACTION_CONFIG["keep_days"] if keep_days is None else keep_days,
+        codec=COMPACTION_CONFIG["codec"]
+    )
+    print(f"    Archived {result['items']} items from {result['files']} raw files.")
+    return result
+
+def collect_source(store, source_type, collector=None):
+    """소스 1개 수집 후 저장, 새로 저장된 건수 반환 (collector 전달 시 재사용, daemon 모드)"""
+    print(f"  - Running {source_type} collector...")
+    with pipeline_metrics.stage(source_type) as stage:
+        collector = collector or create_collector(source_type)
+        items = collector.collect()
+        stage.items_in = len(items)
+        stage.items_out = 0
+        if not items:
+            print(f"    No items collected for {source_type}")
+            return 0
+        filename, count = store.save(source_type, items)
+        stage.items_out = count
+        if filename:
+            print(f"    Saved {count} items to {filename} ({len(items) - count} duplicates skipped)")
+        else:
+            print(f"    All {len(items)} items for {source_type} were already collected")
+        return count
+
+def run_collection(base_dir, sources=None):
+    """채널 데이터 수집 실행 (sources 미지정 시 전체)"""
     print("[Collect] Starting data collection...")
     
-    collectors = [
-        PlayStoreCollector(),
-        AppStoreCollector(),
-        YouTubeCollector(),
-        NaverBlogCollector(),
-        BrunchCollector()
-    ]
-    
-    for collector in collectors:
-        source_type = collector.get_source_type()
-        print(f"  - Running {source_type} collector...")
+    store = RawStore(os.path.join(base_dir, "data"))
+    
+    for source_type in sources or available_sources():
         try:
-            items = collector.collect()
-            if items:
-                raw_dir = os.path.join(base_dir, "data", "raw", source_type)
-                os.makedirs(raw_dir, exist_ok=True)
-                
-                filename = f"{source_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(os.path.join(raw_dir, filename), "w", encoding="utf-8") as f:
-                    json.dump(items, f, ensure_ascii=False, indent=2)
-                print(f"    Saved {len(items)} items to {filename}")
-            else:
-                print(f"    No items collected for {source_type}")
+            collect_source(store, source_type)
         except Exception as e:
             print(f"    Error in {source_type} collector: {e}")
 
+def run_import(base_dir, path, column_map=None, source_name=None, chunk_size=None):
+    """수동 업로드 파일(CSV/TSV/XLSX/JSONL)을 청크 단위로 raw 저장소에 가져오기"""
+    from importer import BulkImporter, parse_column_map
+    print(f"[Import] Importing {path}...")
+    store = RawStore(os.path.join(base_dir, "data"))
+    importer = BulkImporter(store, IMPORT_CONFIG, parse_column_map(column_map), source_name, chunk_size)
+    stats = importer.run(path)
+    print(f"    Saved {stats.get('saved', 0)} new items in {stats.get('files', 0)} raw files. Run '--mode analyze' to analyze them.")
+    return stats
+
+def run_backfill(base_dir, since, workers=None, sources=None):
+    """since 시점까지 과거 리뷰 백필 (체크포인트 기반 재개 가능)"""
+    print(f"[Backfill] Backfilling reviews since {since.date().isoformat()}...")
+    
+    names = [name for name in BACKFILL_CONFIG["sources"] if not sources or name in sources]
+    collectors = [create_collector(name) for name in names]
+    
+    runner = BackfillRunner(
+        os.path.join(base_dir, "data"),
+        collectors,
+        since,
+        workers=workers or BACKFILL_CONFIG["workers"]
+    )
+    results = runner.run()
+    print(f"    Backfill saved {sum(results.values())} new items.")
+    return results
+
 def main():
     parser = argparse.ArgumentParser(description="RVI Data Pipeline")
-    parser.add_argument("--mode", choices=["collect", "analyze", "aggregate", "all"], default="all")
+    parser.add_argument("--mode", choices=["collect", "backfill", "mock", "import", "analyze", "reanalyze", "compact", "aggregate", "serve", "daemon", "all"], default="all")
+    parser.add_argument("--since", help="백필 기준일 (YYYY-MM-DD), --mode backfill 전용")
+    parser.add_argument("--workers", type=int, help="병렬 작업 수 (백필, 집계 map 단계)")
+    parser.add_argument("--keep-days", type=int, help="압축 대상에서 제외할 최근 raw 파일 보관 일수")
+    parser.add_argument("--mock-count", type=int, default=50, help="--mode mock 생성 건수")
+    parser.add_argument("--sources", help="실행할 수집 소스 (쉼표 구분, 예: playstore,appstore), collect/backfill/daemon/all 전용")
+    parser.add_argument("--profile", action="store_true", help="단계별 cProfile/tracemalloc 결과를 profiles/에 저장")
+    parser.add_argument("--file", help="--mode import 대상 파일 (.csv/.tsv/.xlsx/.jsonl)")
+    parser.add_argument("--map", help="--mode import 컬럼 매핑 (예: text=본문,created_at=작성일)")
+    parser.add_argument("--source-name", help="--mode import 출처 이름 (지정 시 source 컬럼보다 우선)")
+    parser.add_argument("--chunk-size", type=int, help=f"--mode import 청크당 행 수 (기본 {IMPORT_CONFIG['chunk_size']})")
+    parser.add_argument("--sample-rate", type=float, help=f"--mode reanalyze 층별 표본 비율 (기본 {REANALYSIS_CONFIG['sample_rate']})")
+    parser.add_argument("--max-disagreement", type=float, help=f"--mode reanalyze 전체 재분석 기준 불일치율 (기본 {REANALYSIS_CONFIG['max_disagreement']})")
+    parser.add_argument("--host", help="--mode serve 바인드 주소 (기본 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="--mode serve 포트 (기본 8765)")
     args = parser.parse_args()
     
+    try:
+        args.sources = parse_sources(args.sources) if args.sources else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    since = None
+    if args.mode == "backfill":
+        if not args.since:
+            parser.error("--mode backfill requires --since YYYY-MM-DD")
+        try:
+            since = datetime.strptime(args.since, "%Y-%m-%d")
+        except ValueError:
+            parser.error(f"Invalid --since date: {args.since}")
+    
+    if args.mode == "import":
+        if not args.file:
+            parser.error("--mode import requires --file PATH")
+        if not os.path.exists(args.file):
+            parser.error(f"File not found: {args.file}")
+    
     # 스크립트 위치에 따라 base_dir 설정 (collector 폴더 내 실행 vs 루트 실행 대응)
     current_dir = os.path.dirname(os.path.abspath(__file__))
     if os.path.basename(current_dir) == 'collector':
@@ -185,23 +351,131 @@ def main():
     else:
         base_dir = current_dir
     
+    # 읽기 API 서버 (수동 실행 전용, 파이프라인 지표 기록 대상 아님)
+    if args.mode == "serve":
+        from server import serve
+        print(">>> Read API Server")
+        serve(os.path.join(base_dir, "data"), args.host, args.port)
+        return
+    
+    # 상주 스케줄러 (소스별 주기 수집 + 새 데이터 분석/집계)
+    if args.mode == "daemon":
+        print(">>> Scheduler Daemon")
+        run_daemon(base_dir, args)
+        return
+    
+    profile_dir = None
+    if args.profile:
+        profile_dir = os.path.join(base_dir, "profiles", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    pipeline_metrics.reset(mode=args.mode, profile_dir=profile_dir)
+    
+    try:
+        run_steps(args, base_dir, since)
+    finally:
+        # 단계별 시간/처리량/I/O/API 지연시간 기록 (실패한 실행도 남김)
+        metrics_path = os.path.join(base_dir, "data", "aggregated", "pipeline-metrics.json")
+        pipeline_metrics.save(metrics_path)
+        print(f"    Pipeline metrics written to {metrics_path}")
+        if profile_dir:
+            print(f"    Profiles written to {profile_dir}")
+
+def run_daemon(base_dir, args):
+    """--mode daemon: 수집기/분석 클라이언트를 재사용하며 소스별 주기로 수집, 새 항목이 있으면 분석 + 증분 집계"""
+    from daemon import PipelineDaemon
+    
+    data_dir = os.path.join(base_dir, "data")
+    store = RawStore(data_dir)
+    metrics_path = os.path.join(data_dir, "aggregated", "pipeline-metrics.json")
+    analyzer = None  # 첫 분석 시 생성 후 재사용
+    analyzer_ready = False
+    pipeline_metrics.reset(mode="daemon")
+    
+    def collect(source_type, collector):
+        with pipeline_metrics.stage("collect"):
+            return collect_source(store, source_type, collector)
+    
+    def process():
+        nonlocal analyzer, analyzer_ready
+        if not analyzer_ready:
+            analyzer, analyzer_ready = create_analyzer(), True
+        try:
+            if analyzer is not None:
+                with pipeline_metrics.stage("analyze"):
+                    run_analysis(base_dir, analyzer)
+            with pipeline_metrics.stage("aggregate"):
+                DataAggregator(data_dir, workers=args.workers).aggregate_all()
+        finally:
+            # 수집 ~ 집계 한 주기를 실행 1회로 기록
+            pipeline_metrics.save(metrics_path)
+            pipeline_metrics.reset(mode="daemon")
+    
+    daemon = PipelineDaemon(
+        store.state_dir,
+        args.sources or available_sources(),
+        DAEMON_CONFIG,
+        create_collector=create_collector,
+        collect=collect,
+        process=process
+    )
+    daemon.run()
+
+def run_steps(args, base_dir, since):
+    """모드에 해당하는 단계 실행 (각 단계는 pipeline_metrics 최상위 stage로 계측)"""
     # 1. Collect (Mock)
     if args.mode in ["collect", "all"]:
         print(">>> Step 1: Collection")
-        run_collection(base_dir)
-        # Mock 데이터는 필요 시 주석 해제하여 사용
-        # generate_mock_data(base_dir)
+        with pipeline_metrics.stage("collect"):
+            run_collection(base_dir, args.sources)
+        
+    # 1-0. Mock 데이터 (수동 실행 전용)
+    if args.mode == "mock":
+        print(">>> Step 1: Mock Data")
+        with pipeline_metrics.stage("mock") as stage:
+            generate_mock_data(base_dir, args.mock_count)
+            stage.items_out = args.mock_count
         
+    # 1-1. Backfill (수동 실행 전용)
+    if args.mode == "backfill":
+        print(">>> Step 1: Backfill")
+        with pipeline_metrics.stage("backfill") as stage:
+            stage.items_out = sum(run_backfill(base_dir, since, args.workers, args.sources).values())
+        
+    # 1-2. Import (수동 업로드 파일)
+    if args.mode == "import":
+        print(">>> Step 1: Import")
+        from importer import ImportFormatError
+        with pipeline_metrics.stage("import") as stage:
+            try:
+                stats = run_import(base_dir, args.file, args.map, args.source_name, args.chunk_size)
+                stage.items_in = stats.get("rows", 0)
+                stage.items_out = stats.get("saved", 0)
+            except ImportFormatError as e:
+                print(f"    Import failed: {e}")
+    
     # 2. Analyze
     if args.mode in ["analyze", "all"]:
         print(">>> Step 2: Analysis")
-        run_analysis(base_dir)
+        with pipeline_metrics.stage("analyze"):
+            run_analysis(base_dir)
+    
+    # 2-2. Reanalyze (수동 실행, 분석 버전 변경 후)
+    if args.mode == "reanalyze":
+        print(">>> Step 2: Re-analysis")
+        with pipeline_metrics.stage("reanalyze"):
+            run_reanalysis(base_dir, args.sample_rate, args.max_disagreement)
+        
+    # 2-1. Compact
+    if args.mode in ["compact", "all"]:
+        print(">>> Step 2-1: Compaction")
+        with pipeline_metrics.stage("compact") as stage:
+            stage.items_out = run_compaction(base_dir, args.keep_days)["items"]
         
     # 3. Aggregate
-    if args.mode in ["aggregate", "all"]:
+    if args.mode in ["aggregate", "reanalyze", "all"]:
         print(">>> Step 3: Aggregation")
-        aggregator = DataAggregator(os.path.join(base_dir, "data"))
-        aggregator.aggregate_all()
+        with pipeline_metrics.stage("aggregate"):
+            aggregator = DataAggregator(os.path.join(base_dir, "data"), workers=args.workers)
+            aggregator.aggregate_all()
         print("    Aggregation complete. Check 'data/aggregated/'")
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import os
+import io
+import json
+import time
+import pstats
+import bisect
+import cProfile
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# API 지연시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+
+class StageRecord:
+    """단계별 측정값 (with pipeline_metrics.stage(...) as stage: stage.items_out = n)"""
+
+    __slots__ = ("name", "wall_seconds", "cpu_seconds", "items_in", "items_out", "bytes_read", "bytes_written", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.items_in = None
+        self.items_out = None
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written
+        }
+        if self.items_in is not None:
+            data["items_in"] = self.items_in
+        if self.items_out is not None:
+            data["items_out"] = self.items_out
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 4),
+            "avg_seconds": round(self.total / self.count, 4) if self.count else None,
+            "max_seconds": round(self.max, 4),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class PipelineMetrics:
+    """
+    파이프라인 계측
+    - 단계별 wall/CPU 시간, 입출력 항목 수, 읽기/쓰기 바이트
+    - API 지연시간 히스토그램, 토큰 사용량
+    - data/aggregated/pipeline-metrics.json에 최근 실행 이력과 함께 저장
+    - profile 모드: 최상위 단계마다 cProfile + tracemalloc 스냅샷 저장
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, mode: str = None, profile_dir: str = None) -> None:
+        self.mode = mode
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.stages: Dict[str, StageRecord] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.tokens = {"input_tokens": 0, "output_tokens": 0}
+        self._stack: List[StageRecord] = []
+        self.profile_dir = profile_dir
+
+    @contextmanager
+    def stage(self, name: str):
+        """중첩 단계는 '상위.하위' 이름으로 기록"""
+        with self._lock:
+            full_name = f"{self._stack[-1].name}.{name}" if self._stack else name
+            record = self.stages.get(full_name) or StageRecord(full_name)
+            self.stages[full_name] = record
+            self._stack.append(record)
+            top_level = len(self._stack) == 1
+            read_before, written_before = record.bytes_read, record.bytes_written
+
+        profiler = None
+        if self.profile_dir and top_level:
+            profiler = cProfile.Profile()
+            tracemalloc.start()
+            profiler.enable()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            record.wall_seconds += time.perf_counter() - wall_start
+            record.cpu_seconds += time.process_time() - cpu_start
+            if profiler:
+                profiler.disable()
+                self._dump_profile(full_name, profiler)
+            with self._lock:
+                self._stack.remove(record)
+                # 이번 구간의 I/O를 바로 위 단계에 합산 (상위로는 각 단계 종료 시 전파)
+                if self._stack:
+                    self._stack[-1].bytes_read += record.bytes_read - read_before
+                    self._stack[-1].bytes_written += record.bytes_written - written_before
+
+    def add_bytes(self, read: int = 0, written: int = 0) -> None:
+        """현재 진행 중인 가장 안쪽 단계에 I/O 바이트 기록"""
+        with self._lock:
+            if self._stack:
+                self._stack[-1].bytes_read += read
+                self._stack[-1].bytes_written += written
+
+    def observe_latency(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(seconds)
+
+    def add_tokens(self, usage: Optional[Dict[str, int]]) -> None:
+        if not usage:
+            return
+        with self._lock:
+            self.tokens["input_tokens"] += usage.get("input_tokens", 0)
+            self.tokens["output_tokens"] += usage.get("output_tokens", 0)
+
+    def _dump_profile(self, stage_name: str, profiler: cProfile.Profile) -> None:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, stage_name)
+        profiler.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"# {stage_name} - peak traced memory {peak / (1024 * 1024):.2f} MB\n\n")
+        report.write("## Top functions (cumulative)\n")
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(30)
+        report.write("\n## Top allocations (by line)\n")
+        for stat in snapshot.statistics("lineno")[:20]:
+            report.write(f"{stat}\n")
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        logger.info(f"Profile for stage '{stage_name}' written to {base}.prof/.txt")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "mode": self.mode,
+            "total_wall_seconds": round(time.perf_counter() - self._start, 4),
+            "stages": {name: record.to_dict() for name, record in self.stages.items()},
+            "api_latency": {name: h.to_dict() for name, h in self.histograms.items()},
+            "tokens": dict(self.tokens)
+        }
+
+    def save(self, path: str, history: int = 60) -> Dict[str, Any]:
+        """최근 history회 실행 이력을 유지하며 저장"""
+        run = self.snapshot()
+        runs = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    runs = json.load(f).get("history", [])
+            except Exception as e:
+                logger.warning(f"Could not read previous metrics ({e}), starting a new history.")
+        runs = (runs + [run])[-history:]
+        # fileio가 이 모듈을 임포트하므로 순환 임포트를 피해 지연 임포트
+        try:
+            from .fileio import atomic_write_json
+        except ImportError:
+            from fileio import atomic_write_json
+        atomic_write_json(path, {"latest": run, "history": runs}, indent=2)
+        return run
+
+
+# 프로세스 전역 계측기 (logging.getLogger처럼 모듈에서 공유)
+pipeline_metrics = PipelineMetrics()
@@ -3,7 +3,7 @@ import uuid
 import logging
 import requests
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 
 from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, SEARCH_KEYWORDS, COLLECTION_CONFIG
 try:
@@ -34,10 +34,7 @@ class NaverBlogCollector(BaseCollector):
             return []
             
         results = []
-        headers = {
-            "X-Naver-Client-Id": self.client_id,
-            "X-Naver-Client-Secret": self.client_secret
-        }
+        headers = self._headers()
         
         keywords = SEARCH_KEYWORDS.get("primary", []) + SEARCH_KEYWORDS.get("competitive", [])
         
@@ -55,28 +52,7 @@ class NaverBlogCollector(BaseCollector):
                 data = response.json()
                 
                 for item in data.get("items", []):
-                    # HTML 태그 제거 (간단히)
-                    clean_title = item["title"].replace("<b>", "").replace("</b>", "").replace("&quot;", '"')
-                    clean_desc = item["description"].replace("<b>", "").replace("</b>", "").replace("&quot;", '"')
-                    
-                    results.append({
-                        "id": str(uuid.uuid4()),
-                        "source": {
-                            "type": "naver_blog",
-                            "name": "Naver Blog",
-                            "app_key": "naver_blog",
-                            "url": item["link"]
-                        },
-                        "external_id": item["link"], # URL을 ID로 사용
-                        "author": item["bloggername"],
-                        "rating": None,
-                        "text": f"{clean_title}\n{clean_desc}",
-                        "created_at": self._parse_date(item["postdate"]),
-                        "collected_at": datetime.now().isoformat(),
-                        "metadata": {
-                            "blogger_link": item["bloggerlink"]
-                        }
-                    })
+                    results.append(self._to_item(item))
                 
                 time.sleep(0.1) # API Rate limit 고려
                 
@@ -85,6 +61,75 @@ class NaverBlogCollector(BaseCollector):
                 
         return results
 
+    def backfill_units(self) -> List[str]:
+        if not self.client_id or not self.client_secret:
+            logger.error("Naver API credentials are missing. Skipping backfill.")
+            return []
+        return SEARCH_KEYWORDS.get("primary", []) + SEARCH_KEYWORDS.get("competitive", [])
+
+    def iter_backfill(self, unit: str, cursor: Any, since: datetime) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """start 오프셋을 증가시키며 since 시점까지 날짜순으로 거슬러 올라가며 수집"""
+        display = self.config.get("display", 100)
+        max_start = self.config.get("max_start", 1000)  # 검색 API의 start 상한
+        start = cursor or 1
+
+        while True:
+            params = {
+                "query": unit,
+                "display": display,
+                "start": start,
+                "sort": "date"
+            }
+            response = requests.get(self.api_url, headers=self._headers(), params=params)
+            response.raise_for_status()
+            batch = response.json().get("items", [])
+
+            items = []
+            reached_cutoff = False
+            for item in batch:
+                if datetime.fromisoformat(self._parse_date(item["postdate"])) < since:
+                    reached_cutoff = True
+                    continue
+                items.append(self._to_item(item))
+
+            start += display
+            next_cursor = None if (len(batch) < display or reached_cutoff or start > max_start) else start
+
+            yield items, next_cursor
+            if next_cursor is None:
+                return
+            time.sleep(0.1)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret
+        }
+
+    def _to_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        # HTML 태그 제거 (간단히)
+        clean_title = item["title"].replace("<b>", "").replace("</b>", "").replace("&quot;", '"')
+        clean_desc = item["description"].replace("<b>", "").replace("</b>", "").replace("&quot;", '"')
+        
+        return {
+            "id": str(uuid.uuid4()),
+            "source": {
+                "type": "naver_blog",
+                "name": "Naver Blog",
+                "app_key": "naver_blog",
+                "url": item["link"]
+            },
+            "external_id": item["link"], # URL을 ID로 사용
+            "author": item["bloggername"],
+            "rating": None,
+            "text": f"{clean_title}\n{clean_desc}",
+            "created_at": self._parse_date(item["postdate"]),
+            "collected_at": datetime.now().isoformat(),
+            "metadata": {
+                "blogger_link": item["bloggerlink"]
+            }
+        }
+
     def _parse_date(self, date_str: str) -> str:
         # YYYYMMDD format -> ISO format
         try:
@@ -0,0 +1,140 @@
+import os
+import gzip
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from .fileio import OutputSidecar, atomic_write_bytes, content_hash, write_output
+    from .records import dumps
+except ImportError:
+    from fileio import OutputSidecar, atomic_write_bytes, content_hash, write_output
+    from records import dumps
+
+logger = logging.getLogger(__name__)
+
+TREND_FORMAT = "columns-v1"
+RINGLE_COLUMNS = ("count", "positive", "neutral", "negative", "churn_signals", "avg_rating", "unique_authors")
+COMPETITOR_COLUMNS = ("count", "positive", "neutral", "negative", "avg_rating")
+
+def _columns(daily: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    월 파티션 1개를 열 지향 구조로 변환
+    - 날짜 배열 + 지표별 배열 (같은 인덱스 = 같은 날짜)
+    - 경쟁사 리뷰가 없는 날짜는 count 0, avg_rating null
+    """
+    def row(source: Dict[str, Any], column: str) -> Any:
+        if column in ("positive", "neutral", "negative"):
+            return source.get("sentiment", {}).get(column, 0)
+        default = None if column == "avg_rating" else 0
+        return source.get(column, default)
+
+    competitors = sorted({name for day in daily for name in day["competitors"]})
+    return {
+        "date": [day["date"] for day in daily],
+        "ringle": {c: [row(day["ringle"], c) for day in daily] for c in RINGLE_COLUMNS},
+        "competitors": {
+            name: {c: [row(day["competitors"].get(name, {}), c) for day in daily] for c in COMPETITOR_COLUMNS}
+            for name in competitors
+        }
+    }
+
+class TrendPartitionWriter:
+    """
+    대시보드용 월별 트렌드 파일 (data/aggregated/trends/<YYYY-MM>.json)
+    - 공백 없는 열 지향 JSON + .gz/.br 사전 압축본 (brotli 미설치 시 .gz만)
+    - manifest.json에 월별 기간/일수/내용 해시 기록 -> 대시보드는 보이는 기간의 파티션만 요청
+    - 내용 해시가 같은 파티션은 다시 쓰지 않음 (브라우저/CDN 캐시 유지)
+    - manifest.json도 파티션 구성이 바뀔 때만 재기록 (write_output)
+    """
+
+    def __init__(self, aggregated_dir: str, sidecar: OutputSidecar = None):
+        self.aggregated_dir = aggregated_dir
+        self.sidecar = sidecar
+        self.trends_dir = os.path.join(aggregated_dir, "trends")
+        self.manifest_path = os.path.join(aggregated_dir, "manifest.json")
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest: {e}")
+            return {}
+
+    def _encodings(self) -> List[str]:
+        return ["gz", "br"] if brotli is not None else ["gz"]
+
+    def _write_partition(self, path: str, payload: bytes) -> None:
+        atomic_write_bytes(path, payload)
+        atomic_write_bytes(path + ".gz", gzip.compress(payload, compresslevel=9, mtime=0))
+        if brotli is not None:
+            atomic_write_bytes(path + ".br", brotli.compress(payload, quality=11))
+        elif os.path.exists(path + ".br"):
+            os.remove(path + ".br")  # 이전 내용의 .br이 남지 않도록
+
+    def write(self, daily: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """daily(trends.json 형식, 날짜순)를 월별로 나눠 저장하고 manifest 반환"""
+        previous = {p["month"]: p for p in self._load_manifest().get("trends", {}).get("partitions", [])}
+        encodings = self._encodings()
+
+        months: Dict[str, List[Dict[str, Any]]] = {}
+        for day in daily:
+            months.setdefault(day["date"][:7], []).append(day)
+
+        partitions = []
+        written = 0
+        for month in sorted(months):
+            days = months[month]
+            payload = dumps({"format": TREND_FORMAT, "month": month, "columns": _columns(days)}, sort_keys=True)
+            digest = content_hash(payload)
+            rel_path = f"trends/{month}.json"
+            path = os.path.join(self.aggregated_dir, *rel_path.split("/"))
+
+            old = previous.get(month)
+            unchanged = (
+                old is not None and old.get("hash") == digest and old.get("encodings") == encodings
+                and all(os.path.exists(path + ("" if e is None else f".{e}")) for e in [None] + encodings)
+            )
+            if not unchanged:
+                self._write_partition(path, payload)
+                written += 1
+
+            partitions.append({
+                "month": month,
+                "start": days[0]["date"],
+                "end": days[-1]["date"],
+                "days": len(days),
+                "file": rel_path,
+                "hash": digest,
+                "bytes": len(payload),
+                "encodings": encodings
+            })
+
+        # 데이터에서 사라진 월 파일 정리
+        if os.path.exists(self.trends_dir):
+            live = {f"{month}.json" for month in months}
+            for name in os.listdir(self.trends_dir):
+                if name.split(".json")[0] + ".json" not in live:
+                    os.remove(os.path.join(self.trends_dir, name))
+
+        manifest = {
+            "updated_at": datetime.now().isoformat(),
+            "trends": {
+                "format": TREND_FORMAT,
+                "start": partitions[0]["start"] if partitions else None,
+                "end": partitions[-1]["end"] if partitions else None,
+                "partitions": partitions
+            }
+        }
+        write_output(self.manifest_path, manifest, sidecar=self.sidecar)
+        logger.info(f"Trend partitions: {len(partitions)} ({written} rewritten)")
+        return manifest
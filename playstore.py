@@ -2,14 +2,16 @@ import time
 import uuid
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 
 from google_play_scraper import reviews, Sort
 from config import APPS, COLLECTION_CONFIG
 try:
     from .base import BaseCollector
+    from .scraper_compat import playstore_token, playstore_cursor
 except ImportError:
     from base import BaseCollector
+    from scraper_compat import playstore_token, playstore_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -47,27 +49,7 @@ class PlayStoreCollector(BaseCollector):
                 )
                 
                 for review in collected_reviews:
-                    item = {
-                        "id": str(uuid.uuid4()),
-                        "source": {
-                            "type": "playstore",
-                            "name": app_name,
-                            "app_key": app_key,
-                            "url": f"https://play.google.com/store/apps/details?id={app_id}&reviewId={review['reviewId']}"
-                        },
-                        "external_id": review['reviewId'],
-                        "author": review['userName'],
-                        "rating": review['score'],
-                        "text": review['content'],
-                        "created_at": review['at'].isoformat() if review.get('at') else datetime.now().isoformat(),
-                        "collected_at": datetime.now().isoformat(),
-                        "metadata": {
-                            "thumbs_up": review.get('thumbsUpCount'),
-                            "reply_count": 0,
-                            "app_version": review.get('reviewCreatedVersion')
-                        }
-                    }
-                    results.append(item)
+                    results.append(self._to_item(review, app_key, app_info))
                     
                 logger.info(f"Collected {len(collected_reviews)} reviews for {app_name}")
                 time.sleep(1)  # Rate limit
@@ -75,4 +57,62 @@ class PlayStoreCollector(BaseCollector):
             except Exception as e:
                 logger.error(f"Error collecting Play Store reviews for {app_name}: {e}")
                 
-        return results
\ No newline at end of file
+        return results
+
+    def backfill_units(self) -> List[str]:
+        return [app_key for app_key, app_info in self.apps.items() if app_info.get("playstore")]
+
+    def iter_backfill(self, unit: str, cursor: Any, since: datetime) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """continuation token을 따라 since 시점까지 최신순으로 거슬러 올라가며 수집"""
+        app_info = self.apps[unit]
+        app_id = app_info["playstore"]
+        lang = self.config.get("lang", "ko")
+        country = self.config.get("country", "kr")
+        page_size = self.config.get("backfill_page_size", 200)
+
+        token = None
+        if cursor:
+            # 체크포인트에는 토큰 문자열만 저장되므로 나머지 필드는 동일 설정으로 복원
+            token = playstore_token(cursor, lang, country, Sort.NEWEST.value, page_size)
+
+        while True:
+            batch, token = reviews(
+                app_id,
+                lang=lang,
+                country=country,
+                sort=Sort.NEWEST,
+                count=page_size,
+                continuation_token=token
+            )
+
+            items = [self._to_item(r, unit, app_info) for r in batch if not r.get('at') or r['at'] >= since]
+            reached_cutoff = any(r.get('at') and r['at'] < since for r in batch)
+            next_cursor = None if (not batch or reached_cutoff) else playstore_cursor(token)
+
+            yield items, next_cursor
+            if next_cursor is None:
+                return
+            time.sleep(1)  # Rate limit
+
+    def _to_item(self, review: Dict[str, Any], app_key: str, app_info: Dict[str, Any]) -> Dict[str, Any]:
+        app_id = app_info["playstore"]
+        return {
+            "id": str(uuid.uuid4()),
+            "source": {
+                "type": "playstore",
+                "name": app_info["name"],
+                "app_key": app_key,
+                "url": f"https://play.google.com/store/apps/details?id={app_id}&reviewId={review['reviewId']}"
+            },
+            "external_id": review['reviewId'],
+            "author": review['userName'],
+            "rating": review['score'],
+            "text": review['content'],
+            "created_at": review['at'].isoformat() if review.get('at') else datetime.now().isoformat(),
+            "collected_at": datetime.now().isoformat(),
+            "metadata": {
+                "thumbs_up": review.get('thumbsUpCount'),
+                "reply_count": 0,
+                "app_version": review.get('reviewCreatedVersion')
+            }
+        }
@@ -1,5 +1,9 @@
 import re
-from typing import List, Tuple
+from typing import List, Tuple, Dict
+
+# 문구 끝에서 떼어낼 조사 (긴 것부터 검사, 명사 끝 글자와 겹치기 쉬운 도/로/에/의는 제외)
+JOSA_SUFFIXES = ("에서", "에게", "으로", "까지", "부터", "처럼", "보다", "이랑", "은", "는", "을", "를", "이", "가")
+_PHRASE_PUNCT = re.compile(r'[^\w\s]')
 
 class TextPreprocessor:
     """텍스트 정제 및 전처리"""
@@ -63,6 +67,38 @@ class TextPreprocessor:
         
         return False, ""
     
+    def normalize_phrase(self, phrase: str, casefold: bool = True) -> str:
+        """
+        키워드 집계용 문구 정규화
+        - 구두점 제거, 연속 공백 정리, 대소문자 통일 (casefold=False면 표시용으로 원래 대소문자 유지)
+        - 마지막 한글 어절의 조사 제거 ("가격이" -> "가격"), 남는 어간이 2자 이상인 경우만
+        """
+        if not phrase:
+            return ""
+        words = _PHRASE_PUNCT.sub(" ", phrase)
+        words = (words.casefold() if casefold else words).split()
+        if not words:
+            return ""
+        last = words[-1]
+        for josa in JOSA_SUFFIXES:
+            if last.endswith(josa) and len(last) - len(josa) >= 2:
+                words[-1] = last[:-len(josa)]
+                break
+        return " ".join(words)
+    
+    def estimate_tokens(self, text: str) -> int:
+        """
+        입력 토큰 수 추정 (API 호출 전 예산 계산용, 보수적으로 높게 잡음)
+        - 한글: 글자당 약 1토큰
+        - 그 외: 약 3.5자당 1토큰
+        """
+        if not text:
+            return 0
+            
+        ko_chars = len(re.findall(r'[가-힣]', text))
+        other_chars = len(text) - ko_chars
+        return int(ko_chars + other_chars / 3.5) + 1
+    
     def split_utterances(self, text: str) -> List[str]:
         """
         문장 단위 분리
@@ -72,4 +108,47 @@ class TextPreprocessor:
             
         # 문장 종결 부호로 분리 (. ? !)
         sentences = re.split(r'(?<=[.?!])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
\ No newline at end of file
+        return [s.strip() for s in sentences if s.strip()]
+    
+    def condense(self, text: str, keywords: Dict[str, float], max_tokens: int = 300, window: int = 1) -> Tuple[str, float]:
+        """
+        긴 글 요약 (분석 입력 토큰 절감용)
+        - 문장별로 키워드 가중치 합을 점수로 계산하고, 앞뒤 window 문장까지 거리에 반비례해 점수를 전파
+        - 점수가 높은 문장부터 max_tokens 이내로 선택해 원래 순서대로 연결 (첫 문장=제목은 항상 포함)
+        반환: (요약 텍스트, 압축률 = 요약 토큰 / 원문 토큰)
+        """
+        original_tokens = self.estimate_tokens(text)
+        if original_tokens <= max_tokens:
+            return text, 1.0
+            
+        sentences = [u for line in text.splitlines() for u in self.split_utterances(line)]
+        lowered = [s.lower() for s in sentences]
+        hits = [sum(w * s.count(k) for k, w in keywords.items()) for s in lowered]
+        
+        scores = [0.0] * len(sentences)
+        for i, hit in enumerate(hits):
+            if not hit:
+                continue
+            for j in range(max(0, i - window), min(len(sentences), i + window + 1)):
+                scores[j] += hit / (1 + abs(i - j))
+        if scores:
+            scores[0] += max(scores) + 1  # 제목 우선
+            
+        # 키워드가 하나라도 있으면 관련 문장만, 없으면 앞 문장부터 상한까지 채움
+        has_hits = any(hits)
+        selected = set()
+        used = 0
+        for i in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            if has_hits and scores[i] == 0:
+                break
+            cost = self.estimate_tokens(sentences[i])
+            if used + cost > max_tokens:
+                continue
+            selected.add(i)
+            used += cost
+            
+        condensed = " ".join(sentences[i] for i in sorted(selected))
+        if not condensed:
+            # 한 문장이 상한보다 긴 경우 앞부분만 사용
+            condensed = text[:max_tokens]
+        return condensed, round(self.estimate_tokens(condensed) / original_tokens, 3)
@@ -0,0 +1,374 @@
+import io
+import os
+import re
+import gzip
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from .fileio import append_jsonl, write_output
+    from .metrics import pipeline_metrics
+    from .records import RawReview, dumps, loads, load_records
+except ImportError:
+    from fileio import append_jsonl, write_output
+    from metrics import pipeline_metrics
+    from records import RawReview, dumps, loads, load_records
+
+logger = logging.getLogger(__name__)
+
+_FILE_TS_PATTERN = re.compile(r"_(\d{8})_\d{6}")
+
+class RawStore:
+    """
+    data/raw 저장소
+    - 소스별 타임스탬프 JSON 파일로 저장
+    - (source type, external_id) 기준 중복 제거 (일일 수집/백필/가져오기 공통 경로)
+    - 중복 제거 인덱스는 append-only 로그 (state/seen_ids.jsonl, 저장 1회당 새 키 1줄)
+      -> 청크 단위 저장이 반복돼도 전체 인덱스를 다시 쓰지 않음
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.raw_dir = os.path.join(data_dir, "raw")
+        self.state_dir = os.path.join(data_dir, "state")
+        self.archive_dir = os.path.join(data_dir, "archive")
+        self.index_path = os.path.join(self.state_dir, "seen_ids.jsonl")
+        self.legacy_index_path = os.path.join(self.state_dir, "seen_ids.json")  # 이전 형식 (전체 정렬 목록)
+        self._seen = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.raw_dir, exist_ok=True)
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    @staticmethod
+    def dedup_key(item: Dict[str, Any]) -> Optional[str]:
+        """수집기 출력(dict) 기준 중복 제거 키 (RawReview.dedup_key와 동일)"""
+        external_id = item.get("external_id")
+        if not external_id:
+            return None
+        source_type = (item.get("source") or {}).get("type", "unknown")
+        return f"{source_type}:{external_id}"
+
+    def _load_index(self) -> set:
+        if self._seen is not None:
+            return self._seen
+
+        self._seen = set()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                for line in f:
+                    try:
+                        self._seen.update(loads(line)["keys"])
+                    except Exception:
+                        # 기록 중 프로세스가 중단돼 잘린 마지막 줄은 무시
+                        logger.warning("Ignoring truncated line in dedup index.")
+        elif os.path.exists(self.legacy_index_path):
+            with open(self.legacy_index_path, "r", encoding="utf-8") as f:
+                self._seen = set(json.load(f))
+            append_jsonl(self.index_path, {"keys": sorted(self._seen)})
+            os.remove(self.legacy_index_path)
+        else:
+            # 인덱스가 없으면 (최초 실행, 캐시 유실) raw 파일/아카이브로 1회 구성
+            for path in self.list_files():
+                try:
+                    items = self.read_file(path)
+                except Exception as e:
+                    logger.error(f"Error reading raw file {path}: {e}")
+                    continue
+                for item in items:
+                    key = item.dedup_key
+                    if key:
+                        self._seen.add(key)
+            for item in self.iter_archive():
+                key = item.dedup_key
+                if key:
+                    self._seen.add(key)
+            append_jsonl(self.index_path, {"keys": sorted(self._seen)})
+            logger.info(f"Built dedup index from existing raw files ({len(self._seen)} keys).")
+        return self._seen
+
+    def _select_new(self, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """(새 항목, 새 키) - 인덱스는 변경하지 않음 (self._lock 안에서 호출)"""
+        seen = self._load_index()
+        batch = set()
+        fresh, keys = [], []
+        for item in items:
+            key = self.dedup_key(item)
+            if key is not None:
+                if key in seen or key in batch:
+                    continue
+                batch.add(key)
+                keys.append(key)
+            fresh.append(item)
+        return fresh, keys
+
+    def filter_new(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """이미 저장된 항목(및 배치 내 중복)을 제외한 목록 반환 (인덱스 반영은 save에서 저장 성공 후)"""
+        with self._lock:
+            return self._select_new(items)[0]
+
+    def save(self, source_type: str, items: List[Dict[str, Any]], tag: str = None) -> Tuple[Optional[str], int]:
+        """
+        중복 제거 후 raw 파일로 저장
+        - 새 키는 raw 파일 저장이 성공한 뒤에 인덱스에 반영 (저장 실패 시 다음 실행에서 다시 저장)
+        반환: (저장된 파일명, 새 항목 수) - 새 항목이 없으면 (None, 0)
+        """
+        with self._lock:
+            fresh, keys = self._select_new(items)
+            if not fresh:
+                return None, 0
+
+            source_dir = os.path.join(self.raw_dir, source_type)
+            os.makedirs(source_dir, exist_ok=True)
+
+            stem = f"{source_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            if tag:
+                stem = f"{stem}_{tag}"
+            filename = f"{stem}.json"
+            n = 1
+            while os.path.exists(os.path.join(source_dir, filename)):
+                filename = f"{stem}_{n}.json"
+                n += 1
+
+            write_output(os.path.join(source_dir, filename), fresh)
+
+            if keys:
+                append_jsonl(self.index_path, {"keys": keys})
+                self._seen.update(keys)
+        return filename, len(fresh)
+
+    def list_files(self) -> List[str]:
+        files = []
+        for root, dirs, names in os.walk(self.raw_dir):
+            for name in names:
+                if name.endswith(".json"):
+                    files.append(os.path.join(root, name))
+        return sorted(files)
+
+    def relpath(self, path: str) -> str:
+        """manifest 키로 사용하는 raw_dir 기준 상대 경로 ('/' 구분)"""
+        return os.path.relpath(path, self.raw_dir).replace(os.sep, "/")
+
+    def abspath(self, rel_path: str) -> str:
+        return os.path.join(self.raw_dir, *rel_path.split("/"))
+
+    def pending_files(self, manifest: "AnalysisManifest") -> List[str]:
+        """분석이 끝나지 않은 raw 파일의 상대 경로 목록"""
+        return [rel for rel in map(self.relpath, self.list_files()) if not manifest.is_complete(rel)]
+
+    def read_file(self, path: str) -> List[RawReview]:
+        """raw 파일을 검증된 RawReview 목록으로 읽기 (형식 오류 시 예외)"""
+        with open(path, "rb") as f:
+            payload = f.read()
+        pipeline_metrics.add_bytes(read=len(payload))
+        return load_records(loads(payload), RawReview)
+
+    def compact(self, manifest: "AnalysisManifest", keep_days: int = 7, codec: str = "zstd") -> Dict[str, int]:
+        """
+        분석이 끝난 오래된 raw 파일을 월 단위 압축 JSONL 아카이브로 병합
+        - 아카이브: data/archive/<source_type>/<YYYY-MM>.jsonl.zst (zstandard 미설치 시 .jsonl.gz)
+        - 압축 프레임(gzip member / zstd frame)을 이어 붙이므로 기존 아카이브를 다시 쓰지 않음
+        - 붙이기 전에 아카이브별 원래 크기를 manifest에 기록 -> 중간에 중단되면 다음 압축에서 그 크기로 되돌린 뒤
+          다시 붙이므로 같은 항목이 두 번 들어가거나 잘린 프레임이 남지 않음
+        - 병합된 raw 파일은 삭제되고 manifest 항목도 제거되어 스캔 대상이 늘어나지 않음
+        """
+        cutoff = datetime.now() - timedelta(days=keep_days)
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard package is not installed. Falling back to gzip.")
+            codec = "gzip"
+
+        stats = {"files": 0, "items": 0}
+        self._recover_compaction(manifest)
+        for path in self.list_files():
+            rel_path = self.relpath(path)
+            if not manifest.is_complete(rel_path) or self._file_time(path) >= cutoff:
+                continue
+
+            try:
+                items = self.read_file(path)
+            except Exception as e:
+                logger.error(f"Skipping unreadable raw file {rel_path}: {e}")
+                continue
+
+            source_type = rel_path.split("/")[0] if "/" in rel_path else "unknown"
+            partitions = defaultdict(list)
+            for item in items:
+                month = (item.created_at or "")[:7] or "unknown"
+                partitions[month].append(item)
+
+            frames = {self._archive_rel(source_type, month, codec): self._archive_frame(items, codec)
+                      for month, items in partitions.items()}
+            with self._lock:
+                manifest.begin_compaction(rel_path, {rel: self._archive_size(rel) for rel in frames})
+                manifest.save()
+                for rel, frame in frames.items():
+                    self._append_archive(rel, frame)
+                os.remove(path)
+            manifest.forget(rel_path)
+
+            stats["files"] += 1
+            stats["items"] += sum(len(v) for v in partitions.values())
+
+        if stats["files"]:
+            manifest.save()
+        return stats
+
+    def _file_time(self, path: str) -> datetime:
+        # CI 체크아웃 시 mtime이 초기화되므로 파일명의 수집 시각을 우선 사용
+        match = _FILE_TS_PATTERN.search(os.path.basename(path))
+        if match:
+            return datetime.strptime(match.group(1), "%Y%m%d")
+        return datetime.fromtimestamp(os.path.getmtime(path))
+
+    def _archive_rel(self, source_type: str, month: str, codec: str) -> str:
+        return f"{source_type}/{month}.jsonl.{'zst' if codec == 'zstd' else 'gz'}"
+
+    def _archive_size(self, rel: str) -> int:
+        path = os.path.join(self.archive_dir, *rel.split("/"))
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    @staticmethod
+    def _archive_frame(items: List[RawReview], codec: str) -> bytes:
+        payload = b"".join(dumps(item) + b"\n" for item in items)
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(payload)
+        return gzip.compress(payload)
+
+    def _append_archive(self, rel: str, frame: bytes) -> None:
+        path = os.path.join(self.archive_dir, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        pipeline_metrics.add_bytes(written=len(frame))
+
+    def _recover_compaction(self, manifest: "AnalysisManifest") -> None:
+        """
+        중단된 압축 정리
+        - raw 파일이 남아 있으면 아카이브를 붙이기 전 크기로 되돌림 (이번 실행에서 다시 압축)
+        - raw 파일이 이미 삭제됐으면 아카이브에 모두 들어간 것이므로 manifest 항목만 제거
+        """
+        for rel_path, archives in manifest.compactions().items():
+            if not os.path.exists(self.abspath(rel_path)):
+                manifest.forget(rel_path)
+                continue
+            logger.warning(f"Rolling back interrupted compaction of {rel_path}")
+            for rel, size in archives.items():
+                path = os.path.join(self.archive_dir, *rel.split("/"))
+                if os.path.exists(path) and os.path.getsize(path) > size:
+                    with open(path, "r+b") as f:
+                        f.truncate(size)
+                        os.fsync(f.fileno())
+            manifest.begin_compaction(rel_path, None)
+
+    def iter_archive(self) -> Iterator[RawReview]:
+        """아카이브에 병합된 raw 항목 순회"""
+        if not os.path.exists(self.archive_dir):
+            return
+        for root, dirs, names in os.walk(self.archive_dir):
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                if name.endswith(".jsonl.gz"):
+                    f = gzip.open(path, "rt", encoding="utf-8")
+                elif name.endswith(".jsonl.zst") and zstandard is not None:
+                    f = _open_zstd_text(path)
+                else:
+                    continue
+                with f:
+                    for line in f:
+                        if line.strip():
+                            yield RawReview.from_dict(loads(line))
+
+
+class AnalysisManifest:
+    """
+    분석 진행 상황 manifest (data/state/analysis-manifest.json)
+    - raw 파일별 전체 항목 수, 연속 완료 오프셋(done), 오프셋 이후 먼저 완료된 인덱스(completed), 인덱스별 실패 횟수 기록
+    - 우선순위 큐로 순서가 바뀌어 처리되어도 완료 인덱스만 기록되므로 이월된 항목은 다음 실행에서 이어서 처리
+    - 분석 단계는 완료되지 않은 파일만 열고, 미완료 인덱스만 처리
+    """
+
+    def __init__(self, state_dir: str):
+        self.path = os.path.join(state_dir, "analysis-manifest.json")
+        self.files = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def _entry(self, rel_path: str) -> Dict[str, Any]:
+        return self.files.setdefault(rel_path, {"items": None, "done": 0, "completed": [], "attempts": {}})
+
+    def offset(self, rel_path: str) -> int:
+        return self.files.get(rel_path, {}).get("done", 0)
+
+    def is_complete(self, rel_path: str) -> bool:
+        entry = self.files.get(rel_path)
+        return bool(entry) and entry["items"] is not None and entry["done"] >= entry["items"]
+
+    def mark(self, rel_path: str, items: int) -> None:
+        """파일 전체 항목 수 기록"""
+        self._entry(rel_path)["items"] = items
+
+    def pending_indices(self, rel_path: str) -> List[int]:
+        entry = self._entry(rel_path)
+        completed = set(entry["completed"])
+        return [i for i in range(entry["done"], entry["items"] or 0) if i not in completed]
+
+    def complete(self, rel_path: str, index: int) -> None:
+        entry = self._entry(rel_path)
+        if index < entry["done"]:
+            return
+        completed = set(entry["completed"])
+        completed.add(index)
+        while entry["done"] in completed:
+            completed.discard(entry["done"])
+            entry["attempts"].pop(str(entry["done"]), None)
+            entry["done"] += 1
+        entry["completed"] = sorted(completed)
+
+    def attempts(self, rel_path: str, index: int) -> int:
+        return self.files.get(rel_path, {}).get("attempts", {}).get(str(index), 0)
+
+    def fail(self, rel_path: str, index: int, attempt: int = None) -> int:
+        """
+        실패 횟수 기록, 누적 횟수 반환
+        attempt가 주어지면 해당 값으로 설정 (저널 재생 시 중복 반영 방지)
+        """
+        attempts = self._entry(rel_path)["attempts"]
+        key = str(index)
+        attempts[key] = max(attempts.get(key, 0), attempt) if attempt is not None else attempts.get(key, 0) + 1
+        return attempts[key]
+
+    def forget(self, rel_path: str) -> None:
+        self.files.pop(rel_path, None)
+
+    def begin_compaction(self, rel_path: str, archives: Optional[Dict[str, int]]) -> None:
+        """아카이브에 붙이기 전 아카이브별 원래 크기 기록 (None이면 기록 제거)"""
+        entry = self._entry(rel_path)
+        if archives is None:
+            entry.pop("compacting", None)
+        else:
+            entry["compacting"] = archives
+
+    def compactions(self) -> Dict[str, Dict[str, int]]:
+        """압축 도중 중단된 raw 파일 -> 아카이브별 원래 크기"""
+        return {rel_path: dict(entry["compacting"]) for rel_path, entry in self.files.items() if entry.get("compacting")}
+
+    def save(self) -> None:
+        write_output(self.path, {"files": self.files})  # 체크포인트마다 호출되므로 변경이 없으면 쓰지 않음
+
+
+def _open_zstd_text(path: str):
+    raw = open(path, "rb")
+    reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+    return io.TextIOWrapper(reader, encoding="utf-8")
+
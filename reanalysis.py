@@ -0,0 +1,224 @@
+import os
+import json
+import math
+import hashlib
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    from .fileio import write_output
+    from .budget import prioritize
+    from .records import Analysis, AnalyzedReview, RecordValidationError, analyzed_path, partition_key, version_key, loads
+except ImportError:
+    from fileio import write_output
+    from budget import prioritize
+    from records import Analysis, AnalyzedReview, RecordValidationError, analyzed_path, partition_key, version_key, loads
+
+logger = logging.getLogger(__name__)
+
+class BudgetExhausted(Exception):
+    """예산 초과로 재분석 중단 (남은 작업은 다음 실행에서 이어서 진행)"""
+
+
+class _StaleItem:
+    """재분석 대상 항목 위치 (스캔 시 본문은 보관하지 않음)"""
+
+    __slots__ = ("path", "id", "created_at", "is_target")
+
+    def __init__(self, path: str, item: AnalyzedReview):
+        self.path = path
+        self.id = item.id
+        self.created_at = item.created_at
+        self.is_target = item.is_target
+
+
+def stratum_of(item: AnalyzedReview) -> str:
+    """층 라벨: <source_type>/<problem_type 또는 sentiment>"""
+    return f"{item.source_type}/{item.analysis.problem_type or item.analysis.sentiment}"
+
+def _sample_order(item_id: str) -> str:
+    # 실행마다 같은 표본이 뽑히도록 id 해시 순서로 선택
+    return hashlib.sha1(item_id.encode("utf-8")).hexdigest()
+
+
+class ReanalysisRunner:
+    """
+    분석 버전(model + prompt 해시) 변경 시 선택적 재분석 (--mode reanalyze)
+    - 현재 버전이 아닌 결과를 (이전 버전, 소스, 라벨) 층으로 나눔
+    - 층마다 일부를 표본 재분석해 필드별 일치율 측정 -> 불일치율이 max_disagreement를 넘는 층만 전체 재분석
+    - 새 버전에서 사라진 problem_type 층은 표본 없이 전체 재분석
+    - 층별 판정은 data/state/reanalysis.json에 저장 (예산 초과로 중단돼도 다음 실행에서 이어서 진행)
+    - 유지 판정 층의 결과는 이전 버전 기록을 그대로 둠 (파일 재기록 없음)
+    """
+
+    def __init__(self, data_dir: str, analyzer: Any, governor: Any, config: Dict[str, Any], abort_after_failures: int = 5):
+        self.analyzed_dir = os.path.join(data_dir, "analyzed")
+        self.state_path = os.path.join(data_dir, "state", "reanalysis.json")
+        self.analyzer = analyzer
+        self.governor = governor
+        self.config = config
+        self.abort_after_failures = abort_after_failures
+        self.version = analyzer.version
+        self.target = version_key(self.version)
+        self.strata: Dict[str, Dict[str, Any]] = {}
+        self.touched = set()  # 결과가 바뀐 파티션 (집계 캐시 무효화 대상)
+        self.consecutive_failures = 0
+        self.done = set()  # 이번 실행에서 재분석한 id (표본 포함)
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # 목표 버전이 바뀌면 이전 판정은 무효
+            if data.get("target") == self.target:
+                self.strata = data.get("strata", {})
+
+    def _scan(self) -> Tuple[Dict[str, List[_StaleItem]], int]:
+        """현재 버전이 아니고 유지 판정도 받지 않은 항목을 층별로 묶음"""
+        groups: Dict[str, List[_StaleItem]] = {}
+        current = 0
+        for root, _, names in os.walk(self.analyzed_dir):
+            for name in sorted(names):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "rb") as f:
+                        item = AnalyzedReview.from_dict(loads(f.read()))
+                except Exception as e:
+                    logger.error(f"Error loading {name}: {e}")
+                    continue
+                if item.version_key == self.target:
+                    current += 1
+                    continue
+                key = f"{item.version_key}|{stratum_of(item)}"
+                if self.strata.get(key, {}).get("decision") == "keep":
+                    continue
+                groups.setdefault(key, []).append(_StaleItem(path, item))
+        return groups, current
+
+    def _sample_size(self, count: int) -> int:
+        size = max(self.config["min_sample"], math.ceil(count * self.config["sample_rate"]))
+        return min(count, size, self.config["max_sample"])
+
+    def _reanalyze(self, stale: _StaleItem) -> Optional[Tuple[AnalyzedReview, AnalyzedReview]]:
+        """항목 1개를 현재 버전으로 재분석해 저장 -> (이전 결과, 새 결과), 실패 시 None"""
+        with open(stale.path, "rb") as f:
+            old = AnalyzedReview.from_dict(loads(f.read()))
+
+        prompt = self.analyzer.build_prompt(old)
+        estimated = self.governor.estimate(prompt)
+        if not self.governor.can_afford(estimated):
+            raise BudgetExhausted()
+        result = self.analyzer.analyze(old, prompt)
+        self.governor.record(self.analyzer.last_usage, estimated)
+
+        analysis = None
+        if result is not None:
+            try:
+                analysis = Analysis.from_dict(result)
+            except RecordValidationError as e:
+                print(f"    Invalid analysis for {old.id}: {e}")
+        if analysis is None:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.abort_after_failures:
+                raise RuntimeError(f"{self.consecutive_failures} consecutive analysis failures")
+            return None
+        self.consecutive_failures = 0
+
+        condensation = self.analyzer.last_condensation
+        new = AnalyzedReview.from_dict(old.to_dict())
+        new.analysis = analysis
+        new.analyzed_at = datetime.now().isoformat()
+        new.condensation = condensation if condensation and condensation["compression_ratio"] < 1.0 else None
+        new.analysis_version = self.version
+
+        path = analyzed_path(self.analyzed_dir, new.source_type, new.created_at, new.id)
+        write_output(path, new.to_dict())
+        if os.path.abspath(path) != os.path.abspath(stale.path):
+            os.remove(stale.path)  # 파티션 도입 이전 경로의 결과는 파티션 경로로 옮김
+        self.touched.add(partition_key(new.source_type, new.created_at))
+        self.done.add(new.id)
+        return old, new
+
+    def _decide(self, key: str, items: List[_StaleItem]) -> Optional[Dict[str, Any]]:
+        """층 표본 재분석 후 유지/전체 재분석 판정 (비교 가능한 표본이 없으면 None)"""
+        _, _, stratum = key.partition("|")
+        label = stratum.split("/", 1)[1]
+        if label not in ("positive", "neutral", "negative") and label not in self.analyzer.problem_types:
+            return {"items": len(items), "sampled": 0, "decision": "rerun", "reason": "category_removed"}
+
+        sample = sorted(items, key=lambda s: _sample_order(s.id))[:self._sample_size(len(items))]
+        fields = self.config["fields"]
+        matches = {field: 0 for field in fields}
+        compared = 0
+        for stale in sample:
+            pair = self._reanalyze(stale)
+            if pair is None:
+                continue
+            old, new = pair
+            compared += 1
+            for field in fields:
+                matches[field] += getattr(old.analysis, field) == getattr(new.analysis, field)
+        if not compared:
+            return None
+
+        agreement = {field: round(matches[field] / compared, 4) for field in fields}
+        worst = min(agreement, key=agreement.get)
+        rerun = 1 - agreement[worst] > self.config["max_disagreement"]
+        return {
+            "items": len(items),
+            "sampled": len(sample),
+            "compared": compared,
+            "agreement": agreement,
+            "decision": "rerun" if rerun else "keep",
+            "reason": f"{worst} disagreement {1 - agreement[worst]:.0%}"
+        }
+
+    def save(self) -> None:
+        write_output(self.state_path, {
+            "target": self.target,
+            "version": self.version,
+            "updated_at": datetime.now().isoformat(),
+            "strata": self.strata
+        })
+
+    def run(self) -> Dict[str, Any]:
+        groups, current = self._scan()
+        stale_total = sum(len(items) for items in groups.values())
+        print(f"    Target version {self.target}: {current} current, {stale_total} stale items in {len(groups)} strata.")
+
+        try:
+            # 1. 판정 없는 층: 표본 재분석 + 일치율 측정
+            for key in sorted(groups):
+                if key in self.strata:
+                    continue
+                decision = self._decide(key, groups[key])
+                if decision is None:
+                    continue
+                self.strata[key] = decision
+                self.save()
+                print(f"    {key}: {decision['decision']} ({decision['reason']}, {decision['sampled']}/{decision['items']} sampled)")
+
+            # 2. 재분석 판정 층의 남은 항목 (링글 > 경쟁사, 최신순)
+            remaining = []
+            for key, items in groups.items():
+                if self.strata.get(key, {}).get("decision") == "rerun":
+                    remaining.extend((item, key) for item in items if item.id not in self.done)
+            print(f"    {len(remaining)} items queued for full re-analysis.")
+            for item, _ in prioritize(remaining, lambda item: item.is_target):
+                self._reanalyze(item)
+        except BudgetExhausted:
+            print("    Budget limit reached. Remaining re-analysis resumes on the next run.")
+        except RuntimeError as e:
+            print(f"    Aborting re-analysis: {e}. Remaining items resume on the next run.")
+        finally:
+            self.save()
+            self.governor.save()
+
+        kept = sum(s["items"] - s["sampled"] for s in self.strata.values() if s["decision"] == "keep")
+        summary = {"stale": stale_total, "reanalyzed": len(self.done), "kept": kept, "partitions": sorted(self.touched)}
+        if stale_total:
+            print(f"    Re-analyzed {len(self.done)} of {stale_total} stale items ({len(self.done) / stale_total:.0%}), "
+                  f"kept {kept} items from agreeing strata.")
+        return summary
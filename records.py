@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+from typing import List, Dict, Any, Optional, Tuple
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+class RecordValidationError(ValueError):
+    """RAW_SCHEMA / ANALYZED_SCHEMA 형식에 맞지 않는 레코드"""
+
+
+def dumps(data: Any, indent: int = None, sort_keys: bool = False) -> bytes:
+    """
+    JSON 인코딩 (UTF-8 bytes)
+    - orjson 설치 시 orjson 사용, 없으면 표준 json
+    - 기본은 공백 없는 compact 출력, indent 지정 시 2칸 들여쓰기
+    - sort_keys: 키 정렬 (같은 데이터는 항상 같은 바이트)
+    - 레코드 객체는 to_dict()로 변환
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_default, option=option)
+    separators = None if indent else (",", ":")
+    return json.dumps(data, ensure_ascii=False, indent=indent, separators=separators, sort_keys=sort_keys,
+                      default=_default).encode("utf-8")
+
+def loads(data: Any) -> Any:
+    """JSON 디코딩 (bytes 또는 str)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # 소스/감성/문제유형처럼 값 종류가 적은 필드는 같은 문자열 객체를 공유
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _require_str(data: Dict[str, Any], key: str, nullable: bool = False) -> Optional[str]:
+    value = data.get(key)
+    if value is None and nullable:
+        return None
+    if not isinstance(value, str):
+        raise RecordValidationError(f"'{key}' must be a string, got {type(value).__name__}")
+    return value
+
+def _optional_rating(data: Dict[str, Any]) -> Optional[float]:
+    rating = data.get("rating")
+    if rating is not None and (isinstance(rating, bool) or not isinstance(rating, (int, float))):
+        raise RecordValidationError(f"'rating' must be a number or null, got {type(rating).__name__}")
+    return rating
+
+def _str_tuple(data: Dict[str, Any], key: str) -> Tuple[str, ...]:
+    values = data.get(key) or ()
+    if not isinstance(values, (list, tuple)) or not all(isinstance(v, str) for v in values):
+        raise RecordValidationError(f"'{key}' must be a list of strings")
+    return tuple(values)
+
+
+class Analysis:
+    """Claude 분석 결과 (ANALYZED_SCHEMA.analysis)"""
+
+    __slots__ = ("sentiment", "problem_type", "key_phrases", "churn_signal", "churn_keywords", "competitor_mentions")
+
+    def __init__(self, sentiment: str = "neutral", problem_type: str = None, key_phrases: Tuple[str, ...] = (),
+                 churn_signal: bool = False, churn_keywords: Tuple[str, ...] = (), competitor_mentions: Tuple[str, ...] = ()):
+        self.sentiment = _intern(sentiment)
+        self.problem_type = _intern(problem_type)
+        self.key_phrases = key_phrases
+        self.churn_signal = churn_signal
+        self.churn_keywords = churn_keywords
+        self.competitor_mentions = competitor_mentions
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "Analysis":
+        if data is None:
+            return cls()
+        if not isinstance(data, dict):
+            raise RecordValidationError("'analysis' must be an object")
+
+        sentiment = data.get("sentiment") or "neutral"
+        if not isinstance(sentiment, str) or sentiment.lower() not in SENTIMENTS:
+            raise RecordValidationError(f"Invalid sentiment: {sentiment!r}")
+        return cls(
+            sentiment=sentiment.lower(),
+            problem_type=_require_str(data, "problem_type", nullable=True) or None,
+            key_phrases=_str_tuple(data, "key_phrases"),
+            churn_signal=bool(data.get("churn_signal")),
+            churn_keywords=_str_tuple(data, "churn_keywords"),
+            competitor_mentions=_str_tuple(data, "competitor_mentions")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sentiment": self.sentiment,
+            "problem_type": self.problem_type,
+            "key_phrases": list(self.key_phrases),
+            "churn_signal": self.churn_signal,
+            "churn_keywords": list(self.churn_keywords),
+            "competitor_mentions": list(self.competitor_mentions)
+        }
+
+
+class RawReview:
+    """수집 직후 리뷰 (RAW_SCHEMA)"""
+
+    __slots__ = ("id", "source_type", "source_name", "app_key", "source_url", "external_id",
+                 "author", "rating", "text", "created_at", "collected_at", "metadata")
+
+    def __init__(self, id: str, source_type: str, source_name: str = None, app_key: str = None, source_url: str = None,
+                 external_id: str = None, author: str = None, rating: float = None, text: str = None,
+                 created_at: str = None, collected_at: str = None, metadata: Dict[str, Any] = None):
+        self.id = id
+        self.source_type = _intern(source_type)
+        self.source_name = _intern(source_name)
+        self.app_key = _intern(app_key)
+        self.source_url = source_url
+        self.external_id = external_id
+        self.author = author
+        self.rating = rating
+        self.text = text
+        self.created_at = created_at
+        self.collected_at = collected_at
+        self.metadata = metadata or None  # 빈 metadata는 객체를 만들지 않음
+
+    @property
+    def dedup_key(self) -> Optional[str]:
+        """RawStore 중복 제거 키 (source type + external_id)"""
+        if not self.external_id:
+            return None
+        return f"{self.source_type}:{self.external_id}"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RawReview":
+        if not isinstance(data, dict):
+            raise RecordValidationError("Raw item must be an object")
+        source = data.get("source") or {}
+        if not isinstance(source, dict):
+            raise RecordValidationError("'source' must be an object")
+        metadata = data.get("metadata")
+        if metadata is not None and not isinstance(metadata, dict):
+            raise RecordValidationError("'metadata' must be an object")
+        external_id = data.get("external_id")
+        return cls(
+            id=_require_str(data, "id"),
+            source_type=source.get("type") or "unknown",
+            source_name=source.get("name"),
+            app_key=source.get("app_key"),
+            source_url=source.get("url"),
+            external_id=str(external_id) if external_id is not None else None,
+            author=data.get("author"),
+            rating=_optional_rating(data),
+            text=_require_str(data, "text", nullable=True),
+            created_at=_require_str(data, "created_at", nullable=True),
+            collected_at=_require_str(data, "collected_at", nullable=True),
+            metadata=metadata
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        source = {"type": self.source_type, "name": self.source_name}
+        if self.app_key is not None:
+            source["app_key"] = self.app_key
+        if self.source_url is not None:
+            source["url"] = self.source_url
+        return {
+            "id": self.id,
+            "source": source,
+            "external_id": self.external_id,
+            "author": self.author,
+            "rating": self.rating,
+            "text": self.text,
+            "created_at": self.created_at,
+            "collected_at": self.collected_at,
+            "metadata": self.metadata or {}
+        }
+
+
+class AnalyzedReview:
+    """분석 완료 리뷰 (ANALYZED_SCHEMA), 집계 단계 입력"""
+
+    __slots__ = ("id", "raw_id", "source_type", "source_name", "is_target", "text", "rating", "author",
+                 "created_at", "metadata", "analysis", "analyzed_at", "condensation", "analysis_version")
+
+    def __init__(self, id: str, source_type: str, analysis: Analysis, raw_id: str = None, source_name: str = None,
+                 is_target: bool = False, text: str = None, rating: float = None, author: str = None,
+                 created_at: str = None, metadata: Dict[str, Any] = None, analyzed_at: str = None,
+                 condensation: Dict[str, Any] = None, analysis_version: Dict[str, str] = None):
+        self.id = id
+        self.raw_id = raw_id or id
+        self.source_type = _intern(source_type)
+        self.source_name = _intern(source_name)
+        self.is_target = is_target
+        self.text = text
+        self.rating = rating
+        self.author = author
+        self.created_at = created_at
+        self.metadata = metadata or None
+        self.analysis = analysis
+        self.analyzed_at = analyzed_at
+        self.condensation = condensation
+        self.analysis_version = analysis_version  # {"model", "prompt"}, 버전 기록 이전 결과는 None
+
+    @property
+    def version_key(self) -> str:
+        """분석 버전 식별자 (<model>@<prompt 해시>)"""
+        return version_key(self.analysis_version)
+
+    @property
+    def date(self) -> Optional[str]:
+        """created_at의 날짜 부분 (YYYY-MM-DD)"""
+        return self.created_at.split("T")[0] if self.created_at else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalyzedReview":
+        if not isinstance(data, dict):
+            raise RecordValidationError("Analyzed item must be an object")
+        is_target = data.get("is_target", False)
+        if not isinstance(is_target, bool):
+            raise RecordValidationError("'is_target' must be a boolean")
+        metadata = data.get("metadata")
+        if metadata is not None and not isinstance(metadata, dict):
+            raise RecordValidationError("'metadata' must be an object")
+        return cls(
+            id=_require_str(data, "id"),
+            raw_id=data.get("raw_id"),
+            source_type=data.get("source_type") or "unknown",
+            source_name=data.get("source_name") or "unknown",
+            is_target=is_target,
+            text=_require_str(data, "text", nullable=True),
+            rating=_optional_rating(data),
+            author=data.get("author"),
+            created_at=_require_str(data, "created_at", nullable=True),
+            metadata=metadata,
+            analysis=Analysis.from_dict(data.get("analysis")),
+            analyzed_at=data.get("analyzed_at"),
+            condensation=data.get("condensation"),
+            analysis_version=data.get("analysis_version")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "raw_id": self.raw_id,
+            "source_type": self.source_type,
+            "source_name": self.source_name,
+            "is_target": self.is_target,
+            "text": self.text,
+            "rating": self.rating,
+            "author": self.author,
+            "created_at": self.created_at,
+            "metadata": self.metadata or {},
+            "analysis": self.analysis.to_dict(),
+            "analyzed_at": self.analyzed_at
+        }
+        if self.condensation:
+            data["condensation"] = self.condensation
+        if self.analysis_version:
+            data["analysis_version"] = self.analysis_version
+        return data
+
+
+def version_key(version: Optional[Dict[str, str]]) -> str:
+    if not version:
+        return "unversioned"
+    return f"{version.get('model')}@{version.get('prompt')}"
+
+def partition_key(source_type: str, created_at: Optional[str]) -> str:
+    """분석 결과 파티션 (<source_type>/<YYYY-MM>), 집계 map 단계의 작업 단위"""
+    month = created_at[:7] if created_at and len(created_at) >= 7 else "unknown"
+    return f"{source_type or 'unknown'}/{month}"
+
+def analyzed_path(analyzed_dir: str, source_type: str, created_at: Optional[str], item_id: str) -> str:
+    """분석 결과 파일 경로: analyzed/<source_type>/<YYYY-MM>/<id>.json"""
+    return os.path.join(analyzed_dir, *partition_key(source_type, created_at).split("/"), f"{item_id}.json")
+
+
+def load_records(data: Any, record_type: type) -> List[Any]:
+    """디코딩된 JSON(단일 객체 또는 목록)을 검증된 레코드 목록으로 변환"""
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise RecordValidationError("Expected an object or a list of objects")
+    return [record_type.from_dict(item) for item in data]
@@ -0,0 +1,45 @@
+import importlib
+from typing import List, Dict, Tuple, Any, Iterable
+
+# 소스 이름 -> (모듈, 클래스), 실행 순서는 등록 순서
+COLLECTORS: Dict[str, Tuple[str, str]] = {
+    "playstore": ("playstore", "PlayStoreCollector"),
+    "appstore": ("appstore", "AppStoreCollector"),
+    "youtube": ("youtube", "YouTubeCollector"),
+    "naver_blog": ("naver_blog", "NaverBlogCollector"),
+    "brunch": ("brunch", "BrunchCollector")
+}
+
+def available_sources() -> List[str]:
+    return list(COLLECTORS)
+
+def _import(module_name: str):
+    # 패키지로 실행 시 상대 경로, 스크립트로 실행 시 최상위 모듈
+    if __package__:
+        return importlib.import_module(f".{module_name}", __package__)
+    return importlib.import_module(module_name)
+
+def load_collector_class(source: str) -> Any:
+    """
+    수집기 클래스를 필요한 시점에 임포트
+    - 스크래퍼/API 클라이언트 패키지는 해당 소스를 실행할 때만 로드되므로
+      aggregate/analyze 모드는 수집 의존성 없이 바로 시작
+    """
+    if source not in COLLECTORS:
+        raise KeyError(f"Unknown source '{source}'. Available: {', '.join(COLLECTORS)}")
+    module_name, class_name = COLLECTORS[source]
+    return getattr(_import(module_name), class_name)
+
+def create_collector(source: str, **kwargs) -> Any:
+    return load_collector_class(source)(**kwargs)
+
+def parse_sources(value: str, allowed: Iterable[str] = None) -> List[str]:
+    """'playstore,appstore' 형식의 소스 목록 검증 (allowed 순서 유지)"""
+    allowed = list(allowed or COLLECTORS)
+    if not value:
+        return allowed
+    selected = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)}. Available: {', '.join(allowed)}")
+    return [name for name in allowed if name in selected]
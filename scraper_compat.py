@@ -0,0 +1,96 @@
+import inspect
+import logging
+from typing import List, Dict, Any, Optional
+
+try:
+    from importlib.metadata import version, PackageNotFoundError
+except ImportError:  # Python < 3.8
+    version = None
+    PackageNotFoundError = Exception
+
+logger = logging.getLogger(__name__)
+
+# 백필 페이지 이어받기는 스크레이퍼 라이브러리의 공개 API 밖(내부 토큰/offset)에 의존하므로
+# 검증한 버전 범위를 명시하고, 그 밖의 버전은 필요한 내부 속성이 있는지 확인 후에만 사용
+TESTED_VERSIONS = {
+    "google-play-scraper": ("1.2.",),
+    "app-store-scraper": ("0.3.",)
+}
+
+class ScraperCompatError(RuntimeError):
+    """스크레이퍼 라이브러리 내부 구조가 백필 어댑터가 기대하는 형태와 다름"""
+
+
+_checked: Dict[str, bool] = {}
+
+def _check_version(package: str, usable: bool, detail: str) -> None:
+    """
+    버전 확인 (패키지당 1회)
+    - 검증한 버전이 아니고 내부 속성도 맞지 않으면 ScraperCompatError (조용히 잘못된 페이지를 받지 않도록)
+    - 검증하지 않은 버전이지만 속성이 맞으면 경고만 남기고 진행
+    """
+    try:
+        installed = version(package) if version else "unknown"
+    except PackageNotFoundError:
+        installed = "unknown"
+    tested = installed.startswith(TESTED_VERSIONS[package])
+    if not usable:
+        raise ScraperCompatError(f"{package} {installed} is not supported for backfill ({detail}). "
+                                 f"Tested versions: {', '.join(v + 'x' for v in TESTED_VERSIONS[package])}")
+    if not tested and not _checked.get(package):
+        logger.warning(f"{package} {installed} has not been tested with backfill paging. "
+                       f"Tested versions: {', '.join(v + 'x' for v in TESTED_VERSIONS[package])}")
+    _checked[package] = True
+
+
+# --- Google Play (google-play-scraper) ---
+
+def playstore_token(cursor: str, lang: str, country: str, sort: int, count: int) -> Any:
+    """체크포인트에 저장한 continuation token 문자열 -> 라이브러리 토큰 객체"""
+    try:
+        from google_play_scraper.features.reviews import _ContinuationToken
+    except ImportError as e:
+        _check_version("google-play-scraper", False, f"continuation token class not found: {e}")
+    params = list(inspect.signature(_ContinuationToken).parameters)
+    _check_version("google-play-scraper", params[:5] == ["token", "lang", "country", "sort", "count"],
+                   f"unexpected continuation token fields {params}")
+    # 나머지 필드(점수/기기 필터)는 사용하지 않음
+    return _ContinuationToken(cursor, lang, country, sort, count, *([None] * (len(params) - 5)))
+
+def playstore_cursor(token: Any) -> Optional[str]:
+    """라이브러리 토큰 객체 -> 체크포인트에 저장할 문자열 (마지막 페이지면 None)"""
+    if token is None:
+        return None
+    _check_version("google-play-scraper", hasattr(token, "token"), "continuation token has no 'token' field")
+    return token.token
+
+
+# --- App Store (app-store-scraper) ---
+
+class AppStorePager:
+    """
+    AppStore 스크레이퍼의 offset 페이지 단위 조회
+    - 라이브러리는 how_many만큼 누적 조회하는 공개 API만 제공하므로 내부 offset/누적 상태를 이 클래스에서만 다룸
+    """
+
+    _ATTRS = ("_request_offset", "_request_params", "_fetched_count", "reviews")
+
+    def __init__(self, scraper: Any, offset: Optional[int] = None):
+        missing = [name for name in self._ATTRS if not hasattr(scraper, name)]
+        _check_version("app-store-scraper", not missing, f"missing attributes {missing}")
+        self.scraper = scraper
+        if offset:
+            scraper._request_offset = offset
+            scraper._request_params.update({"offset": offset})
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        """다음 페이지 offset (마지막 페이지 이후 None)"""
+        return self.scraper._request_offset
+
+    def fetch(self, page_size: int) -> List[Dict[str, Any]]:
+        """현재 offset부터 page_size건 조회 (이전 페이지 결과는 버림)"""
+        self.scraper.reviews = []
+        self.scraper._fetched_count = 0
+        self.scraper.review(how_many=page_size)
+        return self.scraper.reviews
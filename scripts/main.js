@@ -10,6 +10,7 @@ let sentimentChart = null;
 // 데이터 경로 설정 (GitHub Pages 배포 기준)
 const DATA_BASE_URL = 'data/aggregated';
 const MOCK_DATA_MODE = false; // 데이터 파일이 없을 때 mock data 사용 여부
+const TREND_RANGE_DAYS = 90; // 트렌드 차트 표시 기간 (manifest.json에서 이 기간의 월 파티션만 로드)
 
 // 기본 데이터 (데이터 로드 실패 시 또는 초기화용)
 const reviewData = [
@@ -151,10 +152,8 @@ async function loadDashboardData() {
         updateSentimentChart(stats);
         renderWordCloud(stats);
 
-        // 2. 트렌드 데이터 로드 (trends.json)
-        const trendsResponse = await fetch(`${DATA_BASE_URL}/trends.json`);
-        if (!trendsResponse.ok) throw new Error('Trends data not found');
-        const trends = await trendsResponse.json();
+        // 2. 트렌드 데이터 로드 (manifest.json + 월별 파티션, 없으면 trends.json)
+        const trends = await loadTrends(TREND_RANGE_DAYS);
         updateTrendChartUI(trends);
 
         // 3. 이슈 데이터 로드 (top-issues.json)
@@ -189,7 +188,13 @@ function updateKPIs(stats) {
         // 평균 평점
         statValues[0].textContent = stats.ringle.average_rating || '-';
         // 총 리뷰 수
-        if (statValues[1]) statValues[1].textContent = stats.ringle.total || '-';
+        if (statValues[1]) {
+            statValues[1].textContent = stats.ringle.total || '-';
+            // 고유 작성자 수 (HyperLogLog 추정치)
+            if (stats.ringle.unique_authors) {
+                statValues[1].title = `작성자 약 ${stats.ringle.unique_authors.toLocaleString()}명`;
+            }
+        }
     }
     
     // 추가 KPI가 있다면 여기서 매핑
@@ -246,6 +251,74 @@ function updateChurnAlerts(data) {
     `).join('');
 }
 
+/**
+ * 트렌드 데이터 로드
+ * manifest.json에서 최근 rangeDays일과 겹치는 월 파티션만 받아 trends.json과 같은 { daily: [...] } 형태로 변환
+ * @param {number} rangeDays - 표시할 기간 (일)
+ */
+async function loadTrends(rangeDays) {
+    const manifestResponse = await fetch(`${DATA_BASE_URL}/manifest.json`, { cache: 'no-cache' });
+    if (!manifestResponse.ok) {
+        const trendsResponse = await fetch(`${DATA_BASE_URL}/trends.json`);
+        if (!trendsResponse.ok) throw new Error('Trends data not found');
+        return trendsResponse.json();
+    }
+
+    const manifest = await manifestResponse.json();
+    const partitions = manifest.trends?.partitions || [];
+    if (partitions.length === 0) return { daily: [] };
+
+    const end = new Date(manifest.trends.end);
+    end.setDate(end.getDate() - rangeDays + 1);
+    const start = end.toISOString().slice(0, 10);
+    const visible = partitions.filter(p => p.end >= start);
+
+    const parts = await Promise.all(visible.map(fetchTrendPartition));
+    const daily = parts.flatMap(columnsToDaily).filter(d => d.date >= start);
+    return { updated_at: manifest.updated_at, daily };
+}
+
+/**
+ * 월 파티션 1개 로드 (해시를 쿼리로 붙여 내용이 바뀐 파티션만 새로 받음)
+ * 브라우저가 DecompressionStream을 지원하면 사전 압축된 .gz 파일을 받아 직접 해제
+ */
+async function fetchTrendPartition(partition) {
+    const url = `${DATA_BASE_URL}/${partition.file}`;
+    if (typeof DecompressionStream !== 'undefined' && partition.encodings?.includes('gz')) {
+        const response = await fetch(`${url}.gz?v=${partition.hash}`);
+        if (response.ok) {
+            const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+            return new Response(stream).json();
+        }
+    }
+    const response = await fetch(`${url}?v=${partition.hash}`);
+    if (!response.ok) throw new Error(`Trend partition not found: ${partition.file}`);
+    return response.json();
+}
+
+/**
+ * 열 지향 파티션을 일별 객체 배열로 변환
+ */
+function columnsToDaily(part) {
+    const { date, ringle, competitors } = part.columns;
+    return date.map((d, i) => ({
+        date: d,
+        ringle: {
+            count: ringle.count[i],
+            sentiment: { positive: ringle.positive[i], neutral: ringle.neutral[i], negative: ringle.negative[i] },
+            churn_signals: ringle.churn_signals[i],
+            avg_rating: ringle.avg_rating[i],
+            unique_authors: ringle.unique_authors[i]
+        },
+        // 리뷰가 없는 날의 경쟁사 항목은 trends.json처럼 생략
+        competitors: Object.fromEntries(Object.entries(competitors).filter(([, c]) => c.count[i] > 0).map(([name, c]) => [name, {
+            count: c.count[i],
+            sentiment: { positive: c.positive[i], neutral: c.neutral[i], negative: c.negative[i] },
+            avg_rating: c.avg_rating[i]
+        }]))
+    }));
+}
+
 /**
  * 트렌드 차트 UI 업데이트
  * @param {Object} trends - trends.json 데이터
@@ -0,0 +1,187 @@
+import os
+import re
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Tuple
+
+try:
+    from .fileio import OutputSidecar, atomic_write_json, write_output
+    from .records import AnalyzedReview, loads
+except ImportError:
+    from fileio import OutputSidecar, atomic_write_json, write_output
+    from records import AnalyzedReview, loads
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = "search-v2"
+FACETS = ("source", "sentiment", "problem_type", "half", "churn")
+
+_HANGUL_RUN = re.compile(r"[가-힣]+")
+_LATIN_TOKEN = re.compile(r"[a-z0-9]{2,}")
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색 토큰 (filters.js의 tokenize와 같은 규칙)
+    - 한글: 연속 구간의 문자 bigram (1글자 구간은 그대로)
+    - 영문/숫자: 소문자 2자 이상 토큰
+    """
+    text = (text or "").lower()
+    terms = []
+    for run in _HANGUL_RUN.findall(text):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    terms.extend(_LATIN_TOKEN.findall(text))
+    return terms
+
+def term_shard(term: str, shards: int) -> int:
+    """FNV-1a 32bit (UTF-8) 해시로 용어 샤드 결정 (filters.js termShard와 동일)"""
+    h = 0x811C9DC5
+    for byte in term.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h % shards
+
+def delta_encode(ids: Iterable[int]) -> List[int]:
+    """정렬된 문서 번호 -> 첫 값 + 간격 목록"""
+    encoded, prev = [], 0
+    for doc_id in ids:
+        encoded.append(doc_id - prev)
+        prev = doc_id
+    return encoded
+
+def delta_decode(gaps: Iterable[int]) -> List[int]:
+    ids, total = [], 0
+    for gap in gaps:
+        total += gap
+        ids.append(total)
+    return ids
+
+def _half(created_at: str) -> str:
+    if not created_at or len(created_at) < 7:
+        return "unknown"
+    return f"{created_at[:4]}-{'h1' if created_at[5:7] <= '06' else 'h2'}"
+
+def _doc(item: AnalyzedReview, snippet_chars: int) -> Dict[str, Any]:
+    analysis = item.analysis
+    return {
+        "id": item.id,
+        "created_at": item.created_at or "",
+        "source": item.source_type,
+        "sentiment": analysis.sentiment,
+        "problem_type": analysis.problem_type or "",
+        "half": _half(item.created_at),
+        "churn": "true" if analysis.churn_signal else "false",
+        "rating": item.rating,
+        "text": (item.text or "")[:snippet_chars],
+        # 용어는 전체 텍스트 기준 (표시용 snippet보다 길 수 있음)
+        "terms": sorted(set(tokenize(item.text)))
+    }
+
+
+class SearchIndexBuilder:
+    """
+    explore 페이지용 검색 인덱스 (data/aggregated/search/)
+    - meta.json: 문서 수, 샤드 수, 패싯 값별 건수
+    - facets.json: 패싯(소스/감성/문제유형/반기/이탈) 값 -> 간격 인코딩 posting list
+    - terms/<nn>.json: 용어 해시 샤드별 용어 -> 간격 인코딩 posting list (검색어가 속한 샤드만 로드)
+    - docs/<n>.json: 문서 번호 구간별 표시용 행 (결과 화면에 보이는 구간만 로드)
+    - 문서 번호는 (created_at, id) 오름차순 -> 새 리뷰가 뒤에 추가되어 커밋되는 샤드 변경이 실제 변경분에 비례
+      (explore 페이지는 posting list를 뒤에서부터 읽어 최신순 표시)
+    - 파티션별 문서 행/용어는 data/state/search/에 캐시 (변경된 파티션만 다시 읽음)
+    - 샤드/메타 파일은 내용이 바뀐 경우에만 재기록 (search/updated.json에 해시 기록)
+    """
+
+    def __init__(self, aggregated_dir: str, cache_dir: str, config: Dict[str, Any]):
+        self.index_dir = os.path.join(aggregated_dir, "search")
+        self.cache_dir = cache_dir
+        self.config = config
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key.replace("/", "__") + ".json")
+
+    def _partition_docs(self, key: str, paths: List[str], signature: str) -> List[Dict[str, Any]]:
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    cached = loads(f.read())
+                if cached.get("signature") == signature and cached.get("format") == INDEX_FORMAT:
+                    return cached["docs"]
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable search cache for {key}: {e}")
+
+        docs = []
+        for file_path in paths:
+            try:
+                with open(file_path, "rb") as f:
+                    item = AnalyzedReview.from_dict(loads(f.read()))
+            except Exception as e:
+                logger.error(f"Error loading {os.path.basename(file_path)}: {e}")
+                continue
+            if item.is_target:
+                docs.append(_doc(item, self.config["snippet_chars"]))
+        atomic_write_json(path, {"format": INDEX_FORMAT, "signature": signature, "docs": docs})
+        return docs
+
+    def build(self, partitions: Dict[str, List[str]], signatures: Dict[str, str]) -> Dict[str, Any]:
+        docs = []
+        for key in sorted(partitions):
+            docs.extend(self._partition_docs(key, partitions[key], signatures[key]))
+        # 오래된 순 문서 번호 (동률은 id순) -> 새 리뷰는 끝 번호로 붙어 마지막 문서 샤드/해당 posting만 바뀜
+        docs.sort(key=lambda d: (d["created_at"], d["id"]))
+
+        term_shards = self.config["term_shards"]
+        doc_shard_size = self.config["doc_shard_size"]
+        postings: List[Dict[str, List[int]]] = [{} for _ in range(term_shards)]
+        facets: Dict[str, Dict[str, List[int]]] = {name: {} for name in FACETS}
+        for doc_id, doc in enumerate(docs):
+            for term in doc["terms"]:
+                postings[term_shard(term, term_shards)].setdefault(term, []).append(doc_id)
+            for name in FACETS:
+                facets[name].setdefault(doc[name], []).append(doc_id)
+
+        sidecar = OutputSidecar(self.index_dir)
+        written = set()
+        changed = False
+        for shard, terms in enumerate(postings):
+            rel = f"terms/{shard:02d}.json"
+            changed |= write_output(os.path.join(self.index_dir, *rel.split("/")),
+                                    {term: delta_encode(ids) for term, ids in sorted(terms.items())}, sidecar=sidecar)
+            written.add(rel)
+
+        columns = ("id", "created_at", "source", "sentiment", "problem_type", "churn", "rating", "text")
+        for start in range(0, len(docs), doc_shard_size):
+            rel = f"docs/{start // doc_shard_size}.json"
+            rows = [[doc[c] for c in columns] for doc in docs[start:start + doc_shard_size]]
+            changed |= write_output(os.path.join(self.index_dir, *rel.split("/")), {"columns": columns, "rows": rows},
+                                    sidecar=sidecar)
+            written.add(rel)
+
+        changed |= write_output(os.path.join(self.index_dir, "facets.json"), {
+            name: {value: delta_encode(ids) for value, ids in sorted(values.items())}
+            for name, values in facets.items()
+        }, sidecar=sidecar)
+
+        # 문서 수가 줄어 남은 이전 샤드 정리
+        for sub in ("terms", "docs"):
+            directory = os.path.join(self.index_dir, sub)
+            for name in os.listdir(directory) if os.path.exists(directory) else []:
+                if f"{sub}/{name}" not in written:
+                    os.remove(os.path.join(directory, name))
+                    sidecar.forget(os.path.join(directory, name))
+                    changed = True
+
+        meta = {
+            "format": INDEX_FORMAT,
+            "updated_at": datetime.now().isoformat(),
+            "docs": len(docs),
+            "doc_shard_size": doc_shard_size,
+            "term_shards": term_shards,
+            "facets": {name: {value: len(ids) for value, ids in sorted(values.items())} for name, values in facets.items()}
+        }
+        # updated_at은 explore 페이지의 샤드 캐시 키 -> 샤드가 바뀐 경우에는 함께 갱신
+        write_output(os.path.join(self.index_dir, "meta.json"), meta, sidecar=sidecar, force=changed)
+        sidecar.save()
+        logger.info(f"Search index: {len(docs)} docs, {sum(len(t) for t in postings)} terms")
+        return meta
@@ -0,0 +1,338 @@
+import os
+import bisect
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    from .records import AnalyzedReview, dumps, loads
+    from .search_index import tokenize
+    from .config import SERVER_CONFIG
+except ImportError:
+    from records import AnalyzedReview, dumps, loads
+    from search_index import tokenize
+    from config import SERVER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 쿼리 파라미터 -> 인덱스 필드
+FILTER_FIELDS = {
+    "source": "source_type",
+    "source_name": "source_name",
+    "sentiment": "sentiment",
+    "problem_type": "problem_type",
+    "target": "is_target",
+    "churn": "churn_signal"
+}
+GROUP_FIELDS = ("date", "month", "source", "source_name", "sentiment", "problem_type")
+
+class QueryError(ValueError):
+    """잘못된 API 쿼리 파라미터 (400 응답)"""
+
+
+def _field_value(item: AnalyzedReview, field: str) -> str:
+    if field in ("sentiment", "problem_type", "churn_signal"):
+        value = getattr(item.analysis, field)
+    else:
+        value = getattr(item, field)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value or ""
+
+
+class ReviewStore:
+    """
+    분석 결과 메모리 인덱스 (읽기 전용 API용)
+    - 파티션(analyzed/<source>/<YYYY-MM>) 단위로 로드, 디렉토리 mtime이 바뀐 파티션만 다시 읽음
+    - created_at 정렬 배열 + 날짜 bisect로 기간 조회
+    - 필드 값별 posting set, 검색어는 search_index.tokenize 토큰 역색인 후 부분 문자열 확인
+    - generation은 데이터가 바뀔 때마다 증가 (응답 캐시/ETag 무효화 기준)
+    """
+
+    def __init__(self, analyzed_dir: str):
+        self.analyzed_dir = analyzed_dir
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.fingerprint: Dict[str, int] = {}
+        self.partitions: Dict[str, List[AnalyzedReview]] = {}
+        self.items: List[AnalyzedReview] = []
+        self.dates: List[str] = []
+        self.postings: Dict[str, Dict[str, set]] = {}
+        self.terms: Dict[str, set] = {}
+
+    def _scan(self) -> Dict[str, int]:
+        """파티션 디렉토리 -> mtime_ns (파일 추가/교체 시 디렉토리 mtime이 바뀜)"""
+        fingerprint = {}
+        if not os.path.exists(self.analyzed_dir):
+            return fingerprint
+        for root, dirs, names in os.walk(self.analyzed_dir):
+            if any(n.endswith(".json") for n in names):
+                rel = os.path.relpath(root, self.analyzed_dir).replace(os.sep, "/")
+                fingerprint[rel] = os.stat(root).st_mtime_ns
+        return fingerprint
+
+    def _load_partition(self, rel: str) -> List[AnalyzedReview]:
+        directory = os.path.join(self.analyzed_dir, *rel.split("/")) if rel != "." else self.analyzed_dir
+        items = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    items.append(AnalyzedReview.from_dict(loads(f.read())))
+            except Exception as e:
+                logger.error(f"Error loading {name}: {e}")
+        return items
+
+    def refresh(self) -> bool:
+        """변경된 파티션만 다시 로드하고 인덱스 재구성, 변경이 있으면 True"""
+        fingerprint = self._scan()
+        with self.lock:
+            if fingerprint == self.fingerprint:
+                return False
+            for rel in list(self.partitions):
+                if rel not in fingerprint:
+                    del self.partitions[rel]
+            for rel, mtime in fingerprint.items():
+                if self.fingerprint.get(rel) != mtime:
+                    self.partitions[rel] = self._load_partition(rel)
+            self.fingerprint = fingerprint
+            self._rebuild()
+            self.generation += 1
+            logger.info(f"Review store generation {self.generation}: {len(self.items)} items")
+            return True
+
+    def _rebuild(self) -> None:
+        items = [item for rel in sorted(self.partitions) for item in self.partitions[rel]]
+        items.sort(key=lambda i: (i.created_at or "", i.id))
+        postings: Dict[str, Dict[str, set]] = {field: {} for field in FILTER_FIELDS.values()}
+        terms: Dict[str, set] = {}
+        for pos, item in enumerate(items):
+            for field, index in postings.items():
+                index.setdefault(_field_value(item, field), set()).add(pos)
+            for term in set(tokenize(item.text)):
+                terms.setdefault(term, set()).add(pos)
+        self.items = items
+        self.dates = [(i.created_at or "")[:10] for i in items]
+        self.postings = postings
+        self.terms = terms
+
+    def _select(self, params: Dict[str, str]) -> List[int]:
+        """필터에 맞는 위치 목록 (최신순)"""
+        lo = bisect.bisect_left(self.dates, params["from"]) if params.get("from") else 0
+        hi = bisect.bisect_right(self.dates, params["to"]) if params.get("to") else len(self.items)
+
+        sets = []
+        for param, field in FILTER_FIELDS.items():
+            if params.get(param):
+                values = params[param].split(",")
+                sets.append(set().union(*(self.postings[field].get(v, set()) for v in values)))
+        query = (params.get("q") or "").lower()
+        if query:
+            for term in set(tokenize(query)):
+                sets.append(self.terms.get(term, set()))
+
+        if sets:
+            sets.sort(key=len)
+            positions = [p for p in sets[0] if lo <= p < hi and all(p in s for s in sets[1:])]
+            positions.sort(reverse=True)
+        else:
+            positions = list(range(hi - 1, lo - 1, -1))
+        if query:
+            # 토큰 역색인은 후보만 좁히므로 검색어의 각 단어가 실제로 포함되는지 확인
+            words = query.split()
+            positions = [p for p in positions if all(w in (self.items[p].text or "").lower() for w in words)]
+        return positions
+
+    def query(self, method: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """(generation, 결과) - 같은 lock 안에서 읽어 결과와 generation(ETag)이 항상 같은 데이터 기준이 되도록 함"""
+        with self.lock:
+            return self.generation, getattr(self, method)(params)
+
+    def reviews(self, params: Dict[str, str]) -> Dict[str, Any]:
+        page = _int_param(params, "page", 1, minimum=1)
+        per_page = min(_int_param(params, "per_page", 50, minimum=1), SERVER_CONFIG["max_per_page"])
+        with self.lock:
+            positions = self._select(params)
+            start = (page - 1) * per_page
+            return {
+                "total": len(positions),
+                "page": page,
+                "per_page": per_page,
+                "items": [self.items[p].to_dict() for p in positions[start:start + per_page]]
+            }
+
+    def aggregate(self, params: Dict[str, str]) -> Dict[str, Any]:
+        group_by = params.get("group_by", "date")
+        if group_by not in GROUP_FIELDS:
+            raise QueryError(f"group_by must be one of: {', '.join(GROUP_FIELDS)}")
+        with self.lock:
+            groups: Dict[str, Dict[str, Any]] = {}
+            for p in self._select(params):
+                item = self.items[p]
+                if group_by in ("date", "month"):
+                    key = self.dates[p][:10 if group_by == "date" else 7]
+                else:
+                    key = _field_value(item, FILTER_FIELDS.get(group_by, group_by))
+                group = groups.setdefault(key, {"count": 0, "sentiment": Counter(), "rating_sum": 0, "rating_count": 0, "churn_signals": 0})
+                group["count"] += 1
+                group["sentiment"][item.analysis.sentiment] += 1
+                if item.rating is not None:
+                    group["rating_sum"] += item.rating
+                    group["rating_count"] += 1
+                if item.analysis.churn_signal:
+                    group["churn_signals"] += 1
+            return {
+                "group_by": group_by,
+                "groups": [
+                    {
+                        "key": key,
+                        "count": g["count"],
+                        "sentiment": {k: g["sentiment"][k] for k in ("positive", "neutral", "negative")},
+                        "avg_rating": round(g["rating_sum"] / g["rating_count"], 2) if g["rating_count"] else None,
+                        "churn_signals": g["churn_signals"]
+                    }
+                    for key, g in sorted(groups.items())
+                ]
+            }
+
+
+def _int_param(params: Dict[str, str], name: str, default: int, minimum: int = 0) -> int:
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise QueryError(f"'{name}' must be an integer")
+    if value < minimum:
+        raise QueryError(f"'{name}' must be >= {minimum}")
+    return value
+
+
+class ResponseCache:
+    """응답 LRU 캐시 (키: generation + 정규화된 쿼리), generation이 바뀌면 전체 비움"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: "OrderedDict[Tuple, Tuple[bytes, str]]" = OrderedDict()
+        self.generation = None
+        self.lock = threading.Lock()
+
+    def get(self, generation: int, key: Tuple) -> Optional[Tuple[bytes, str]]:
+        with self.lock:
+            if generation != self.generation:
+                self.entries.clear()
+                self.generation = generation
+                return None
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, generation: int, key: Tuple, body: bytes, etag: str) -> None:
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (body, etag)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    읽기 전용 API
+    - GET /api/reviews?source=&sentiment=&problem_type=&source_name=&target=&churn=&from=&to=&q=&page=&per_page=
+    - GET /api/aggregate?group_by=date|month|source|source_name|sentiment|problem_type (+ 같은 필터)
+    - GET /api/health
+    """
+
+    store: ReviewStore = None
+    cache: ResponseCache = None
+    routes = {"/api/reviews": "reviews", "/api/aggregate": "aggregate"}
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/api/health":
+            self._send(200, dumps({"status": "ok", "generation": self.store.generation, "items": len(self.store.items)}))
+            return
+        method = self.routes.get(url.path)
+        if method is None:
+            self._send(404, dumps({"error": "not found"}))
+            return
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        generation = self.store.generation
+        key = (url.path, tuple(sorted(params.items())))
+        cached = self.cache.get(generation, key)
+        if cached is None:
+            try:
+                # 조회 중 refresh가 끼어들 수 있으므로 ETag/캐시 저장에는 결과와 함께 읽은 generation 사용
+                generation, result = self.store.query(method, params)
+                body = dumps(result)
+            except QueryError as e:
+                self._send(400, dumps({"error": str(e)}))
+                return
+            etag = f'"{generation}-{hashlib.sha1(body).hexdigest()[:16]}"'
+            self.cache.put(generation, key, body, etag)
+        else:
+            body, etag = cached
+
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status: int, body: bytes, etag: str = None) -> None:
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # 매번 ETag로 재검증
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _watch(store: ReviewStore, interval: float, stop: threading.Event) -> None:
+    # 새 분석 결과가 저장되면 다음 폴링에서 반영 (generation 증가 -> 캐시 무효화)
+    while not stop.wait(interval):
+        try:
+            store.refresh()
+        except Exception as e:
+            logger.error(f"Review store refresh failed: {e}")
+
+def create_server(data_dir: str, host: str = None, port: int = None) -> ThreadingHTTPServer:
+    """API 서버 생성 (초기 로드 포함), serve_forever는 호출 측에서 실행"""
+    store = ReviewStore(os.path.join(data_dir, "analyzed"))
+    store.refresh()
+    handler = type("BoundApiHandler", (ApiHandler,), {
+        "store": store,
+        "cache": ResponseCache(SERVER_CONFIG["cache_size"])
+    })
+    server = ThreadingHTTPServer((host or SERVER_CONFIG["host"], port if port is not None else SERVER_CONFIG["port"]), handler)
+    server.store = store
+    return server
+
+def serve(data_dir: str, host: str = None, port: int = None) -> None:
+    server = create_server(data_dir, host, port)
+    stop = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(server.store, SERVER_CONFIG["poll_interval"], stop), daemon=True)
+    watcher.start()
+    bound_host, bound_port = server.server_address[:2]
+    print(f"    Serving {len(server.store.items)} reviews on http://{bound_host}:{bound_port}/api/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,267 @@
+import re
+import math
+import heapq
+import base64
+import hashlib
+from typing import List, Dict, Any, Tuple, Iterable, Optional
+
+try:
+    from .preprocessor import TextPreprocessor
+except ImportError:
+    from preprocessor import TextPreprocessor
+
+_preprocessor = TextPreprocessor()
+_NONZERO = re.compile(b"[^\x00]")
+
+class SpaceSaving:
+    """
+    Space-Saving top-k 스케치 (Metwally et al.)
+    - 최대 capacity개 항목만 추적하므로 입력 규모와 무관하게 메모리 고정
+    - 추적 중이 아닌 항목이 들어오면 최소 count 항목을 교체하고 그 count를 오차 상한으로 물려받음
+    - count는 실제 빈도 이상이며 (count - error)는 실제 빈도 이하
+    - merge로 일자/파티션별 스케치를 합칠 수 있음 (mergeable summary)
+    - 키는 정규화된 문구, 표시용 label은 처음 관측된 형태에서 조사만 뗀 문구 (대소문자 유지)
+    """
+
+    def __init__(self, capacity: int = 2000, normalize: bool = True):
+        self.capacity = capacity
+        self.normalize = normalize
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self._heap: List[Tuple[int, str]] = []  # (count, key) lazy min-heap, 오래된 항목은 pop 시 무시
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def key(self, phrase: str) -> str:
+        """집계 키 (정규화된 문구)"""
+        return _preprocessor.normalize_phrase(phrase) if self.normalize else phrase
+
+    def _label(self, phrase: str) -> str:
+        return _preprocessor.normalize_phrase(phrase, casefold=False) if self.normalize else phrase
+
+    def update(self, phrase: str, count: int = 1) -> None:
+        key = self.key(phrase)
+        if not key:
+            return
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            self.labels[key] = self._label(phrase)
+        else:
+            min_count, min_key = self._pop_min()
+            del counts[min_key]
+            del self.errors[min_key]
+            del self.labels[min_key]
+            counts[key] = min_count + count
+            self.errors[key] = min_count
+            self.labels[key] = self._label(phrase)
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def update_all(self, phrases: Iterable[str]) -> None:
+        for phrase in phrases:
+            self.update(phrase)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        다른 스케치를 합산 (mergeable Space-Saving, Agarwal et al.)
+        - 한쪽에만 있는 키는 다른 쪽 스케치가 가득 찬 경우 그 최소 count를 count와 error에 함께 더함
+          (추적되지 않은 항목의 실제 빈도는 최소 count 이하) -> 병합 후에도 count >= 실제 빈도 유지
+        - 합산 후 capacity를 넘으면 상위 항목만 유지
+        """
+        self_min = self._min_count()
+        other_min = other._min_count()
+        for key in self.counts:
+            if key not in other.counts:
+                self.counts[key] += other_min
+                self.errors[key] += other_min
+        for key, count in other.counts.items():
+            if key in self.counts:
+                self.counts[key] += count
+                self.errors[key] += other.errors[key]
+            else:
+                self.counts[key] = count + self_min
+                self.errors[key] = other.errors[key] + self_min
+                self.labels[key] = other.labels[key]
+        if len(self.counts) > self.capacity:
+            for key, _ in self._ranked()[self.capacity:]:
+                del self.counts[key]
+                del self.errors[key]
+                del self.labels[key]
+        self._rebuild_heap()
+        return self
+
+    def _min_count(self) -> int:
+        """가득 찬 스케치의 최소 count (추적하지 않는 항목의 빈도 상한, 여유가 있으면 0)"""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def _ranked(self) -> List[Tuple[str, int]]:
+        # 동률은 키 순서로 정렬해 병합 순서와 무관하게 같은 결과
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def top(self, n: int) -> List[Tuple[str, str, int]]:
+        """상위 n개 (정규화 키, 표시용 label, 추정 count)"""
+        return [(key, self.labels[key], count) for key, count in self._ranked()[:n]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "normalize": self.normalize,
+            "items": [[key, count, self.errors[key], self.labels[key]] for key, count in self._ranked()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(capacity=data["capacity"], normalize=data.get("normalize", True))
+        for key, count, error, label in data["items"]:
+            sketch.counts[key] = count
+            sketch.errors[key] = error
+            sketch.labels[key] = label
+        sketch._rebuild_heap()
+        return sketch
+
+
+def merge_sketches(sketches: Iterable[SpaceSaving], capacity: int = None) -> SpaceSaving:
+    """일자별 스케치 등을 하나로 병합"""
+    merged = None
+    for sketch in sketches:
+        if merged is None:
+            merged = SpaceSaving(capacity=capacity or sketch.capacity, normalize=sketch.normalize)
+        merged.merge(sketch)
+    return merged if merged is not None else SpaceSaving(capacity=capacity or 2000)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog 고유 개수 추정 (Flajolet et al.)
+    - 2^precision개 1바이트 레지스터 (precision 12 = 4KB, 표준오차 약 1.6%)
+    - 같은 값을 여러 번 넣어도 결과가 같으므로(idempotent) 저장된 상태에 새 항목만 더해도 됨
+    - merge는 레지스터별 max -> 일자/소스/파티션별 상태를 자유롭게 합산 가능
+    """
+
+    def __init__(self, precision: int = 12, registers: bytes = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("register size does not match precision")
+
+    def add(self, value: str) -> None:
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        idx = h >> (64 - self.precision)
+        w = (h << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = (64 - w.bit_length() + 1) if w else (64 - self.precision + 1)
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        # 파티션/일별 스케치는 대부분 레지스터가 0 -> 0이 아닌 위치만 비교
+        registers, theirs = self.registers, other.registers
+        for match in _NONZERO.finditer(theirs):
+            i = match.start()
+            if theirs[i] > registers[i]:
+                registers[i] = theirs[i]
+        return self
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # 작은 구간은 linear counting
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.precision, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        return cls(precision=data["p"], registers=base64.b64decode(data["registers"]))
+
+
+class DistinctAuthors:
+    """
+    고유 작성자 수 추정용 HyperLogLog 모음 (PartialAggregate에 포함되어 파티션 캐시와 함께 저장)
+    - 그룹(total/sources/ringle/competitors/problem_types/daily)별로 이름 -> HLL
+    - 일별 스케치는 개수가 많으므로 낮은 precision 사용
+    - HLL은 삭제를 지원하지 않으므로 별도로 누적하지 않고 매 집계마다 파티션 스케치를 병합해 계산
+    """
+
+    DAILY_GROUPS = ("daily",)
+
+    def __init__(self, precision: int = 12, daily_precision: int = 10):
+        self.precision = precision
+        self.daily_precision = daily_precision
+        self.groups: Dict[str, Dict[str, HyperLogLog]] = {}
+
+    def _load_groups(self, data: Dict[str, Any]) -> None:
+        for group, sketches in data.get("groups", {}).items():
+            self.groups[group] = {name: HyperLogLog.from_dict(s) for name, s in sketches.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DistinctAuthors":
+        authors = cls()
+        authors._load_groups(data)
+        return authors
+
+    @staticmethod
+    def author_key(source_type: str, author: Optional[str]) -> Optional[str]:
+        """작성자 식별 키 (플랫폼이 다르면 같은 닉네임도 다른 사람으로 간주)"""
+        if not author:
+            return None
+        return f"{source_type}:{author}"
+
+    def add(self, group: str, name: str, author_key: str) -> None:
+        sketches = self.groups.setdefault(group, {})
+        sketch = sketches.get(name)
+        if sketch is None:
+            precision = self.daily_precision if group in self.DAILY_GROUPS else self.precision
+            sketch = sketches[name] = HyperLogLog(precision)
+        sketch.add(author_key)
+
+    def count(self, group: str, name: str) -> int:
+        sketch = self.groups.get(group, {}).get(name)
+        return sketch.count() if sketch else 0
+
+    def counts(self, group: str) -> Dict[str, int]:
+        return {name: sketch.count() for name, sketch in sorted(self.groups.get(group, {}).items())}
+
+    def merge(self, other: "DistinctAuthors") -> "DistinctAuthors":
+        for group, sketches in other.groups.items():
+            mine = self.groups.setdefault(group, {})
+            for name, sketch in sketches.items():
+                if name in mine:
+                    mine[name].merge(sketch)
+                else:
+                    mine[name] = HyperLogLog(sketch.precision, sketch.registers)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "groups": {
+                group: {name: sketch.to_dict() for name, sketch in sorted(sketches.items())}
+                for group, sketches in sorted(self.groups.items())
+            }
+        }
@@ -0,0 +1,210 @@
+import os
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator
+
+try:
+    from .config import APPS
+    from .records import dumps, analyzed_path
+except ImportError:
+    from config import APPS
+    from records import dumps, analyzed_path
+
+PROBLEM_TYPES = ["Audio Quality", "App Stability", "Tutor Matching", "Pricing", "UI/UX", "Curriculum"]
+
+# 소스 비중, 평균 텍스트 길이(자), 평점 제공 여부
+SOURCE_PROFILES = {
+    "playstore": {"weight": 0.40, "mean_chars": 90, "rated": True},
+    "appstore": {"weight": 0.25, "mean_chars": 140, "rated": True},
+    "youtube": {"weight": 0.15, "mean_chars": 60, "rated": False},
+    "naver_blog": {"weight": 0.15, "mean_chars": 1500, "rated": False},
+    "brunch": {"weight": 0.05, "mean_chars": 2500, "rated": False}
+}
+
+SOURCE_NAMES = {"youtube": "YouTube", "naver_blog": "Naver Blog", "brunch": "Brunch"}
+
+SENTENCES = {
+    "Audio Quality": [
+        "수업 중에 튜터 목소리가 자꾸 끊겨요.", "마이크 소리가 작게 들린다고 해서 여러 번 다시 말했어요.",
+        "The audio keeps cutting out during lessons.", "에코가 심해서 집중이 안 됩니다."
+    ],
+    "App Stability": [
+        "업데이트 후에 앱이 계속 강제 종료돼요.", "수업 녹음 재생할 때 폰이 너무 뜨거워집니다.",
+        "The app crashes every time I open the lesson notes.", "로그인이 자주 풀려요."
+    ],
+    "Tutor Matching": [
+        "원하는 튜터 예약이 너무 어려워요.", "인기 튜터는 항상 마감이라 수강신청이 번거롭습니다.",
+        "I could never book the tutor I wanted.", "튜터 실력 편차가 큽니다."
+    ],
+    "Pricing": [
+        "다른 화상영어보다 가격이 두 배 가까이 비싸요.", "매년 가격이 오르는 게 부담됩니다.",
+        "Way too expensive compared to other apps.", "수강권 유효기간이 너무 짧아요."
+    ],
+    "UI/UX": [
+        "메뉴 찾기가 어렵고 화면 구성이 복잡해요.", "예약 화면이 직관적이지 않습니다.",
+        "The UI is confusing and buttons are too small.", "교재 보기 화면 글씨가 작아요."
+    ],
+    "Curriculum": [
+        "교재 주제가 너무 어렵고 비즈니스 위주예요.", "초보자용 커리큘럼이 부족합니다.",
+        "The lesson materials are great but too advanced.", "매주 새로운 교재가 나와서 좋아요."
+    ],
+    "positive": [
+        "튜터 피드백이 정말 정확하고 도움이 됩니다.", "AI 튜터 덕분에 매일 부담 없이 말하기 연습을 해요.",
+        "My speaking improved a lot after three months.", "수업 후 교정 노트가 꼼꼼해서 만족합니다.",
+        "1년 넘게 쓰고 있는데 계속 사용할 예정이에요."
+    ],
+    "neutral": [
+        "링글 AI 기능을 써봤는데 아직은 잘 모르겠어요.", "가격 대비 괜찮은 편인 것 같습니다.",
+        "It is okay, nothing special.", "다른 앱과 비교하는 중입니다."
+    ],
+    "filler": [
+        "오늘은 퇴근 후에 카페에서 공부를 했다.", "영어 공부를 시작한 지 벌써 2년이 되었다.",
+        "주말에는 가족들과 시간을 보내느라 바빴다.", "요즘 회사 일이 많아서 공부 시간이 부족하다.",
+        "I have been learning English for my new job.", "여러 앱을 비교해 보고 정리해 보려고 한다."
+    ]
+}
+
+KEY_PHRASES = {
+    "Audio Quality": ["음질", "소리 끊김", "마이크", "에코", "audio"],
+    "App Stability": ["강제 종료", "앱 오류", "발열", "로그인", "crash"],
+    "Tutor Matching": ["튜터 예약", "수강신청", "튜터 편차", "booking"],
+    "Pricing": ["가격", "가격 인상", "비싸다", "수강권", "price"],
+    "UI/UX": ["메뉴", "화면 구성", "사용성", "UI"],
+    "Curriculum": ["교재", "커리큘럼", "난이도", "materials"],
+    "positive": ["피드백", "AI 튜터", "실력 향상", "교정 노트", "만족"],
+    "neutral": ["비교", "AI 기능", "가성비"]
+}
+
+# 자유 서술형 문구처럼 변형되도록 붙이는 조사/어미
+PHRASE_SUFFIXES = ["", "", "", "이", "가", "은", "는", "을", "를", " 문제", " 너무"]
+
+CHURN_KEYWORDS = ["환불", "해지", "탈퇴", "그만", "refund", "cancel"]
+
+class SyntheticCorpus:
+    """
+    벤치마크/테스트용 합성 분석 코퍼스 생성기
+    - 소스 비중, 소스별 텍스트 길이(로그정규), 경쟁사 비중, 날짜 분포(최근 편중), 이탈 비율을 실제 운영과 유사하게 구성
+    - 항목을 하나씩 생성하는 iterator이므로 수백만 건도 메모리에 모두 올리지 않고 사용 가능
+    """
+
+    def __init__(self, seed: int = 42, days: int = 730, end: datetime = None,
+                 target_share: float = 0.6, negative_share: float = 0.3, churn_rate: float = 0.25):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.end = end or datetime.now().replace(microsecond=0)
+        self.target_share = target_share
+        self.negative_share = negative_share
+        self.churn_rate = churn_rate  # 부정 리뷰 중 이탈 신호 비율
+
+        self.sources = list(SOURCE_PROFILES)
+        self.source_weights = [SOURCE_PROFILES[s]["weight"] for s in self.sources]
+        self.competitors = [k for k, v in APPS.items() if not v.get("is_target")]
+        self.target_key = next(k for k, v in APPS.items() if v.get("is_target"))
+
+    def _author(self, count: int) -> str:
+        # 소수 작성자가 많은 글을 쓰는 롱테일 분포
+        pool = max(10, count // 3)
+        return f"user_{int(pool ** self.rng.random())}"
+
+    def _created_at(self) -> datetime:
+        # 최근 데이터가 더 많도록 지수 분포
+        offset = min(self.days - 1, int(self.rng.expovariate(3.0 / self.days)))
+        return self.end - timedelta(days=offset, seconds=self.rng.randint(0, 86399))
+
+    def _text(self, source_type: str, topic: str) -> str:
+        mean = SOURCE_PROFILES[source_type]["mean_chars"]
+        target_len = max(10, int(self.rng.lognormvariate(math.log(mean), 0.6)))
+        topical = SENTENCES[topic]
+        long_form = mean > 500
+        parts = ["링글 AI 후기"] if long_form else []
+        length = sum(len(p) for p in parts)
+        while length < target_len:
+            pool = SENTENCES["filler"] if long_form and self.rng.random() < 0.7 else topical
+            sentence = self.rng.choice(pool)
+            parts.append(sentence)
+            length += len(sentence) + 1
+        return "\n".join(parts[:1] + [" ".join(parts[1:])]) if long_form else " ".join(parts)
+
+    def _phrases(self, topic: str) -> List[str]:
+        bank = KEY_PHRASES[topic]
+        return [self.rng.choice(bank) + self.rng.choice(PHRASE_SUFFIXES) for _ in range(self.rng.randint(1, 3))]
+
+    def iter_items(self, count: int) -> Iterator[Dict[str, Any]]:
+        """분석 완료 형식(ANALYZED_SCHEMA) 항목 생성"""
+        rng = self.rng
+        for i in range(count):
+            source_type = rng.choices(self.sources, self.source_weights)[0]
+            app_source = source_type in ("playstore", "appstore")
+            is_target = (not app_source) or rng.random() < self.target_share
+            app_key = self.target_key if is_target else rng.choice(self.competitors)
+
+            roll = rng.random()
+            if roll < self.negative_share:
+                sentiment = "negative"
+                topic = rng.choice(PROBLEM_TYPES)
+            elif roll < self.negative_share + 0.15:
+                sentiment = "neutral"
+                topic = "neutral"
+            else:
+                sentiment = "positive"
+                topic = "positive"
+
+            churn = sentiment == "negative" and rng.random() < self.churn_rate
+            created_at = self._created_at()
+            item_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+            if sentiment == "negative":
+                rating = rng.choice([1, 1, 2, 2, 3])
+            else:
+                rating = rng.choice([3, 4, 5, 5, 5])
+
+            yield {
+                "id": item_id,
+                "raw_id": item_id,
+                "source_type": source_type,
+                "source_name": APPS[app_key]["name"] if app_source else SOURCE_NAMES[source_type],
+                "is_target": is_target,
+                "text": self._text(source_type, topic),
+                "rating": rating if SOURCE_PROFILES[source_type]["rated"] else None,
+                "author": self._author(count),
+                "created_at": created_at.isoformat(),
+                "metadata": {"thumbs_up": int(rng.expovariate(0.3))} if source_type in ("playstore", "youtube") else {},
+                "analysis": {
+                    "sentiment": sentiment,
+                    "problem_type": topic if topic in PROBLEM_TYPES else None,
+                    "key_phrases": self._phrases(topic),
+                    "churn_signal": churn,
+                    "churn_keywords": rng.sample(CHURN_KEYWORDS, rng.randint(1, 2)) if churn else [],
+                    "competitor_mentions": [APPS[rng.choice(self.competitors)]["name"]] if is_target and rng.random() < 0.05 else []
+                },
+                "analyzed_at": (created_at + timedelta(hours=12)).isoformat()
+            }
+
+    def iter_raw_items(self, count: int) -> Iterator[Dict[str, Any]]:
+        """수집 직후 형식(RAW_SCHEMA) 항목 생성 (분석 단계 벤치마크용)"""
+        for item in self.iter_items(count):
+            app_key = next((k for k, v in APPS.items() if v["name"] == item["source_name"]), item["source_type"])
+            yield {
+                "id": item["id"],
+                "source": {"type": item["source_type"], "name": item["source_name"], "app_key": app_key, "url": ""},
+                "external_id": item["id"],
+                "author": item["author"],
+                "rating": item["rating"],
+                "text": item["text"],
+                "created_at": item["created_at"],
+                "collected_at": item["analyzed_at"],
+                "metadata": item["metadata"]
+            }
+
+    def write_analyzed(self, analyzed_dir: str, count: int, indent: int = None) -> int:
+        """분석 결과 디렉토리에 항목별 JSON 파일로 저장 (run_analysis와 같은 파티션 경로/compact 인코딩), 저장 건수 반환"""
+        written = 0
+        for item in self.iter_items(count):
+            path = analyzed_path(analyzed_dir, item["source_type"], item["created_at"], item["id"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(dumps(item, indent=indent))
+            written += 1
+        return written
@@ -23,14 +23,22 @@ class YouTubeCollector(BaseCollector):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config or COLLECTION_CONFIG["youtube"])
         self.api_key = YOUTUBE_API_KEY
-        self.youtube = None
-        if self.api_key:
-            try:
-                self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-            except Exception as e:
-                logger.error(f"Failed to initialize YouTube API client: {e}")
-        else:
-            logger.warning("YouTube API Key is missing.")
+        self._youtube = None
+        self._client_initialized = False
+
+    @property
+    def youtube(self):
+        """API 클라이언트는 첫 사용 시 생성 (discovery 문서 조회를 수집 시점까지 지연)"""
+        if not self._client_initialized:
+            self._client_initialized = True
+            if self.api_key:
+                try:
+                    self._youtube = build('youtube', 'v3', developerKey=self.api_key)
+                except Exception as e:
+                    logger.error(f"Failed to initialize YouTube API client: {e}")
+            else:
+                logger.warning("YouTube API Key is missing.")
+        return self._youtube
 
     def get_source_type(self) -> str:
         return "youtube"